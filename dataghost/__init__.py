@@ -0,0 +1,69 @@
+# DATA-GHOST - Cœur de stéganographie utilisable hors de l'interface graphique
+# Les sous-modules sont chargés à la demande pour garder un démarrage rapide
+
+import importlib  # Pour le chargement différé des sous-modules
+
+# Constantes
+MAX_LSB = 4  # Nombre maximum de bits LSB supportés
+
+# Nom public -> sous-module qui le définit
+_EXPORTS = {
+    # Moteur d'insertion et d'extraction
+    "capacity": "engine", "channels_needed": "engine", "embed_bytes": "engine", "embed_image": "engine",
+    "extract_bytes": "engine", "extract_image": "engine", "extract_until_marker": "engine",
+    "iter_bytes": "engine", "ChannelWriter": "engine", "ChunkReader": "engine", "GroupReader": "engine", "NATIVE_MODES": "engine", "channel_range": "engine",
+    # Format conteneur
+    "FLAG_AEAD": "container", "FLAG_COMPRESSED": "container", "FLAG_ENCRYPTED": "container", "FLAG_KDF": "container",
+    "FLAG_CHANNELS": "container", "FLAG_FRAMES": "container", "FLAG_SCATTER": "container",
+    "payload_capacity": "container",
+    "Header": "container", "embed_payload": "container", "embed_stream": "container",
+    "extract_payload": "container", "extract_payload_stream": "container", "read_container": "container",
+    "read_header": "container", "write_container": "container", "write_container_stream": "container",
+    # Traitement par bandes
+    "StripReader": "stream", "stream_embed": "stream", "stream_extract": "stream",
+    # Répartition sur plusieurs images
+    "Reassembly": "shard", "shard_embed": "shard", "shard_extract": "shard",
+    # Porteuses à plusieurs images (PNG animé, TIFF multipage, GIF animé)
+    "FrameSet": "frames", "embed_frames": "frames", "extract_frames": "frames", "is_multiframe": "frames",
+    "frame_payload": "frames", "read_frames": "frames",
+    # Détection automatique de la profondeur LSB
+    "Candidate": "detect", "detect_lsb": "detect",
+    # Chiffrement
+    "KdfParams": "crypto", "KeyCache": "crypto", "decrypt_data": "crypto", "decrypt_stream": "crypto",
+    "derive_key": "crypto", "encrypt_data": "crypto", "encrypt_stream": "crypto", "key_cache": "crypto",
+    # Dispersion
+    "KeyedPermutation": "scatter", "ScatterWriter": "scatter",
+    # Compression
+    "compress_stream": "compress", "decompress_stream": "compress",
+    # Mesures de performance
+    "Metrics": "metrics", "collect": "metrics", "throttled": "metrics",
+    # Planification de capacité
+    "CarrierPlan": "planner", "plan": "planner", "recommend": "planner",
+    # Planificateur de tâches
+    "Cancelled": "jobs", "Job": "jobs", "JobScheduler": "jobs", "atomic_output": "jobs",
+    # Aperçus
+    "ImageInfo": "preview", "ThumbnailCache": "preview", "image_info": "preview", "make_thumbnail": "preview",
+    # Encodage de sortie
+    "OutputOptions": "output", "check_output": "output", "save_image": "output", "verify_output": "output",
+    # API de haut niveau
+    "Extraction": "api", "carrier_capacity": "api", "embed": "api", "embed_file": "api", "extract": "api",
+    "extract_file": "api", "prepare_payload": "api", "save_carrier": "api", "unpack_payload": "api",
+    # Service local
+    "CarrierCache": "service", "GhostService": "service", "ServiceBusy": "service", "ServiceClient": "service",
+    "serve": "service",
+    # Traitement par lots
+    "EmbedJob": "batch", "ExtractJob": "batch", "InvalidJob": "batch", "run_batch": "batch",
+    # Stéganalyse
+    "ChannelAnalysis": "analysis", "StegReport": "analysis", "analyze_image": "analysis", "format_report": "analysis",
+    # Recherche dans un répertoire
+    "ScanIndex": "scan", "key_fingerprint": "scan", "probe_file": "scan", "scan_images": "scan",
+}
+
+__all__ = ["MAX_LSB", *_EXPORTS]
+
+
+def __getattr__(name):
+    """Charge à la demande le sous-module qui définit `name`."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
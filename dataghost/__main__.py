@@ -0,0 +1,7 @@
+# DATA-GHOST - Exécution avec `python -m dataghost`
+
+import sys  # Pour le code de retour
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,322 @@
+# DATA-GHOST - Stéganalyse : khi-deux des paires de valeurs, analyse RS et plans de bits
+# Toutes les mesures sont des comptes additifs : chaque tuile (bande de lignes) est comptée séparément,
+# éventuellement dans un autre processus, et les totaux donnent le rapport
+
+import math  # Pour la loi du khi-deux
+import os  # Pour le nombre de cœurs
+from concurrent.futures import ProcessPoolExecutor, as_completed  # Pour le pool de processus
+from dataclasses import asdict, dataclass, field  # Pour créer des classes de données
+from multiprocessing import shared_memory  # Pour partager l'image décodée avec les processus
+from typing import Callable, Dict, List, Optional, Sequence, Tuple  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+from PIL import Image  # Pour le décodage et les aperçus
+
+from .engine import carrier_image
+from .jobs import checkpoint
+from .metrics import stage
+from .stream import StripReader
+
+# Constantes
+BANDS = 100  # Bandes du khi-deux cumulé depuis le haut (étendue d'une insertion séquentielle)
+TILE_PIXELS = 4 << 20  # Pixels comptés par tâche
+PARALLEL_PIXELS = 8 << 20  # Taille à partir de laquelle les tuiles sont réparties sur plusieurs processus
+PREVIEW_SIZE = 1024  # Plus grande dimension des aperçus de plans de bits
+RS_GROUP = 4  # Pixels horizontaux d'un groupe de l'analyse RS (masque 0, 1, 1, 0)
+CHI_MIN_EXPECTED = 5  # Effectif attendu minimal d'une paire de valeurs prise en compte
+CHI_SIGNAL = 0.95  # Probabilité du khi-deux à partir de laquelle une bande est jugée modifiée
+CHI_BANDS = 5  # Bandes consécutives au-dessus du seuil exigées pour mesurer une étendue
+SUSPECT_RATE = 0.1  # Taux d'insertion estimé à partir duquel l'image est jugée suspecte
+
+
+# Classe pour stocker les mesures d'une composante
+@dataclass
+class ChannelAnalysis:
+    name: str  # Composante (R, G, B, A, L)
+    chi_square: float  # Statistique du khi-deux des paires de valeurs
+    chi_p: Optional[float]  # Probabilité d'une insertion LSB selon le khi-deux (None: histogramme trop pauvre)
+    rs_rate: Optional[float]  # Taux d'insertion estimé par l'analyse RS (0 à 1)
+    ones: List[float]  # Proportion de 1 dans chaque plan de bits (indice 0: LSB)
+    agreement: List[float]  # Proportion de voisins horizontaux de même bit, par plan (0.5: bruit)
+
+
+# Classe pour stocker le rapport de stéganalyse d'une image
+@dataclass
+class StegReport:
+    path: str  # Image analysée
+    width: int  # Largeur
+    height: int  # Hauteur
+    mode: str  # Mode analysé (RGB, RGBA, L, LA)
+    channels: List[ChannelAnalysis]  # Mesures par composante
+    rate: Optional[float]  # Taux d'insertion estimé (moyenne RS des composantes)
+    extent: float  # Part des lignes, depuis le haut, où le khi-deux cumulé signale durablement une insertion
+    bands: List[Optional[float]]  # Probabilité du khi-deux cumulé jusqu'à chaque bande
+    previews: Dict[str, Image.Image] = field(default_factory=dict, repr=False)  # Plan ("R0", ...) -> aperçu
+
+    @property
+    def suspect(self) -> bool:
+        """Indique si les statistiques signalent probablement des données cachées.
+
+        Seul le taux RS décide : le khi-deux est aussi élevé sur les images dont l'histogramme est
+        naturellement lisse (photographies bruitées), il ne sert qu'à situer une insertion séquentielle.
+        """
+        return (self.rate or 0.0) >= SUSPECT_RATE
+
+    def to_dict(self) -> dict:
+        """Rapport sérialisable en JSON (sans les aperçus)."""
+        report = asdict(self)
+        report.pop('previews')
+        report['suspect'] = self.suspect
+        return report
+
+
+def chi_square(hist: np.ndarray) -> Tuple[float, Optional[float]]:
+    """Test des paires de valeurs (2k, 2k+1) : statistique et probabilité que les LSB aient été remplacés."""
+    even, odd = hist[0::2].astype(np.float64), hist[1::2].astype(np.float64)
+    expected = (even + odd) / 2
+    used = expected >= CHI_MIN_EXPECTED
+    dof = int(used.sum()) - 1
+    stat = float(((even[used] - expected[used]) ** 2 / expected[used]).sum())
+    if dof < 1:
+        return stat, None
+    # Loi du khi-deux par l'approximation de Wilson-Hilferty (précise dès une dizaine de degrés de liberté)
+    z = ((stat / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return stat, 1 - 0.5 * math.erfc(-z / math.sqrt(2))
+
+
+def rs_estimate(counts: np.ndarray, groups: int) -> Optional[float]:
+    """Taux d'insertion estimé à partir des groupes réguliers et singuliers (méthode RS de Fridrich)."""
+    if groups == 0:
+        return None
+    rm, sm, rn, sn, rm1, sm1, rn1, sn1 = counts / groups
+    d0, d1, dn0, dn1 = rm - sm, rm1 - sm1, rn - sn, rn1 - sn1
+    a, b, c = 2 * (d1 + d0), dn0 - dn1 - d1 - 3 * d0, d0 - dn0
+    if abs(a) < 1e-12:
+        if abs(b) < 1e-12:
+            return None
+        x = -c / b
+    else:
+        root = math.sqrt(max(0.0, b * b - 4 * a * c))
+        x = min(((-b + root) / (2 * a), (-b - root) / (2 * a)), key=abs)
+    if abs(x - 0.5) < 1e-12:
+        return None
+    return min(1.0, max(0.0, x / (x - 0.5)))
+
+
+def _rs_counts(g0: np.ndarray, g1: np.ndarray, g2: np.ndarray, g3: np.ndarray) -> List[int]:
+    """Groupes réguliers et singuliers pour les masques M et -M (pixels centraux retournés).
+
+    Chaque argument contient un pixel de chaque groupe : les calculs restent des opérations sur des colonnes.
+    """
+    # F1 (2k <-> 2k+1) ajoute 1 aux valeurs paires et retire 1 aux impaires ; F-1 fait l'inverse
+    s1, s2 = 1 - 2 * (g1 & 1), 1 - 2 * (g2 & 1)
+    d01, d12, d23 = g1 - g0, g2 - g1, g3 - g2
+    base = np.abs(d01) + np.abs(d12) + np.abs(d23)
+    positive = np.abs(d01 + s1) + np.abs(d12 + s2 - s1) + np.abs(d23 - s2)
+    negative = np.abs(d01 - s1) + np.abs(d12 - s2 + s1) + np.abs(d23 + s2)
+    return [int(np.count_nonzero(positive > base)), int(np.count_nonzero(positive < base)),
+            int(np.count_nonzero(negative > base)), int(np.count_nonzero(negative < base))]
+
+
+def _count_tile(pixels: np.ndarray, top: int, band_rows: int, step: int, bits: Sequence[int]) -> dict:
+    """Comptes d'une tuile (lignes x largeur x composantes) : histogrammes par bande, voisins, RS et aperçus."""
+    rows, width, count = pixels.shape
+    bands = [np.stack([np.bincount(pixels[start:start + band_rows, :, c].ravel(), minlength=256)
+                       for c in range(count)])
+             for start in range(0, rows, band_rows)]
+    neighbours = np.stack([
+        np.bincount((pixels[:, 1:, c] ^ pixels[:, :-1, c]).ravel(), minlength=256) for c in range(count)
+    ])
+
+    # Analyse RS sur des groupes de 4 pixels horizontaux, puis sur l'image aux LSB inversés
+    rs = np.zeros((count, 8), dtype=np.int64)
+    usable = width - width % RS_GROUP
+    for c in range(count):
+        columns = [pixels[:, i:usable:RS_GROUP, c].astype(np.int16) for i in range(RS_GROUP)]
+        rs[c, :4] = _rs_counts(*columns)
+        rs[c, 4:] = _rs_counts(*(column ^ 1 for column in columns))
+
+    # Aperçus : une ligne et une colonne sur `step`, alignées sur l'image entière
+    sampled = pixels[(-top) % step::step, ::step]
+    planes = {bit: ((sampled >> bit) & 1) * np.uint8(255) for bit in bits}
+    return {'top': top, 'bands': bands, 'neighbours': neighbours, 'rs': rs,
+            'groups': rows * (usable // RS_GROUP), 'planes': planes}
+
+
+def _tile_pixels(source: tuple, top: int, bottom: int):
+    """Lignes [top, bottom) de l'image, lues dans le fichier projeté, la mémoire partagée ou le tableau."""
+    kind = source[0]
+    if kind == 'file':
+        with StripReader(source[1]) as reader:
+            return reader.pixels(reader.read_block(top, bottom))[..., _raw_order(reader.layout)], None
+    if kind == 'shm':
+        memory = shared_memory.SharedMemory(name=source[1])
+        return np.ndarray(source[2], dtype=np.uint8, buffer=memory.buf)[top:bottom], memory
+    return source[1][top:bottom], None
+
+
+def _analyze_tile(task) -> dict:
+    """Compte une tuile (dans un processus du pool ou dans le processus courant)."""
+    source, top, bottom, band_rows, step, bits = task
+    pixels, memory = _tile_pixels(source, top, bottom)
+    try:
+        return _count_tile(pixels, top, band_rows, step, bits)
+    finally:
+        del pixels  # La mémoire partagée ne peut être fermée tant qu'une vue existe
+        if memory:
+            memory.close()
+
+
+def _raw_order(layout) -> List[int]:
+    """Position des composantes R, G, B (puis A si le fichier en a une) dans un pixel brut."""
+    return list(layout.order) + ([] if layout.alpha is None else [layout.alpha])
+
+
+def _source(path: str) -> Tuple[tuple, str, Tuple[int, int], Optional[np.ndarray]]:
+    """Lecture directe des fichiers non compressés (transparence comprise) ; les autres formats sont décodés une fois."""
+    with StripReader(path) as reader:
+        if reader.layout is not None:
+            mode = 'RGB' if reader.layout.alpha is None else 'RGBA'
+            return ('file', path), mode, (reader.width, reader.height), None
+    with stage("decode"):
+        with Image.open(path) as img:
+            img = carrier_image(img)
+            pixels = np.asarray(img)
+    if pixels.ndim == 2:
+        pixels = pixels[..., None]
+    return ('array', pixels), img.mode, img.size, pixels
+
+
+def analyze_image(path: str, bits: Sequence[int] = (0,), workers: Optional[int] = None,
+                  progress: Optional[Callable[[float], None]] = None) -> StegReport:
+    """Calcule les statistiques LSB d'une image et les aperçus de ses plans de bits `bits`.
+
+    Au-delà de PARALLEL_PIXELS, les tuiles sont réparties sur `workers` processus
+    (l'image décodée leur est transmise par mémoire partagée, un fichier non compressé est relu par projection).
+    """
+    source, mode, (width, height), pixels = _source(path)
+    names = list(mode)
+    band_rows = -(-height // BANDS)
+    tile_rows = max(1, TILE_PIXELS // (width * band_rows)) * band_rows
+    step = max(1, -(-max(width, height) // PREVIEW_SIZE))
+    workers = workers or os.cpu_count() or 1
+    parallel = workers > 1 and width * height >= PARALLEL_PIXELS
+
+    memory = None
+    if parallel and pixels is not None:
+        memory = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+        np.ndarray(pixels.shape, dtype=np.uint8, buffer=memory.buf)[...] = pixels
+        source = ('shm', memory.name, pixels.shape)
+    del pixels
+
+    tasks = [(source, top, min(top + tile_rows, height), band_rows, step, tuple(bits))
+             for top in range(0, height, tile_rows)]
+    tiles = []
+    try:
+        with stage("analyze"):
+            if parallel:
+                with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                    futures = [executor.submit(_analyze_tile, task) for task in tasks]
+                    for future in as_completed(futures):
+                        checkpoint()
+                        tiles.append(future.result())
+                        if progress:
+                            progress(len(tiles) / len(tasks))
+            else:
+                for task in tasks:
+                    checkpoint()
+                    tiles.append(_analyze_tile(task))
+                    if progress:
+                        progress(len(tiles) / len(tasks))
+    finally:
+        if memory:
+            memory.close()
+            memory.unlink()
+    tiles.sort(key=lambda tile: tile['top'])
+    return _report(path, width, height, mode, names, tiles, bits)
+
+
+def _report(path: str, width: int, height: int, mode: str, names: List[str], tiles: List[dict],
+            bits: Sequence[int]) -> StegReport:
+    """Additionne les comptes des tuiles et en déduit les statistiques."""
+    bands = [band for tile in tiles for band in tile['bands']]
+    cumulative = np.cumsum(np.stack(bands), axis=0)  # Bande x composante x valeur
+    neighbours = sum(tile['neighbours'] for tile in tiles)
+    rs = sum(tile['rs'] for tile in tiles)
+    groups = sum(tile['groups'] for tile in tiles)
+    values = np.arange(256)
+
+    channels = []
+    for c, name in enumerate(names):
+        hist = cumulative[-1, c]
+        total, pairs = hist.sum(), neighbours[c].sum()
+        stat, p = chi_square(hist)
+        channels.append(ChannelAnalysis(
+            name=name,
+            chi_square=round(stat, 2),
+            chi_p=_rounded(p),
+            rs_rate=_rounded(rs_estimate(rs[c], groups)),
+            ones=[round(float(hist[(values >> bit) & 1 == 1].sum() / total), 4) for bit in range(8)],
+            agreement=[round(float(neighbours[c][(values >> bit) & 1 == 0].sum() / max(pairs, 1)), 4)
+                       for bit in range(8)],
+        ))
+
+    # Khi-deux cumulé : probabilité moyenne des composantes sur les lignes [0, fin de la bande)
+    probabilities = []
+    for band in cumulative:
+        found = [p for p in (chi_square(band[c])[1] for c in range(len(names))) if p is not None]
+        probabilities.append(_rounded(sum(found) / len(found)) if found else None)
+    signal = _sustained(probabilities)
+    band_rows = -(-height // BANDS)
+    extent = min(height, signal * band_rows) / height
+
+    rates = [channel.rs_rate for channel in channels if channel.rs_rate is not None]
+    previews = {}
+    for bit in bits:
+        plane = np.concatenate([tile['planes'][bit] for tile in tiles])
+        for c, name in enumerate(names):
+            previews[f"{name}{bit}"] = Image.fromarray(np.ascontiguousarray(plane[..., c]), 'L')
+    return StegReport(path, width, height, mode, channels, _rounded(sum(rates) / len(rates)) if rates else None,
+                      round(extent, 4), probabilities, previews)
+
+
+def _sustained(probabilities: List[Optional[float]]) -> int:
+    """Bandes couvertes par le khi-deux cumulé depuis le haut, si le signal tient sur CHI_BANDS bandes (sinon 0).
+
+    Les premières bandes, trop peu peuplées, peuvent rester sous le seuil : le signal doit commencer
+    parmi les CHI_BANDS premières.
+    """
+    high = [(p or 0) >= CHI_SIGNAL for p in probabilities]
+    start = next((i for i in range(min(CHI_BANDS, len(high))) if high[i]), None)
+    if start is None:
+        return 0
+    end = start
+    while end < len(high) and high[end]:
+        end += 1
+    return end if end - start >= CHI_BANDS else 0
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(float(value), 4)
+
+
+def format_report(report: StegReport) -> str:
+    """Rapport lisible (interface graphique et ligne de commande)."""
+    lines = [
+        f"{os.path.basename(report.path)} | {report.width}x{report.height} | {report.mode}",
+        ("⚠️ Données cachées probables" if report.suspect else "✅ Aucune insertion LSB détectée"),
+        f"Taux d'insertion estimé (RS): {_percent(report.rate)}",
+        f"Étendue séquentielle (khi-deux, depuis le haut): {_percent(report.extent)}",
+        "",
+    ]
+    for channel in report.channels:
+        lines.append(
+            f"[{channel.name}] khi-deux {channel.chi_square} (p={_percent(channel.chi_p)}) | "
+            f"RS {_percent(channel.rs_rate)} | LSB à 1: {_percent(channel.ones[0])} | "
+            f"voisins identiques: {_percent(channel.agreement[0])}"
+        )
+    return "\n".join(lines)
+
+
+def _percent(value: Optional[float]) -> str:
+    return "n/d" if value is None else f"{value * 100:.1f} %"
@@ -0,0 +1,394 @@
+# DATA-GHOST - API de haut niveau, utilisable sans interface graphique
+
+import os  # Pour la taille des fichiers et les nonces
+from contextlib import nullcontext  # Pour les images déjà décodées
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union  # Pour le typage
+
+from PIL import Image  # Pour la manipulation d'images
+
+from .compress import (
+    DEFAULT_LEVEL, SAMPLE_SIZE, algorithm_id, compress, compress_stream, decompress_stream, worth_compressing,
+)
+from .container import (
+    FLAG_AEAD, FLAG_COMPRESSED, FLAG_ENCRYPTED, FLAG_KDF, Header, embed_payload, embed_stream, extract_payload,
+    extract_payload_stream, payload_capacity,
+)
+from .crypto import (
+    FRAME_SIZE, NONCE_SIZE, KdfParams, cipher_key, decrypt_data, decrypt_stream, derive_key, encrypt_stream,
+    sealed_size,
+)
+from .detect import best_lsb
+from .engine import CHUNK_SIZE
+from .frames import FRAME_FLAGS, embed_frames, extract_frames, frame_payload, is_multiframe
+from .jobs import atomic_output, checkpoint
+from .metrics import stage, throttled, timed
+from .output import (
+    OutputFormat, OutputOptions, check_output, header_of, output_format, save_image, save_options, verify_output,
+)
+from .preview import image_info
+from .scatter import scatter_key
+from .stream import DEFAULT_STRIP_BUDGET, Unstreamable, is_raw, raw_layout, stream_embed, stream_payload
+
+
+# Classe pour stocker le résultat d'une extraction
+@dataclass
+class Extraction:
+    data: bytes  # Données extraites (déchiffrées si possible)
+    header: Optional[Header] = None  # En-tête du conteneur (None pour l'ancien format)
+    decrypted: bool = False  # Si les données ont été déchiffrées
+    lsb: Optional[int] = None  # Profondeur LSB utilisée (détectée en mode automatique)
+    size: Optional[int] = None  # Octets écrits (extraction vers un fichier)
+
+
+def _sealing(key: str, kdf: Optional[KdfParams] = None) -> Tuple[bytes, int, dict]:
+    """Clé dérivée, drapeaux et champs d'en-tête d'un chiffrement par blocs authentifiés."""
+    kdf = kdf or KdfParams.new()
+    fields = {**kdf.header_fields(), 'nonce': os.urandom(NONCE_SIZE), 'frame_size': FRAME_SIZE}
+    return derive_key(key, kdf), FLAG_ENCRYPTED | FLAG_KDF | FLAG_AEAD, fields
+
+
+def encrypt_payload(key: str, data: bytes, kdf: Optional[KdfParams] = None) -> Tuple[bytes, int, dict]:
+    """Chiffre les données avec une clé dérivée ; retourne les données, les drapeaux et les champs d'en-tête.
+
+    Un même `kdf` (donc un même sel) partagé par plusieurs images évite de refaire la dérivation à la lecture.
+    """
+    aes_key, flags, fields = _sealing(key, kdf)
+    with stage("encrypt"):
+        sealed = b"".join(encrypt_stream(aes_key, fields['nonce'], [data], fields['frame_size']))
+    return sealed, flags, fields
+
+
+def decrypt_chunks(key: str, chunks: Iterable[bytes], header: Header) -> Iterator[bytes]:
+    """Déchiffre au fil de l'eau les données d'un conteneur (en mémoire pour l'ancien mode CBC)."""
+    kdf = KdfParams.from_header(header) if header.derived_key else None
+    if header.framed:
+        return timed(decrypt_stream(cipher_key(key, kdf), header.nonce, chunks, header.frame_size), "decrypt")
+    data = b"".join(chunks)
+    with stage("decrypt"):
+        return iter([decrypt_data(key, data, kdf=kdf)])
+
+
+def _scatter_key_for(key: Optional[str]) -> Optional[Callable[[Header], bytes]]:
+    """Fournisseur de la clé de dispersion d'un conteneur (dérivée comme la clé AES, d'après l'en-tête)."""
+    if not key:
+        return None
+
+    def provider(header: Header) -> bytes:
+        if not header.derived_key:
+            raise ValueError("Données dispersées sans paramètres de dérivation de clé")
+        return scatter_key(cipher_key(key, KdfParams.from_header(header)))
+
+    return provider
+
+
+def _scatter_fields(key: Optional[str], scatter: bool, strip_budget: Optional[int], fields: dict) -> Optional[bytes]:
+    """Clé de dispersion d'une insertion (None sans dispersion)."""
+    if not scatter:
+        return None
+    if not key:
+        raise ValueError("Le mode dispersé requiert une clé")
+    if strip_budget:
+        raise ValueError("Mode bandes indisponible avec la dispersion")
+    # Le sel de dérivation est celui du chiffrement : la clé dérivée est déjà en cache
+    kdf = KdfParams(fields['kdf_algorithm'], fields['kdf_salt'], fields['kdf_cost'], fields['kdf_r'], fields['kdf_p'])
+    return scatter_key(derive_key(key, kdf))
+
+
+def prepare_payload(data: bytes, key: Optional[str] = None, kdf: Optional[KdfParams] = None,
+                    compression: Optional[str] = None, level: int = DEFAULT_LEVEL) -> Tuple[bytes, int, dict]:
+    """Compresse (si les données rétrécissent) puis chiffre ; retourne les données, les drapeaux et les champs."""
+    flags, fields = 0, {}
+    if compression:
+        algorithm = algorithm_id(compression)
+        with stage("compress"):
+            packed = compress(data, algorithm, level)
+        if packed is not None:
+            data, flags, fields = packed, FLAG_COMPRESSED, {'compression': algorithm}
+    if key:
+        data, sealing, sealed_fields = encrypt_payload(key, data, kdf)
+        flags |= sealing
+        fields.update(sealed_fields)
+    return data, flags, fields
+
+
+def unpack_chunks(key: Optional[str], chunks: Iterable[bytes], header: Header) -> Iterator[bytes]:
+    """Déchiffre puis décompresse au fil de l'eau les données d'un conteneur."""
+    if header.encrypted:
+        if not key:
+            raise ValueError("Les données sont chiffrées : une clé est requise")
+        chunks = decrypt_chunks(key, chunks, header)
+    if header.compressed:
+        chunks = timed(decompress_stream(chunks, header.compression), "decompress")
+    return iter(chunks)
+
+
+def unpack_payload(key: Optional[str], data: bytes, header: Header) -> bytes:
+    """Déchiffre puis décompresse les données d'un conteneur."""
+    return b"".join(unpack_chunks(key, [data], header))
+
+
+def embed(carrier: str, data: bytes, output: str, lsb: int = 1, key: Optional[str] = None,
+          progress: Optional[Callable[[float], None]] = None, strip_budget: Optional[int] = None,
+          kdf: Optional[KdfParams] = None, compression: Optional[str] = None, level: int = DEFAULT_LEVEL,
+          scatter: bool = False, channels: Optional[str] = None, encoder: Optional[OutputOptions] = None,
+          image: Optional[Image.Image] = None):
+    """Cache les données (compressées puis chiffrées si demandé) dans une image et l'enregistre.
+
+    Avec `strip_budget`, l'image est traitée par bandes de lignes tenant dans ce budget mémoire.
+    Avec `scatter`, les données sont dispersées sur des pixels choisis par la clé.
+    `channels` choisit les composantes qui reçoivent les données (`RGBA`, `A`, `L`, ...) ;
+    `encoder` règle l'enregistrement (profil, niveau PNG, vérification).
+    `image` fournit le porteur déjà décodé (il n'est pas modifié).
+    """
+    if not strip_budget:
+        output_format(output)  # Un format avec perte est refusé avant tout traitement
+    data, flags, fields = prepare_payload(data, key, kdf, compression, level)
+    scatter_key = _scatter_fields(key, scatter, strip_budget, fields)
+    write_carrier(carrier, data, output, lsb, flags, progress, strip_budget, scatter_key, channels, encoder, image,
+                  **fields)
+
+
+def _opened(path: str, image: Optional[Image.Image] = None):
+    """Image déjà décodée (laissée ouverte), ou fichier ouvert pour la durée du bloc."""
+    return nullcontext(image) if image is not None else Image.open(path)
+
+
+def _check_strips(strip_budget: Optional[int], channels: Optional[str]):
+    """Refuse un jeu de composantes en mode bandes (seules R, G, B sont réécrites)."""
+    if strip_budget and channels:
+        raise ValueError("Mode bandes indisponible avec un jeu de composantes")
+
+
+def _in_place(carrier: str, output: str, scatter_key: Optional[bytes], channels: Optional[str],
+              encoder: Optional[OutputOptions]) -> bool:
+    """Vrai si la sortie peut être une copie du porteur modifiée en place (non compressé, même format, R, G, B)."""
+    if scatter_key or channels:
+        return False
+    with Image.open(carrier) as img:
+        fmt = check_output(output, img.mode)
+        return img.format == fmt.name and not save_options(fmt, encoder) and raw_layout(img) is not None
+
+
+def write_carrier(carrier: str, data: Union[bytes, Iterable[bytes]], output: str, lsb: int, flags: int = 0,
+                  progress: Optional[Callable[[float], None]] = None, strip_budget: Optional[int] = None,
+                  scatter_key: Optional[bytes] = None, channels: Optional[str] = None,
+                  encoder: Optional[OutputOptions] = None, image: Optional[Image.Image] = None,
+                  length: Optional[int] = None, **fields):
+    """Insère des données déjà préparées (chiffrées, ...) avec leur en-tête et enregistre l'image.
+
+    `data` peut être un itérable de morceaux de taille totale `length` (None si elle n'est connue qu'à la fin) :
+    ils sont insérés au fil de leur production, sans jamais être réunis en mémoire.
+    Un porteur non compressé gardant son format est traité par bandes projetées en mémoire :
+    seules les lignes qui reçoivent les données sont lues et réécrites.
+    Les données sont réparties sur toutes les images d'un PNG animé, d'un TIFF multipage ou d'un GIF animé.
+    """
+    progress = throttled(progress)
+    _check_strips(strip_budget, channels)
+    if image is None and not strip_budget and is_multiframe(carrier):
+        embed_frames(carrier, data, output, lsb, flags, progress, scatter_key, channels, encoder, length=length,
+                     **fields)
+        return
+    if strip_budget or _in_place(carrier, output, scatter_key, channels, encoder):
+        # La sortie garde le format du fichier porteur : seule la vérification s'applique
+        with atomic_output(output) as partial:
+            header = stream_embed(carrier, data, partial, lsb, flags, strip_budget or DEFAULT_STRIP_BUDGET,
+                                  progress, length, **fields)
+            if encoder and encoder.verify:
+                with stage("verify"):
+                    verify_output(partial, header)
+        return
+
+    with _opened(carrier, image) as img:
+        fmt = check_output(output, img.mode)
+        if isinstance(data, (bytes, bytearray)):
+            img = embed_payload(img, data, lsb, flags, progress, scatter_key, channels, **fields)
+        else:
+            img = embed_stream(img, data, length, lsb, flags, progress, scatter_key, channels, **fields)
+    save_carrier(img, output, lsb, fmt, encoder)
+
+
+def save_carrier(img: Image.Image, output: str, lsb: int, fmt: Optional[OutputFormat] = None,
+                 encoder: Optional[OutputOptions] = None):
+    """Enregistre une image porteuse sans perte ; le fichier n'apparaît qu'une fois l'en-tête vérifié (si demandé)."""
+    fmt = fmt or check_output(output, img.mode)
+    with atomic_output(output) as partial:
+        with stage("encode"):
+            save_image(img, partial, fmt, encoder)
+        if encoder and encoder.verify:
+            with stage("verify"):
+                verify_output(partial, header_of(img, lsb))
+
+
+def embed_file(carrier: str, source: str, output: str, lsb: int = 1, key: Optional[str] = None,
+               progress: Optional[Callable[[float], None]] = None, strip_budget: Optional[int] = None,
+               kdf: Optional[KdfParams] = None, compression: Optional[str] = None, level: int = DEFAULT_LEVEL,
+               scatter: bool = False, channels: Optional[str] = None, encoder: Optional[OutputOptions] = None):
+    """Cache un fichier quelconque, lu (compressé, chiffré) bloc par bloc au fil de l'insertion.
+
+    Quel que soit le porteur (bandes, modification en place, plusieurs images), les données chiffrées
+    ne sont jamais réunies en mémoire.
+
+    La compression n'est appliquée que si un échantillon du début du fichier rétrécit.
+    """
+    progress = throttled(progress)
+    _check_strips(strip_budget, channels)
+    if not strip_budget:
+        output_format(output)
+    size = os.path.getsize(source)
+    with open(source, 'rb') as f:
+        def read() -> Iterator[bytes]:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                yield chunk
+                if progress and size:
+                    progress(f.tell() / size)
+
+        chunks, length, flags, fields = timed(read(), "read"), size, 0, {}
+        if compression:
+            algorithm = algorithm_id(compression)
+            with stage("compress"):
+                worth = worth_compressing(f.read(SAMPLE_SIZE), algorithm, level)
+            if worth:
+                # La taille compressée n'est connue qu'à la fin : l'en-tête sera écrit en dernier
+                chunks, length = timed(compress_stream(chunks, algorithm, level), "compress"), None
+                flags, fields = FLAG_COMPRESSED, {'compression': algorithm}
+            f.seek(0)
+        if key:
+            aes_key, sealing, sealed_fields = _sealing(key, kdf)
+            sealed = encrypt_stream(aes_key, sealed_fields['nonce'], chunks, sealed_fields['frame_size'])
+            chunks = timed(sealed, "encrypt")
+            length = None if length is None else sealed_size(length)
+            flags |= sealing
+            fields.update(sealed_fields)
+        scatter_key = _scatter_fields(key, scatter, strip_budget, fields)
+        write_carrier(carrier, chunks, output, lsb, flags, strip_budget=strip_budget, scatter_key=scatter_key,
+                      channels=channels, encoder=encoder, length=length, **fields)
+
+
+def _streamed(path: str, lsb: int, strip_budget: Optional[int],
+              progress: Optional[Callable[[float], None]]) -> Optional[Tuple[Optional[Header], Iterator[bytes]]]:
+    """En-tête et données lus par bandes (mode demandé ou fichier non compressé), ou None s'il faut décoder l'image."""
+    if strip_budget or (is_raw(path) and not is_multiframe(path)):
+        try:
+            return stream_payload(path, lsb, strip_budget or DEFAULT_STRIP_BUDGET, progress)
+        except Unstreamable:
+            if strip_budget:
+                raise
+    return None
+
+
+def read_carrier(path: str, lsb: Optional[int] = 1, key: Optional[str] = None,
+                 progress: Optional[Callable[[float], None]] = None,
+                 strip_budget: Optional[int] = None,
+                 image: Optional[Image.Image] = None) -> Tuple[Optional[Header], bytes, int]:
+    """Lit l'en-tête et les données brutes d'une image ; retourne aussi la profondeur LSB utilisée."""
+    progress = throttled(progress)
+    if lsb is None:
+        with stage("detect"):
+            lsb = best_lsb(path, key)
+
+    streamed = _streamed(path, lsb, strip_budget, progress) if image is None else None
+    if streamed:
+        header, chunks = streamed
+        data = b"".join(chunks)
+    elif image is None and is_multiframe(path):
+        header, data = extract_frames(path, lsb, _scatter_key_for(key), progress)
+    else:
+        with _opened(path, image) as img:
+            header, data = extract_payload(img, lsb, progress, _scatter_key_for(key))
+    return header, bytes(data), lsb
+
+
+def _refuse_shard(header: Optional[Header]):
+    """Refuse l'extraction isolée d'un fragment de charge répartie."""
+    if header is not None and header.multiframe:
+        raise ValueError(
+            f"Cette image porte le fragment {header.shard_index + 1}/{header.shard_count} des images d'un même "
+            "fichier : lisez le fichier lui-même"
+        )
+    if header is not None and header.sharded:
+        raise ValueError(
+            f"Cette image contient le fragment {header.shard_index + 1}/{header.shard_count} "
+            "d'une charge répartie : utilisez l'extraction multi-images"
+        )
+
+
+def extract(path: str, lsb: Optional[int] = 1, key: Optional[str] = None,
+            progress: Optional[Callable[[float], None]] = None, strip_budget: Optional[int] = None,
+            image: Optional[Image.Image] = None) -> Extraction:
+    """Extrait les données cachées dans une image et les déchiffre si besoin.
+
+    Avec `lsb=None`, la profondeur est d'abord détectée sur les premiers pixels.
+    `image` fournit l'image déjà décodée.
+    """
+    header, data, lsb = read_carrier(path, lsb, key, progress, strip_budget, image)
+
+    _refuse_shard(header)
+    if header is not None:
+        return Extraction(unpack_payload(key, data, header), header, decrypted=header.encrypted, lsb=lsb)
+
+    # Ancien format : le chiffrement n'est pas signalé, on tente le déchiffrement si une clé est fournie
+    if key and data:
+        try:
+            with stage("decrypt"):
+                return Extraction(decrypt_data(key, data), decrypted=True, lsb=lsb)
+        except ValueError:
+            pass
+    return Extraction(data, lsb=lsb)
+
+
+def extract_file(path: str, output: str, lsb: Optional[int] = 1, key: Optional[str] = None,
+                 progress: Optional[Callable[[float], None]] = None,
+                 strip_budget: Optional[int] = None) -> Extraction:
+    """Extrait les données cachées directement dans un fichier, déchiffrées et décompressées bloc par bloc.
+
+    Un bloc altéré interrompt l'extraction : le fichier de sortie n'apparaît qu'une fois toutes les données écrites.
+    """
+    progress = throttled(progress)
+    if lsb is None:
+        with stage("detect"):
+            lsb = best_lsb(path, key)
+    streamed = _streamed(path, lsb, strip_budget, progress)
+    if streamed:
+        header, chunks = streamed
+    elif is_multiframe(path):
+        # Les fragments sont lus image par image, au rythme du déchiffrement et de l'écriture
+        header, chunks = frame_payload(path, lsb, _scatter_key_for(key), progress)
+    else:
+        with Image.open(path) as img:
+            header, chunks = extract_payload_stream(img, lsb, progress, _scatter_key_for(key))
+
+    _refuse_shard(header)
+    decrypted = False
+    if header is not None:
+        chunks, decrypted = unpack_chunks(key, chunks, header), header.encrypted
+    elif key:
+        # Ancien format : le message tient en mémoire, le déchiffrement est tenté comme dans `extract`
+        data = b"".join(chunks)
+        try:
+            with stage("decrypt"):
+                chunks, decrypted = [decrypt_data(key, data)], True
+        except ValueError:
+            chunks = [data]
+
+    size = 0
+    with atomic_output(output) as partial, open(partial, 'wb') as f:
+        for chunk in chunks:
+            checkpoint()
+            with stage("write"):
+                f.write(chunk)
+            size += len(chunk)
+    return Extraction(b"", header, decrypted, lsb, size)
+
+
+def carrier_capacity(path: str, lsb: int = 1, channels: Optional[str] = None, flags: int = 0) -> int:
+    """Octets de données que peut recevoir une image, en-têtes déduits (lecture de l'en-tête du fichier uniquement).
+
+    C'est la taille maximale acceptée par `embed` pour ces drapeaux (par défaut : ni chiffrement, ni compression) ;
+    une image à plusieurs images porte un en-tête de fragment dans chacune.
+    """
+    info = image_info(path)
+    if info.frames:
+        flags |= FRAME_FLAGS
+    shapes = info.frames or ((info.width, info.height, info.mode),)
+    return sum(payload_capacity(width, height, lsb, flags, mode, channels) for width, height, mode in shapes)
@@ -0,0 +1,224 @@
+# DATA-GHOST - Traitement par lots sur un pool de processus
+# Chaque tâche est isolée : une erreur sur une image n'interrompt pas le lot
+
+import csv  # Pour les manifestes CSV
+import json  # Pour les manifestes et rapports JSONL
+import os  # Pour le parcours des répertoires
+import time  # Pour la mesure des durées
+from concurrent.futures import ProcessPoolExecutor  # Pour le pool de processus
+from dataclasses import asdict, dataclass, replace  # Pour créer des classes de données
+from typing import Callable, Iterable, Iterator, List, Optional, Union  # Pour le typage
+
+from .api import embed, embed_file, extract, extract_file
+from .compress import DEFAULT_LEVEL
+from .crypto import KdfParams
+from .metrics import collect
+from .output import OutputOptions
+
+# Constantes
+IMAGE_EXTENSIONS = ('.png', '.bmp', '.tif', '.tiff', '.webp', '.ppm', '.pgm', '.gif')  # Images analysées
+MANIFEST_COLUMNS = ('carrier', 'output', 'payload', 'message', 'key', 'lsb', 'compression', 'level', 'scatter',
+                    'channels', 'profile')  # Colonnes reconnues d'un manifeste d'insertion
+
+
+# Classe pour stocker une tâche d'insertion
+@dataclass
+class EmbedJob:
+    carrier: str  # Image porteuse
+    output: str  # Image de sortie
+    payload: Optional[str] = None  # Fichier à cacher
+    message: Optional[str] = None  # Message texte à cacher (si pas de fichier)
+    key: Optional[str] = None  # Clé de chiffrement
+    lsb: int = 1  # Nombre de bits LSB
+    kdf: Optional[KdfParams] = None  # Paramètres de dérivation (sel partagé par les tâches de même clé)
+    compression: Optional[str] = None  # Compression avant chiffrement (zlib, lzma)
+    level: int = DEFAULT_LEVEL  # Niveau de compression
+    scatter: bool = False  # Dispersion des données sur des pixels choisis par la clé
+    channels: Optional[str] = None  # Composantes recevant les données (RGBA, A, L, ...)
+    encoder: Optional[OutputOptions] = None  # Enregistrement de l'image (profil, vérification)
+
+
+# Classe pour stocker une tâche d'extraction
+@dataclass
+class ExtractJob:
+    image: str  # Image à analyser
+    output: Optional[str] = None  # Fichier de sortie (sinon message dans le rapport)
+    key: Optional[str] = None  # Clé de déchiffrement
+    lsb: Optional[int] = 1  # Nombre de bits LSB (None: détection automatique)
+
+
+# Classe pour stocker une ligne de manifeste invalide (rapportée comme une tâche en erreur)
+@dataclass
+class InvalidJob:
+    line: int  # Numéro de la ligne dans le manifeste
+    error: str  # Raison du refus
+    carrier: Optional[str] = None  # Image porteuse, si la ligne l'indique
+    output: Optional[str] = None  # Image de sortie, si la ligne l'indique
+
+
+def _manifest_rows(path: str) -> Iterator[tuple]:
+    """Lignes d'un manifeste (JSONL ou CSV) : (numéro, colonnes) ou (numéro, erreur de lecture)."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.csv'):
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if v}
+            return
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, f"JSON invalide: {e}"
+                continue
+            yield number, row if isinstance(row, dict) else "La ligne n'est pas un objet JSON"
+
+
+def load_manifest(path: str, key: Optional[str] = None, lsb: int = 1, compression: Optional[str] = None,
+                  level: int = DEFAULT_LEVEL, scatter: bool = False, channels: Optional[str] = None,
+                  encoder: Optional[OutputOptions] = None) -> List[Union[EmbedJob, InvalidJob]]:
+    """Lit un manifeste d'insertion (JSONL ou CSV) ; les autres arguments servent de valeurs par défaut.
+
+    Une colonne `profile` remplace le profil d'encodage de `encoder` pour sa ligne.
+    Une ligne illisible, incomplète ou portant une colonne inconnue devient une `InvalidJob`,
+    rapportée en erreur sans interrompre le reste du lot.
+    """
+    # Un sel par phrase secrète : la dérivation n'est payée qu'une fois par processus à la relecture du lot
+    jobs, salts = [], {}
+    for number, row in _manifest_rows(path):
+        if isinstance(row, str):
+            jobs.append(InvalidJob(number, row))
+            continue
+        try:
+            jobs.append(_embed_job(row, key, lsb, compression, level, scatter, channels, encoder, salts))
+        except (TypeError, ValueError) as e:
+            carrier, output = (row.get(name) for name in ('carrier', 'output'))
+            jobs.append(InvalidJob(number, str(e), carrier if isinstance(carrier, str) else None,
+                                   output if isinstance(output, str) else None))
+    return jobs
+
+
+def _embed_job(row: dict, key: Optional[str], lsb: int, compression: Optional[str], level: int, scatter: bool,
+               channels: Optional[str], encoder: Optional[OutputOptions], salts: dict) -> EmbedJob:
+    """Tâche d'une ligne de manifeste complétée par les valeurs par défaut (ValueError si elle est invalide)."""
+    unknown = [str(column) for column in row if column not in MANIFEST_COLUMNS]
+    if unknown:
+        raise ValueError(f"Colonne inconnue: {', '.join(unknown)}")
+    missing = [column for column in ('carrier', 'output') if not row.get(column)]
+    if missing:
+        raise ValueError(f"Colonne manquante: {', '.join(missing)}")
+    row = dict(row)
+    row.setdefault('key', key)
+    row['lsb'] = int(row.get('lsb', lsb))
+    row.setdefault('compression', compression)
+    row['level'] = int(row.get('level', level))
+    value = row.get('scatter', scatter)
+    row['scatter'] = value if isinstance(value, bool) else str(value).lower() in ('1', 'true', 'oui')
+    row.setdefault('channels', channels)
+    profile = row.pop('profile', None)
+    row['encoder'] = replace(encoder or OutputOptions(), profile=profile) if profile else encoder
+    if row['key']:
+        row['kdf'] = salts.setdefault(row['key'], KdfParams.new())
+    return EmbedJob(**row)
+
+
+def iter_images(root: str, recursive: bool = True) -> Iterator[str]:
+    """Parcourt les images d'un répertoire au fil de l'eau, dans l'ordre alphabétique."""
+    for folder, dirs, files in os.walk(root):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(folder, name)
+        if not recursive:
+            break
+        dirs.sort()
+
+
+def scan_directory(root: str, output_dir: Optional[str] = None, key: Optional[str] = None,
+                   lsb: Optional[int] = 1, recursive: bool = True) -> List[ExtractJob]:
+    """Crée une tâche d'extraction pour chaque image d'un répertoire."""
+    jobs = []
+    for path in iter_images(root, recursive):
+        output = None
+        if output_dir:
+            relative = os.path.relpath(path, root)
+            output = os.path.join(output_dir, os.path.splitext(relative)[0] + '.bin')
+        jobs.append(ExtractJob(image=path, output=output, key=key, lsb=lsb))
+    return jobs
+
+
+def run_embed_job(job: EmbedJob) -> dict:
+    """Exécute une tâche d'insertion."""
+    if job.payload:
+        embed_file(job.carrier, job.payload, job.output, job.lsb, job.key, kdf=job.kdf, compression=job.compression,
+                   level=job.level, scatter=job.scatter, channels=job.channels, encoder=job.encoder)
+        return {'bytes': os.path.getsize(job.payload)}
+    data = (job.message or '').encode('utf-8')
+    embed(job.carrier, data, job.output, job.lsb, job.key, kdf=job.kdf, compression=job.compression, level=job.level,
+          scatter=job.scatter, channels=job.channels, encoder=job.encoder)
+    return {'bytes': len(data)}
+
+
+def run_extract_job(job: ExtractJob) -> dict:
+    """Exécute une tâche d'extraction."""
+    if job.output:
+        os.makedirs(os.path.dirname(job.output) or '.', exist_ok=True)
+        extraction = extract_file(job.image, job.output, job.lsb, job.key)
+    else:
+        extraction = extract(job.image, job.lsb, job.key)
+    result = {'bytes': extraction.size if job.output else len(extraction.data),
+              'header': extraction.header is not None, 'decrypted': extraction.decrypted, 'lsb': extraction.lsb}
+    if not job.output:
+        try:
+            result['message'] = extraction.data.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    return result
+
+
+def _isolated(task):
+    """Exécute une tâche en capturant ses erreurs pour ne pas interrompre le lot."""
+    func, index, job = task
+    start = time.perf_counter()
+    report = {'job': index, **{k: v for k, v in asdict(job).items() if k not in ('key', 'message', 'kdf')}}
+    with collect() as metrics:
+        try:
+            if isinstance(job, InvalidJob):
+                raise ValueError(job.error)
+            report.update(func(job))
+            report['status'] = 'ok'
+        except Exception as e:
+            report['status'] = 'error'
+            report['error'] = f"{type(e).__name__}: {e}"
+    report['seconds'] = round(time.perf_counter() - start, 4)
+    report['stages'] = metrics.report()['stages']
+    return report
+
+
+def run_batch(func: Callable[[object], dict], jobs: Iterable, workers: Optional[int] = None,
+              chunksize: Optional[int] = None) -> Iterator[dict]:
+    """Répartit les tâches sur un pool de processus et produit un rapport par tâche, dans l'ordre."""
+    tasks = [(func, index, job) for index, job in enumerate(jobs)]
+    workers = workers or os.cpu_count() or 1
+    if not chunksize:
+        # Même heuristique que multiprocessing.Pool.map : environ 4 tranches par processus
+        chunksize = max(1, -(-len(tasks) // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_isolated, tasks, chunksize=chunksize)
+
+
+def write_report(results: Iterable[dict], stream) -> dict:
+    """Écrit les rapports au format JSONL au fil de l'eau et retourne un résumé agrégé (durées par étape comprises)."""
+    summary = {'jobs': 0, 'ok': 0, 'error': 0, 'seconds': 0.0, 'stages': {}}
+    for result in results:
+        stream.write(json.dumps(result, ensure_ascii=False) + '\n')
+        stream.flush()
+        summary['jobs'] += 1
+        summary[result['status']] += 1
+        summary['seconds'] += result['seconds']
+        for name, seconds in result.get('stages', {}).items():
+            summary['stages'][name] = summary['stages'].get(name, 0.0) + seconds
+    summary['seconds'] = round(summary['seconds'], 4)
+    summary['stages'] = {name: round(seconds, 4) for name, seconds in summary['stages'].items()}
+    return summary
@@ -0,0 +1,226 @@
+# DATA-GHOST - Banc d'essai reproductible des performances d'insertion et d'extraction
+# Chaque cas s'exécute dans un processus neuf pour mesurer son pic de mémoire sans interférence
+
+import json  # Pour les résultats et la référence
+import os  # Pour les fichiers temporaires
+import platform  # Pour décrire la machine
+import statistics  # Pour la médiane des répétitions
+import tempfile  # Pour le répertoire des images générées
+import time  # Pour la mesure des durées
+from concurrent.futures import ProcessPoolExecutor  # Pour isoler chaque cas
+from dataclasses import asdict, dataclass, field  # Pour créer des classes de données
+from itertools import product  # Pour la matrice des cas
+from typing import Callable, Dict, List, Optional, Sequence, Tuple  # Pour le typage
+
+import numpy as np  # Pour la génération des images
+from PIL import Image  # Pour l'enregistrement des images
+
+try:
+    import resource  # Pic de mémoire (Unix uniquement)
+except ImportError:
+    resource = None
+
+from . import MAX_LSB
+from .api import embed, extract
+from .container import FLAG_AEAD, FLAG_ENCRYPTED, FLAG_KDF, payload_capacity
+from .crypto import key_cache
+from .metrics import collect
+
+# Constantes
+MODES = ("RGB", "RGBA", "P", "L")  # Modes des images générées
+RESOLUTIONS = ((640, 480), (1920, 1080))  # Résolutions par défaut
+PAYLOAD_SIZES = (1 << 10, 64 << 10, 1 << 20)  # Tailles de charge par défaut (octets)
+QUICK = {'resolutions': ((320, 240),), 'payload_sizes': (1 << 10, 16 << 10), 'repeat': 1}  # Préréglage rapide
+SEED = 20240101  # Graine des données générées (résultats reproductibles)
+BENCH_KEY = "banc-d-essai"  # Phrase secrète des cas chiffrés
+TIME_THRESHOLD = 0.15  # Ralentissement toléré par rapport à la référence
+RSS_THRESHOLD = 0.20  # Hausse de mémoire tolérée par rapport à la référence
+MIN_DELTA = 0.005  # Écart de durée en dessous duquel la différence est du bruit de mesure (secondes)
+
+
+# Classe pour décrire un cas de mesure
+@dataclass
+class BenchCase:
+    mode: str  # Mode de l'image porteuse
+    width: int  # Largeur
+    height: int  # Hauteur
+    lsb: int  # Profondeur LSB
+    encrypted: bool  # Avec chiffrement
+    payload_size: int  # Taille des données (octets)
+
+    @property
+    def name(self) -> str:
+        """Identifiant stable du cas (clé de comparaison avec la référence)."""
+        crypto = "aes" if self.encrypted else "clair"
+        return f"{self.mode}-{self.width}x{self.height}-lsb{self.lsb}-{crypto}-{self.payload_size}"
+
+
+# Classe pour stocker le résultat d'un cas
+@dataclass
+class BenchResult:
+    case: str  # Identifiant du cas
+    embed_seconds: float  # Durée médiane de l'insertion
+    extract_seconds: float  # Durée médiane de l'extraction
+    embed_mbps: float  # Débit d'insertion (Mo de données par seconde)
+    extract_mbps: float  # Débit d'extraction
+    peak_rss_mb: Optional[float]  # Pic de mémoire du processus (None si indisponible)
+    ok: bool  # Aller-retour correct
+    stages: Dict[str, float] = field(default_factory=dict)  # Durées par étape (dernière répétition)
+    error: Optional[str] = None  # Erreur éventuelle
+
+
+def build_cases(modes: Sequence[str] = MODES, resolutions: Sequence[Tuple[int, int]] = RESOLUTIONS,
+                depths: Sequence[int] = range(1, MAX_LSB + 1), payload_sizes: Sequence[int] = PAYLOAD_SIZES,
+                encryption: Sequence[bool] = (False, True)) -> List[BenchCase]:
+    """Matrice des cas, sans ceux dont la charge dépasse la capacité de l'image."""
+    cases = []
+    for mode, (width, height), lsb, encrypted, size in product(modes, resolutions, depths, encryption, payload_sizes):
+        # Marge pour les étiquettes des blocs chiffrés et l'en-tête étendu
+        flags = FLAG_ENCRYPTED | FLAG_KDF | FLAG_AEAD if encrypted else 0
+        if size + size // 1024 + 16 <= payload_capacity(width, height, lsb, flags, mode):
+            cases.append(BenchCase(mode, width, height, lsb, encrypted, size))
+    return cases
+
+
+def make_carrier(directory: str, mode: str, width: int, height: int) -> str:
+    """Génère (une fois) une image porteuse de bruit reproductible."""
+    path = os.path.join(directory, f"porteuse-{mode}-{width}x{height}.png")
+    if not os.path.exists(path):
+        rng = np.random.default_rng(SEED)
+        if mode in ("RGB", "RGBA"):
+            img = Image.fromarray(rng.integers(0, 256, (height, width, len(mode)), dtype=np.uint8), mode)
+        else:
+            img = Image.fromarray(rng.integers(0, 256, (height, width), dtype=np.uint8), "L")
+            if mode == "P":
+                img = img.convert("P")
+                img.putpalette(rng.integers(0, 256, 768, dtype=np.uint8).tobytes())
+        img.save(path, compress_level=1)
+    return path
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pic de mémoire du processus courant en Mo."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets ailleurs
+    return round(peak / (1 << 20 if platform.system() == "Darwin" else 1 << 10), 1)
+
+
+def run_case(task) -> dict:
+    """Mesure un cas (exécuté dans un processus neuf)."""
+    case, carrier, directory, repeat = task
+    key = BENCH_KEY if case.encrypted else None
+    rng = np.random.default_rng(SEED + case.payload_size)
+    payload = rng.integers(0, 256, case.payload_size, dtype=np.uint8).tobytes()
+    output = os.path.join(directory, f"{case.name}.png")
+
+    embed_times, extract_times, ok, stages, error = [], [], True, {}, None
+    try:
+        for _ in range(repeat):
+            with collect() as metrics:
+                # Chaque opération paie la dérivation de clé, comme une image isolée en production
+                key_cache.clear()
+                start = time.perf_counter()
+                embed(carrier, payload, output, case.lsb, key)
+                embed_times.append(time.perf_counter() - start)
+                key_cache.clear()
+                start = time.perf_counter()
+                data = extract(output, case.lsb, key).data
+                extract_times.append(time.perf_counter() - start)
+            ok = ok and data == payload
+            stages = metrics.report()['stages']
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+    finally:
+        if os.path.exists(output):
+            os.remove(output)
+
+    embed_seconds = statistics.median(embed_times) if embed_times else 0.0
+    extract_seconds = statistics.median(extract_times) if extract_times else 0.0
+    megabytes = case.payload_size / (1 << 20)
+    return asdict(BenchResult(
+        case=case.name,
+        embed_seconds=round(embed_seconds, 4),
+        extract_seconds=round(extract_seconds, 4),
+        embed_mbps=round(megabytes / embed_seconds, 3) if embed_seconds else 0.0,
+        extract_mbps=round(megabytes / extract_seconds, 3) if extract_seconds else 0.0,
+        peak_rss_mb=_peak_rss_mb(),
+        ok=ok,
+        stages=stages,
+        error=error,
+    ))
+
+
+def _pool() -> ProcessPoolExecutor:
+    """Un seul processus à la fois (mesures sans concurrence), renouvelé à chaque cas si possible."""
+    try:
+        return ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1)
+    except TypeError:  # Python < 3.11
+        return ProcessPoolExecutor(max_workers=1)
+
+
+def run_suite(cases: Sequence[BenchCase], repeat: int = 3, directory: Optional[str] = None,
+              progress: Optional[Callable[[dict], None]] = None) -> dict:
+    """Exécute les cas un par un et retourne le rapport complet (machine et résultats)."""
+    with tempfile.TemporaryDirectory(prefix="dataghost-bench-", dir=directory) as tmp:
+        tasks = [
+            (case, make_carrier(tmp, case.mode, case.width, case.height), tmp, repeat) for case in cases
+        ]
+        results = []
+        with _pool() as executor:
+            for result in executor.map(run_case, tasks):
+                results.append(result)
+                if progress:
+                    progress(result)
+
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'cpus': os.cpu_count(),
+            'numpy': np.__version__,
+            'pillow': Image.__version__,
+        },
+        'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def compare(report: dict, baseline: dict, time_threshold: float = TIME_THRESHOLD,
+            rss_threshold: float = RSS_THRESHOLD) -> List[str]:
+    """Liste les régressions (durée, mémoire, aller-retour) par rapport à une référence."""
+    reference = {result['case']: result for result in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        name = result['case']
+        if not result['ok']:
+            regressions.append(f"{name}: aller-retour incorrect {result.get('error') or ''}".rstrip())
+        base = reference.get(name)
+        if base is None:
+            continue
+        for metric in ('embed_seconds', 'extract_seconds'):
+            slower = result[metric] - base[metric]
+            if base[metric] and slower > MIN_DELTA and result[metric] > base[metric] * (1 + time_threshold):
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} s (référence {base[metric]} s, "
+                    f"+{(result[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+        if base.get('peak_rss_mb') and result.get('peak_rss_mb') and \
+                result['peak_rss_mb'] > base['peak_rss_mb'] * (1 + rss_threshold):
+            regressions.append(f"{name}: pic mémoire {result['peak_rss_mb']} Mo (référence {base['peak_rss_mb']} Mo)")
+    return regressions
+
+
+def load_report(path: str) -> dict:
+    """Lit un rapport JSON (référence)."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_report(report: dict, path: str):
+    """Enregistre un rapport JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,513 @@
+# DATA-GHOST - Interface en ligne de commande
+# Les modules lourds (NumPy, Pillow, interface graphique) ne sont importés que par la commande qui en a besoin
+
+import argparse  # Pour l'analyse des arguments
+import json  # Pour le rapport des durées
+import os  # Pour les variables d'environnement
+import sys  # Pour les flux standard
+
+from . import MAX_LSB
+
+# Constantes
+KEY_ENV = "DATAGHOST_KEY"  # Variable d'environnement contenant la clé par défaut
+
+
+def _depth(value: str):
+    """Profondeur LSB passée en argument (`auto` pour la détection automatique)."""
+    if value == "auto":
+        return None
+    lsb = int(value)
+    if not 1 <= lsb <= MAX_LSB:
+        raise argparse.ArgumentTypeError(f"profondeur entre 1 et {MAX_LSB} ou 'auto'")
+    return lsb
+
+
+def _budget(args):
+    """Convertit le budget mémoire des bandes (Mo) en octets."""
+    return args.strip_budget << 20 if args.strip_budget else None
+
+
+def _key(args) -> str:
+    """Retourne la clé passée en argument ou dans l'environnement."""
+    return args.key if args.key is not None else os.environ.get(KEY_ENV, "")
+
+
+def _encoder(args):
+    """Réglages d'enregistrement de l'image de sortie."""
+    from .output import OutputOptions
+
+    return OutputOptions(args.profile, args.png_level, args.png_strategy, args.verify)
+
+
+def _read_payload(args) -> bytes:
+    """Lit les données à cacher (fichier, message ou entrée standard)."""
+    if args.file:
+        with open(args.file, 'rb') as f:
+            return f.read()
+    if args.message is not None:
+        return args.message.encode('utf-8')
+    return sys.stdin.buffer.read()
+
+
+def _is_text(data: bytes) -> bool:
+    """Vrai si les données sont un texte UTF-8."""
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _write_output(args, data: bytes):
+    """Écrit les données extraites dans un fichier ou sur la sortie standard."""
+    if args.output:
+        from .jobs import atomic_output
+
+        with atomic_output(args.output) as partial, open(partial, 'wb') as f:
+            f.write(data)
+        print(f"{len(data)} octets extraits dans: {args.output}")
+    else:
+        sys.stdout.buffer.write(data)
+        if sys.stdout.isatty() and _is_text(data):
+            # Retour à la ligne pour le terminal uniquement : un flux redirigé reçoit les octets tels quels
+            sys.stdout.buffer.write(b"\n")
+
+
+def cmd_embed(args) -> int:
+    """Cache un message ou un fichier dans une image."""
+    from .api import embed, embed_file
+
+    key = _key(args) or None
+    options = {'strip_budget': _budget(args), 'compression': args.compress, 'level': args.level,
+               'scatter': args.scatter, 'channels': args.channels, 'encoder': _encoder(args)}
+    if args.file:
+        # Le fichier est lu, compressé et chiffré bloc par bloc pendant l'insertion
+        embed_file(args.carrier, args.file, args.output, args.lsb, key, **options)
+    else:
+        embed(args.carrier, _read_payload(args), args.output, args.lsb, key, **options)
+    print(f"Message caché dans: {args.output}")
+    return 0
+
+
+def cmd_extract(args) -> int:
+    """Extrait les données cachées dans une image."""
+    from .api import extract, extract_file
+
+    key = _key(args) or None
+    if args.output:
+        # Écriture au fil du déchiffrement, sans garder les données en mémoire
+        extraction = extract_file(args.image, args.output, args.lsb, key, strip_budget=_budget(args))
+    else:
+        extraction = extract(args.image, args.lsb, key, strip_budget=_budget(args))
+    if args.lsb is None:
+        print(f"Profondeur LSB détectée: {extraction.lsb}", file=sys.stderr)
+    if args.output:
+        print(f"{extraction.size} octets extraits dans: {args.output}")
+    else:
+        _write_output(args, extraction.data)
+    return 0
+
+
+def cmd_analyze(args) -> int:
+    """Calcule les statistiques LSB d'une image et enregistre les aperçus de ses plans de bits."""
+    from . import analysis
+
+    report = analysis.analyze_image(args.image, args.bits, args.workers)
+    print(analysis.format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+    if args.planes:
+        os.makedirs(args.planes, exist_ok=True)
+        stem = os.path.splitext(os.path.basename(args.image))[0]
+        for name, preview in report.previews.items():
+            preview.save(os.path.join(args.planes, f"{stem}_{name}.png"))
+    return 0
+
+
+def cmd_capacity(args) -> int:
+    """Affiche, pour chaque profondeur LSB, les octets qu'accepte l'insertion sans chiffrement (en-tête déduit)."""
+    from .api import carrier_capacity
+
+    depths = [args.lsb] if args.lsb else range(1, MAX_LSB + 1)
+    for path in args.images:
+        for lsb in depths:
+            print(f"{path}\tLSB {lsb}\t{carrier_capacity(path, lsb, args.channels)} octets")
+    return 0
+
+
+def cmd_plan(args) -> int:
+    """Recommande l'image porteuse et la profondeur LSB les plus adaptées à une charge."""
+    from .compress import SAMPLE_SIZE
+    from .planner import estimate_size, payload_flags, plan, stored_size
+
+    if args.size is not None:
+        sample, total = b"", args.size
+    elif args.file:
+        total = os.path.getsize(args.file)
+        with open(args.file, 'rb') as f:
+            sample = f.read(SAMPLE_SIZE)
+    else:
+        sample = _read_payload(args)
+        total = len(sample)
+    size = stored_size(estimate_size(sample, total, args.compress, args.level), args.encrypt)
+    plans = plan(args.images, size, payload_flags(args.encrypt, bool(args.compress)), args.workers, args.channels)
+
+    print(f"{size} octets à cacher")
+    for p in plans:
+        depths = "\t".join(f"LSB {lsb}: {room}" for lsb, room in p.capacities.items())
+        if p.error:
+            print(f"{p.path}\tinutilisable ({p.error})")
+        elif p.fits:
+            print(f"{p.path}\tLSB {p.lsb} ({p.channels})\t{p.modified_pixels} pixels modifiés\t{depths}")
+        else:
+            print(f"{p.path}\ttrop petite\t{depths}")
+    if not plans or not plans[0].fits:
+        print("Aucune image ne peut contenir ces données", file=sys.stderr)
+        return 1
+    best = plans[0]
+    print(f"Recommandation: {best.path} (LSB {best.lsb}, {best.channels})")
+    return 0
+
+
+def cmd_batch(args) -> int:
+    """Traite un lot d'images sur un pool de processus et écrit un rapport JSONL."""
+    from . import batch
+    from .crypto import CACHE_SIZE_ENV, CACHE_TTL_ENV, key_cache
+    from .metrics import merge
+
+    # Les processus du pool héritent de la configuration du cache par l'environnement
+    if args.kdf_cache is not None:
+        os.environ[CACHE_SIZE_ENV] = str(args.kdf_cache)
+    if args.kdf_ttl is not None:
+        os.environ[CACHE_TTL_ENV] = str(args.kdf_ttl)
+    key_cache.configure(args.kdf_cache, args.kdf_ttl)
+
+    key = _key(args) or None
+    if args.mode == "embed":
+        if args.lsb is None:
+            raise ValueError("La détection automatique ne s'applique qu'à l'extraction")
+        func, jobs = batch.run_embed_job, batch.load_manifest(
+            args.source, key, args.lsb, args.compress, args.level, args.scatter, args.channels, _encoder(args)
+        )
+    else:
+        func, jobs = batch.run_extract_job, batch.scan_directory(
+            args.source, args.output_dir, key, args.lsb, recursive=not args.no_recursive
+        )
+
+    results = batch.run_batch(func, jobs, args.workers, args.chunksize)
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            summary = batch.write_report(results, f)
+    else:
+        summary = batch.write_report(results, sys.stdout)
+    merge(summary['stages'])  # Durées des processus du pool, reprises par --timings
+    print(
+        f"{summary['jobs']} tâches | {summary['ok']} réussies | {summary['error']} en erreur | "
+        f"{summary['seconds']} s cumulées",
+        file=sys.stderr
+    )
+    if summary['stages']:
+        stages = sorted(summary['stages'].items(), key=lambda item: -item[1])
+        print(" | ".join(f"{name} {seconds} s" for name, seconds in stages), file=sys.stderr)
+    return 1 if summary['error'] else 0
+
+
+def cmd_scan(args) -> int:
+    """Recherche les images contenant des données cachées et écrit un rapport JSONL au fil de l'eau."""
+    from . import scan
+    from .metrics import merge
+
+    counts = {'images': 0, 'cached': 0, 'suspect': 0, 'error': 0}
+    probing = 0.0  # Durée cumulée des analyses dans les processus du pool
+    index = scan.ScanIndex(args.index) if args.index else None
+    report = open(args.report, 'w', encoding='utf-8') if args.report else sys.stdout
+    results = scan.scan_images(args.directory, _key(args) or None, args.workers, index, not args.no_recursive)
+    try:
+        for result in results:
+            counts['images'] += 1
+            counts['cached'] += result['cached']
+            counts['suspect'] += result.get('suspect', False)
+            counts['error'] += result['status'] == 'error'
+            probing += 0.0 if result['cached'] else result['seconds']
+            if result.get('suspect') or not args.suspects:
+                report.write(json.dumps(result, ensure_ascii=False) + '\n')
+                report.flush()
+        if index:
+            index.compact()
+    finally:
+        if index:
+            index.close()
+        if args.report:
+            report.close()
+    merge({'probe': probing})
+    print(
+        f"{counts['images']} images | {counts['cached']} inchangées (index) | {counts['suspect']} suspectes | "
+        f"{counts['error']} en erreur",
+        file=sys.stderr
+    )
+    return 0
+
+
+def cmd_shard(args) -> int:
+    """Répartit une charge sur plusieurs images, ou la reconstitue."""
+    from . import shard
+
+    key = _key(args) or None
+    if args.mode == "embed":
+        if args.lsb is None:
+            raise ValueError("La détection automatique ne s'applique qu'à l'extraction")
+        if not args.output_dir:
+            raise ValueError("Indiquez le répertoire des images de sortie (--output-dir)")
+        data = _read_payload(args)
+        os.makedirs(args.output_dir, exist_ok=True)
+        outputs = [
+            os.path.join(args.output_dir, os.path.splitext(os.path.basename(path))[0] + ".png")
+            for path in args.images
+        ]
+        session = shard.shard_embed(
+            args.images, data, outputs, args.lsb, key, args.workers, compression=args.compress, level=args.level,
+            encoder=_encoder(args)
+        )
+        print(f"Session {session}: {len(outputs)} fragments écrits dans {args.output_dir}")
+        return 0
+
+    result = shard.shard_extract(args.images, args.lsb, key, args.workers)
+    for path, error in result.errors.items():
+        print(f"{path}: {error}", file=sys.stderr)
+    print(
+        f"Session {result.session}: {len(result.found)}/{result.count} fragments", file=sys.stderr
+    )
+    if result.missing:
+        missing = ", ".join(str(i + 1) for i in result.missing)
+        raise ValueError(f"Fragments manquants: {missing}")
+    _write_output(args, result.data)
+    return 0
+
+
+def cmd_bench(args) -> int:
+    """Mesure les performances d'insertion et d'extraction et les compare à une référence."""
+    from . import bench
+
+    options = dict(bench.QUICK) if args.quick else {}
+    repeat = args.repeat or options.pop('repeat', 3)
+    options.pop('repeat', None)
+    if args.modes:
+        options['modes'] = args.modes
+    if args.lsb:
+        options['depths'] = args.lsb
+    if args.sizes:
+        options['payload_sizes'] = [size << 10 for size in args.sizes]
+    if args.resolutions:
+        options['resolutions'] = [tuple(int(v) for v in r.lower().split("x")) for r in args.resolutions]
+    cases = bench.build_cases(**options)
+
+    def show(result):
+        status = "ok" if result['ok'] else "ÉCHEC"
+        print(
+            f"{result['case']:<40} insertion {result['embed_mbps']:>8} Mo/s | "
+            f"extraction {result['extract_mbps']:>8} Mo/s | {result['peak_rss_mb']} Mo | {status}",
+            file=sys.stderr
+        )
+
+    print(f"{len(cases)} cas, {repeat} répétition(s)", file=sys.stderr)
+    report = bench.run_suite(cases, repeat, progress=show)
+    if args.output:
+        bench.save_report(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+
+    failures = [f"{r['case']}: aller-retour incorrect" for r in report['results'] if not r['ok']]
+    if args.baseline:
+        failures = bench.compare(report, bench.load_report(args.baseline), args.threshold / 100)
+    for failure in failures:
+        print(f"Régression: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_serve(args) -> int:
+    """Démarre le service local et traite les requêtes jusqu'à l'interruption (Ctrl+C)."""
+    from . import service
+
+    workers = args.workers or service.SERVICE_WORKERS
+
+    def ready(server):
+        where = args.socket or f"http://{args.host}:{args.port}"
+        print(f"Service à l'écoute: {where} ({workers} traitements simultanés), racine: {server.service.root}",
+              file=sys.stderr)
+        if server.service.token:
+            print(f"Jeton ({service.TOKEN_HEADER} ou variable {service.TOKEN_ENV}): {server.service.token}",
+                  file=sys.stderr)
+
+    service.serve(args.host, args.port, args.socket, workers, args.max_pending or 4 * workers, args.cache << 20, ready,
+                  args.root)
+    return 0
+
+
+def cmd_gui(args) -> int:
+    """Ouvre l'interface graphique."""
+    from .gui import DataGhostApp
+
+    app = DataGhostApp()
+    app.mainloop()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur d'arguments de la ligne de commande."""
+    parser = argparse.ArgumentParser(prog="dataghost", description="DATA-GHOST - Outil de stéganographie")
+    commands = parser.add_subparsers(dest="command")
+
+    lsb = argparse.ArgumentParser(add_help=False)
+    lsb.add_argument("--lsb", type=int, choices=range(1, MAX_LSB + 1), default=1, help="nombre de bits LSB")
+    key = argparse.ArgumentParser(add_help=False)
+    key.add_argument("--key", help=f"phrase secrète (par défaut: variable {KEY_ENV})")
+    strips = argparse.ArgumentParser(add_help=False)
+    strips.add_argument(
+        "--strip-budget", type=int, metavar="MO",
+        help="traiter l'image par bandes tenant dans ce budget mémoire (BMP, PPM, TIFF non compressé)"
+    )
+    timings = argparse.ArgumentParser(add_help=False)
+    timings.add_argument("--timings", action="store_true", help="afficher la durée de chaque étape (JSON sur stderr)")
+    packing = argparse.ArgumentParser(add_help=False)
+    packing.add_argument("--compress", choices=["zlib", "lzma"], help="compresser avant chiffrement (embed)")
+    packing.add_argument("--level", type=int, choices=range(1, 10), default=6, metavar="1-9",
+                         help="niveau de compression (par défaut: 6)")
+    encoding = argparse.ArgumentParser(add_help=False)
+    encoding.add_argument("--profile", choices=["fast", "balanced", "small"], default="balanced",
+                          help="enregistrement de l'image : fast (débit), balanced (défaut), small (taille)")
+    encoding.add_argument("--png-level", type=int, choices=range(0, 10), metavar="0-9",
+                          help="niveau deflate du PNG de sortie (remplace celui du profil)")
+    encoding.add_argument("--png-strategy", choices=["default", "filtered", "huffman", "rle", "fixed"],
+                          help="stratégie deflate du PNG de sortie")
+    encoding.add_argument("--verify", action="store_true", help="relire l'en-tête dans l'image enregistrée")
+    components = argparse.ArgumentParser(add_help=False)
+    components.add_argument(
+        "--channels", metavar="JEU",
+        help="composantes recevant les données : RGB, RGBA, R, G, B, A, L, LA (par défaut: RGB, L en niveaux de gris)"
+    )
+
+    p = commands.add_parser("embed", parents=[lsb, key, strips, packing, components, encoding, timings],
+                            help="cacher des données dans une image")
+    p.add_argument("carrier", help="image porteuse")
+    p.add_argument("output", help="image de sortie (PNG, BMP, TIFF, PPM ou WebP sans perte)")
+    source = p.add_mutually_exclusive_group()
+    source.add_argument("-m", "--message", help="message texte (par défaut: entrée standard)")
+    source.add_argument("-f", "--file", help="fichier à cacher")
+    p.add_argument("--scatter", action="store_true", help="disperser les données sur des pixels choisis par la clé")
+    p.set_defaults(func=cmd_embed)
+
+    p = commands.add_parser("extract", parents=[key, strips, timings], help="extraire les données d'une image")
+    p.add_argument("image", help="image à analyser")
+    p.add_argument("--lsb", type=_depth, default=1, help="nombre de bits LSB, ou 'auto'")
+    p.add_argument("-o", "--output", help="fichier de sortie (par défaut: sortie standard)")
+    p.set_defaults(func=cmd_extract)
+
+    p = commands.add_parser("analyze", parents=[timings], help="stéganalyse : khi-deux, analyse RS et plans de bits")
+    p.add_argument("image", help="image à analyser")
+    p.add_argument("-o", "--output", help="rapport JSON")
+    p.add_argument("--planes", metavar="RÉPERTOIRE", help="enregistrer les aperçus des plans de bits")
+    p.add_argument("--bits", nargs="+", type=int, choices=range(8), default=[0],
+                   help="plans de bits à prévisualiser (par défaut: 0, le LSB)")
+    p.add_argument("-w", "--workers", type=int, help="nombre de processus (par défaut: nombre de cœurs)")
+    p.set_defaults(func=cmd_analyze)
+
+    p = commands.add_parser("capacity", parents=[components], help="afficher la capacité de stockage")
+    p.add_argument("images", nargs="+", help="images porteuses")
+    p.add_argument("--lsb", type=int, choices=range(1, MAX_LSB + 1), help="nombre de bits LSB (par défaut: tous)")
+    p.set_defaults(func=cmd_capacity)
+
+    p = commands.add_parser("plan", parents=[packing, components], help="choisir l'image porteuse et la profondeur LSB")
+    p.add_argument("images", nargs="+", help="images porteuses candidates")
+    source = p.add_mutually_exclusive_group()
+    source.add_argument("-m", "--message", help="message texte (par défaut: entrée standard)")
+    source.add_argument("-f", "--file", help="fichier à cacher")
+    source.add_argument("-s", "--size", type=int, help="taille des données (octets)")
+    p.add_argument("--encrypt", action="store_true", help="prévoir le surcoût du chiffrement")
+    p.add_argument("-w", "--workers", type=int, help="lectures d'en-têtes simultanées")
+    p.set_defaults(func=cmd_plan)
+
+    p = commands.add_parser("batch", parents=[key, packing, components, encoding, timings],
+                            help="traiter un lot d'images en parallèle")
+    p.add_argument("--lsb", type=_depth, default=1, help="nombre de bits LSB, ou 'auto' (extract)")
+    p.add_argument("mode", choices=["embed", "extract"], help="type de traitement")
+    p.add_argument("source", help="manifeste JSONL/CSV (embed) ou répertoire d'images (extract)")
+    p.add_argument("-w", "--workers", type=int, help="nombre de processus (par défaut: nombre de cœurs)")
+    p.add_argument("--chunksize", type=int, help="tâches envoyées à la fois à chaque processus")
+    p.add_argument("-r", "--report", help="rapport JSONL (par défaut: sortie standard)")
+    p.add_argument("-o", "--output-dir", help="répertoire des données extraites (extract)")
+    p.add_argument("--no-recursive", action="store_true", help="ne pas parcourir les sous-répertoires (extract)")
+    p.add_argument("--kdf-cache", type=int, metavar="N", help="clés dérivées gardées en cache par processus")
+    p.add_argument("--kdf-ttl", type=float, metavar="S", help="durée de vie d'une clé dérivée en cache (0: illimitée)")
+    p.add_argument("--scatter", action="store_true", help="disperser les données sur des pixels choisis par la clé (embed)")
+    p.set_defaults(func=cmd_batch)
+
+    p = commands.add_parser("scan", parents=[key, timings],
+                            help="rechercher les images contenant des données cachées")
+    p.add_argument("directory", help="répertoire à analyser")
+    p.add_argument("-i", "--index", help="index JSONL des analyses (les fichiers inchangés ne sont pas relus)")
+    p.add_argument("-r", "--report", help="rapport JSONL (par défaut: sortie standard)")
+    p.add_argument("-w", "--workers", type=int, help="nombre de processus (par défaut: nombre de cœurs)")
+    p.add_argument("--suspects", action="store_true", help="ne rapporter que les images suspectes")
+    p.add_argument("--no-recursive", action="store_true", help="ne pas parcourir les sous-répertoires")
+    p.set_defaults(func=cmd_scan)
+
+    p = commands.add_parser("shard", parents=[key, packing, encoding, timings],
+                            help="répartir une charge sur plusieurs images")
+    p.add_argument("mode", choices=["embed", "extract"], help="répartir ou reconstituer")
+    p.add_argument("images", nargs="+", help="images porteuses (embed) ou fragments, dans n'importe quel ordre")
+    p.add_argument("--lsb", type=_depth, default=1, help="nombre de bits LSB, ou 'auto' (extract)")
+    p.add_argument("-d", "--output-dir", help="répertoire des images de sortie (embed)")
+    p.add_argument("-o", "--output", help="fichier des données reconstituées (extract)")
+    p.add_argument("-w", "--workers", type=int, help="nombre de processus (par défaut: nombre de cœurs)")
+    source = p.add_mutually_exclusive_group()
+    source.add_argument("-m", "--message", help="message texte (embed, par défaut: entrée standard)")
+    source.add_argument("-f", "--file", help="fichier à répartir (embed)")
+    p.set_defaults(func=cmd_shard)
+
+    p = commands.add_parser("bench", help="mesurer les performances (rapport JSON)")
+    p.add_argument("--quick", action="store_true", help="petite matrice de cas (vérification rapide)")
+    p.add_argument("--modes", nargs="+", choices=["RGB", "RGBA", "P", "L"], help="modes des images générées")
+    p.add_argument("--resolutions", nargs="+", metavar="LxH", help="résolutions des images générées")
+    p.add_argument("--lsb", nargs="+", type=int, choices=range(1, MAX_LSB + 1), help="profondeurs LSB")
+    p.add_argument("--sizes", nargs="+", type=int, metavar="KO", help="tailles des données (Ko)")
+    p.add_argument("--repeat", type=int, help="répétitions par cas (médiane retenue)")
+    p.add_argument("-o", "--output", help="rapport JSON (par défaut: sortie standard)")
+    p.add_argument("--baseline", help="rapport de référence à comparer")
+    p.add_argument("--threshold", type=float, default=15, metavar="%", help="ralentissement toléré (par défaut: 15)")
+    p.set_defaults(func=cmd_bench)
+
+    p = commands.add_parser("serve", help="démarrer le service local (requêtes JSON sur HTTP)")
+    p.add_argument("--host", default="127.0.0.1", help="adresse d'écoute (par défaut: 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="port d'écoute (par défaut: 8765)")
+    p.add_argument("--socket", metavar="CHEMIN", help="écouter sur une socket Unix plutôt qu'un port")
+    p.add_argument("-w", "--workers", type=int, help="traitements simultanés (par défaut: nombre de cœurs - 1, 4 au plus)")
+    p.add_argument("--max-pending", type=int, metavar="N",
+                   help="requêtes acceptées à la fois, au-delà refusées (503) (par défaut: 4 par traitement)")
+    p.add_argument("--cache", type=int, default=512, metavar="MO", help="mémoire des porteurs décodés (par défaut: 512)")
+    p.add_argument("--root", metavar="DOSSIER",
+                   help="seul dossier lu et écrit par le service (par défaut: dossier courant)")
+    p.set_defaults(func=cmd_serve)
+
+    p = commands.add_parser("gui", help="ouvrir l'interface graphique")
+    p.set_defaults(func=cmd_gui)
+    return parser
+
+
+def main(argv=None) -> int:
+    """Point d'entrée de la ligne de commande (sans commande: interface graphique)."""
+    args = build_parser().parse_args(argv)
+    func = getattr(args, "func", cmd_gui)
+    try:
+        if getattr(args, "timings", False):
+            from .metrics import collect
+
+            with collect() as metrics:
+                code = func(args)
+            print(json.dumps(metrics.report()), file=sys.stderr)
+            return code
+        return func(args)
+    except (OSError, ValueError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,101 @@
+# DATA-GHOST - Compression des données avant chiffrement
+# Moins d'octets à cacher, c'est moins de pixels modifiés et une insertion plus rapide
+
+import lzma  # Pour la compression LZMA (meilleur taux)
+import zlib  # Pour la compression zlib (plus rapide)
+from typing import Iterable, Iterator, Optional  # Pour le typage
+
+from .engine import CHUNK_SIZE
+
+# Constantes
+COMPRESS_ZLIB = 1  # Identifiant de zlib dans l'en-tête
+COMPRESS_LZMA = 2  # Identifiant de LZMA dans l'en-tête
+ALGORITHMS = {"zlib": COMPRESS_ZLIB, "lzma": COMPRESS_LZMA}  # Nom -> identifiant
+DEFAULT_LEVEL = 6  # Niveau de compression par défaut (1 à 9)
+SAMPLE_SIZE = 1 << 20  # Échantillon compressé pour décider si un fichier vaut la peine d'être compressé
+MIN_RATIO = 0.95  # Taux au-delà duquel la compression est abandonnée
+
+
+def algorithm_id(name: str) -> int:
+    """Identifiant d'en-tête d'un algorithme de compression."""
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Compression inconnue: {name} (choix: {', '.join(ALGORITHMS)})")
+
+
+def _compressor(algorithm: int, level: int):
+    """Crée un compresseur incrémental."""
+    if not 1 <= level <= 9:
+        raise ValueError(f"Niveau de compression entre 1 et 9: {level}")
+    if algorithm == COMPRESS_ZLIB:
+        return zlib.compressobj(level)
+    if algorithm == COMPRESS_LZMA:
+        return lzma.LZMACompressor(preset=level)
+    raise ValueError(f"Compression inconnue: {algorithm}")
+
+
+def compress(data: bytes, algorithm: int, level: int = DEFAULT_LEVEL) -> Optional[bytes]:
+    """Compresse les données, ou retourne None si elles ne rétrécissent pas."""
+    compressor = _compressor(algorithm, level)
+    packed = compressor.compress(data) + compressor.flush()
+    return packed if len(packed) < len(data) else None
+
+
+def worth_compressing(sample: bytes, algorithm: int, level: int = DEFAULT_LEVEL) -> bool:
+    """Indique, d'après un échantillon, si la compression réduit notablement les données."""
+    if not sample:
+        return False
+    compressor = _compressor(algorithm, level)
+    packed = compressor.compress(sample) + compressor.flush()
+    return len(packed) < len(sample) * MIN_RATIO
+
+
+def compress_stream(chunks: Iterable[bytes], algorithm: int, level: int = DEFAULT_LEVEL) -> Iterator[bytes]:
+    """Compresse un flux de données morceau par morceau."""
+    compressor = _compressor(algorithm, level)
+    for chunk in chunks:
+        packed = compressor.compress(chunk)
+        if packed:
+            yield packed
+    yield compressor.flush()
+
+
+def decompress_stream(chunks: Iterable[bytes], algorithm: int) -> Iterator[bytes]:
+    """Décompresse un flux morceau par morceau, sans jamais produire plus de CHUNK_SIZE octets à la fois."""
+    if algorithm == COMPRESS_ZLIB:
+        decompressor = zlib.decompressobj()
+    elif algorithm == COMPRESS_LZMA:
+        decompressor = lzma.LZMADecompressor()
+    else:
+        raise ValueError(f"Compression inconnue: {algorithm}")
+
+    try:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if decompressor.eof:
+                raise ValueError("Données inattendues après la fin du flux compressé")
+            data = chunk
+            while True:
+                out = decompressor.decompress(data, CHUNK_SIZE)
+                if out:
+                    yield out
+                if algorithm == COMPRESS_ZLIB:
+                    data = decompressor.unconsumed_tail
+                    if not data:
+                        break
+                else:
+                    data = b""
+                    if decompressor.eof or decompressor.needs_input:
+                        break
+        if algorithm == COMPRESS_ZLIB:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+            if not decompressor.eof:
+                raise ValueError("Flux compressé tronqué")
+        elif not decompressor.eof:
+            raise ValueError("Flux compressé tronqué")
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"Échec de la décompression: {e}")
@@ -0,0 +1,378 @@
+# DATA-GHOST - Format conteneur avec en-tête versionné
+# L'en-tête précède les données et indique leur taille exacte, ce qui évite de parcourir toute l'image
+
+import struct  # Pour la sérialisation binaire de l'en-tête
+import zlib  # Pour le CRC32 de l'en-tête
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Callable, Iterable, Iterator, Optional, Tuple  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+from PIL import Image  # Pour la manipulation d'images
+
+from .engine import (
+    CHANNELS, ChannelWriter, _check_lsb, base_channels, carrier_image, channel_range, channel_view, channels_needed, embed_bytes,
+    extract_bytes, extract_until_marker, iter_bytes, pixel_view,
+)
+from .jobs import checkpoint
+from .metrics import stage, timed
+from .scatter import KeyedPermutation, ScatterWriter, gather_bytes, scatter_bytes, scatter_domain
+
+# Constantes
+MAGIC = b"DGH"  # Signature de l'en-tête
+VERSION = 1  # Version actuelle du format
+FLAG_ENCRYPTED = 0x0001  # Les données sont chiffrées
+FLAG_COMPRESSED = 0x0002  # Les données sont compressées
+FLAG_SHARD = 0x0004  # Les données sont un fragment d'une charge répartie sur plusieurs images
+FLAG_KDF = 0x0008  # La clé de chiffrement est dérivée (sel et paramètres dans l'en-tête)
+FLAG_AEAD = 0x0010  # Les données sont chiffrées par blocs authentifiés (AES-GCM)
+FLAG_SCATTER = 0x0020  # Les données sont dispersées sur des pixels choisis par la clé
+FLAG_CHANNELS = 0x0040  # Les données utilisent un autre jeu de composantes que celui de l'en-tête
+FLAG_FRAMES = 0x0080  # Les fragments sont répartis sur les images d'un même fichier (PNG animé, TIFF multipage)
+HEADER_MAX_SIZE = 256  # Taille maximale d'un en-tête (lecture anticipée des premières lignes)
+
+_FIXED = struct.Struct(">3sBBHQ")  # Signature, version, profondeur LSB, drapeaux, taille des données
+_CRC = struct.Struct(">I")  # CRC32 de l'en-tête
+
+# Sections optionnelles, sérialisées dans cet ordre après la partie fixe quand leur drapeau est présent
+_SECTIONS = (
+    (FLAG_SHARD, struct.Struct(">8sHH"), ("session", "shard_index", "shard_count")),
+    (FLAG_KDF, struct.Struct(">B16sIBB"), ("kdf_algorithm", "kdf_salt", "kdf_cost", "kdf_r", "kdf_p")),
+    (FLAG_AEAD, struct.Struct(">8sI"), ("nonce", "frame_size")),
+    (FLAG_COMPRESSED, struct.Struct(">B"), ("compression",)),
+    (FLAG_CHANNELS, struct.Struct(">BB"), ("channel_start", "channel_count")),
+)
+
+
+# Classe pour stocker l'en-tête du conteneur
+@dataclass
+class Header:
+    lsb: int  # Profondeur LSB utilisée pour l'insertion
+    length: int  # Taille des données en octets
+    flags: int = 0  # Drapeaux (chiffrement, compression, ...)
+    version: int = VERSION  # Version du format
+    session: bytes = bytes(8)  # Identifiant de la session de fragments
+    shard_index: int = 0  # Rang du fragment
+    shard_count: int = 1  # Nombre total de fragments
+    kdf_algorithm: int = 0  # Fonction de dérivation de la clé
+    kdf_salt: bytes = bytes(16)  # Sel de dérivation
+    kdf_cost: int = 0  # Coût de dérivation (N scrypt ou itérations PBKDF2)
+    kdf_r: int = 0  # Taille de bloc scrypt
+    kdf_p: int = 0  # Parallélisme scrypt
+    nonce: bytes = bytes(8)  # Préfixe des nonces des blocs authentifiés
+    frame_size: int = 0  # Taille en clair d'un bloc authentifié
+    compression: int = 0  # Algorithme de compression (zlib, LZMA)
+    channel_start: int = 0  # Première composante du jeu des données
+    channel_count: int = 0  # Nombre de composantes du jeu des données
+
+    @property
+    def encrypted(self) -> bool:
+        """Indique si les données sont chiffrées."""
+        return bool(self.flags & FLAG_ENCRYPTED)
+
+    @property
+    def compressed(self) -> bool:
+        """Indique si les données sont compressées."""
+        return bool(self.flags & FLAG_COMPRESSED)
+
+    @property
+    def sharded(self) -> bool:
+        """Indique si les données sont un fragment."""
+        return bool(self.flags & FLAG_SHARD)
+
+    @property
+    def multiframe(self) -> bool:
+        """Indique si le fragment est l'une des images d'un fichier qui en contient plusieurs."""
+        return bool(self.flags & FLAG_FRAMES)
+
+    @property
+    def derived_key(self) -> bool:
+        """Indique si la clé de chiffrement est dérivée d'une phrase secrète."""
+        return bool(self.flags & FLAG_KDF)
+
+    @property
+    def framed(self) -> bool:
+        """Indique si les données sont chiffrées par blocs authentifiés."""
+        return bool(self.flags & FLAG_AEAD)
+
+    @property
+    def scattered(self) -> bool:
+        """Indique si les données sont dispersées sur des pixels choisis par la clé."""
+        return bool(self.flags & FLAG_SCATTER)
+
+    @property
+    def channels(self) -> Optional[Tuple[int, int]]:
+        """Jeu de composantes des données (première, nombre), ou None pour celui de l'en-tête."""
+        return (self.channel_start, self.channel_count) if self.flags & FLAG_CHANNELS else None
+
+    @property
+    def size(self) -> int:
+        """Taille de l'en-tête sérialisé en octets."""
+        return self.size_for(self.flags)
+
+    @staticmethod
+    def size_for(flags: int) -> int:
+        """Taille d'un en-tête portant ces drapeaux."""
+        sections = sum(fmt.size for flag, fmt, fields in _SECTIONS if flags & flag)
+        return _FIXED.size + sections + _CRC.size
+
+    def pack(self) -> bytes:
+        """Sérialise l'en-tête (CRC32 compris)."""
+        body = _FIXED.pack(MAGIC, self.version, self.lsb, self.flags, self.length)
+        for flag, fmt, fields in _SECTIONS:
+            if self.flags & flag:
+                body += fmt.pack(*(getattr(self, name) for name in fields))
+        return body + _CRC.pack(zlib.crc32(body))
+
+    @classmethod
+    def peek(cls, data: bytes) -> Optional[int]:
+        """Taille de l'en-tête annoncé par sa partie fixe, ou None si ce n'en est pas un."""
+        if len(data) < _FIXED.size or data[:len(MAGIC)] != MAGIC:
+            return None
+        return cls.size_for(_FIXED.unpack_from(data)[3])
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Optional["Header"]:
+        """Désérialise un en-tête, ou retourne None si les octets n'en contiennent pas."""
+        size = cls.peek(data)
+        if size is None or len(data) < size:
+            return None
+        (crc,) = _CRC.unpack_from(data, size - _CRC.size)
+        if crc != zlib.crc32(data[:size - _CRC.size]):
+            return None
+        magic, version, lsb, flags, length = _FIXED.unpack_from(data)
+        if version > VERSION:
+            raise ValueError(f"Version de conteneur non supportée: {version}")
+        _check_lsb(lsb)  # En-tête d'une image non fiable : une profondeur de 8 bits remplacerait les pixels
+
+        header = cls(lsb=lsb, length=length, flags=flags, version=version)
+        offset = _FIXED.size
+        for flag, fmt, fields in _SECTIONS:
+            if flags & flag:
+                for name, value in zip(fields, fmt.unpack_from(data, offset)):
+                    setattr(header, name, value)
+                offset += fmt.size
+        return header
+
+
+def payload_start(header: Header, lsb: int, base: int = CHANNELS, count: Optional[int] = None) -> int:
+    """Indice de la première composante des données (premier pixel après l'en-tête).
+
+    L'en-tête occupe `base` composantes par pixel ; les données en occupent `count` (par défaut `base`).
+    """
+    pixels = -(-channels_needed(header.size, lsb) // base)
+    return pixels * (count or base)
+
+
+def channel_fields(mode: str, channels: Optional[str] = None) -> Tuple[int, dict]:
+    """Drapeau et champs d'en-tête d'un jeu de composantes (aucun pour le jeu par défaut du mode)."""
+    start, count = channel_range(mode, channels)
+    if (start, count) == base_channels(mode):
+        return 0, {}
+    return FLAG_CHANNELS, {'channel_start': start, 'channel_count': count}
+
+
+def payload_capacity(width: int, height: int, lsb: int, flags: int = 0, mode: str = 'RGB',
+                     channels: Optional[str] = None) -> int:
+    """Nombre d'octets de données que peut recevoir une image, en-tête déduit."""
+    base, count = base_channels(mode)[1], channel_range(mode, channels)[1]
+    flags |= channel_fields(mode, channels)[0]
+    start = payload_start(Header(lsb=lsb, length=0, flags=flags), lsb, base, count)
+    return max(0, (width * height * count - start) * lsb // 8)
+
+
+def _payload_view(view: np.ndarray, header: Header, pixels: Optional[np.ndarray]) -> np.ndarray:
+    """Plan de composantes des données : celui de l'en-tête, ou le jeu qu'il désigne dans `pixels`."""
+    if header.channels is None:
+        return view
+    start, count = header.channels
+    if pixels is None or count == 0 or start + count > pixels.shape[1]:
+        raise ValueError(f"Jeu de composantes des données indisponible: {start}+{count}")
+    return pixels[:, start:start + count]
+
+
+def _permutation(view: np.ndarray, start: int, key: bytes) -> Tuple[KeyedPermutation, int]:
+    """Permutation des pixels qui suivent l'en-tête, et premier de ces pixels."""
+    first, pixels = scatter_domain(view, start)
+    return KeyedPermutation(key, max(pixels, 1)), first
+
+
+def _scatter_permutation(view: np.ndarray, header: Header, start: int,
+                         scatter_key_for: Optional[Callable[[Header], bytes]]) -> Tuple[KeyedPermutation, int]:
+    """Permutation d'un conteneur dispersé (la clé de dispersion dépend de l'en-tête)."""
+    if scatter_key_for is None:
+        raise ValueError("Les données sont dispersées : une clé est requise")
+    return _permutation(view, start, scatter_key_for(header))
+
+
+def write_container(view: np.ndarray, data: bytes, lsb: int, flags: int = 0,
+                    progress: Optional[Callable[[float], None]] = None, scatter_key: Optional[bytes] = None,
+                    payload_view: Optional[np.ndarray] = None, **fields) -> Header:
+    """Insère l'en-tête (complété par `fields`) puis les données dans un plan de composantes.
+
+    Avec `scatter_key`, les données sont dispersées sur des pixels choisis par la clé (l'en-tête reste en tête).
+    Avec `payload_view` (mêmes pixels, autre jeu de composantes), les données y sont écrites après l'en-tête.
+    """
+    if scatter_key is not None:
+        flags |= FLAG_SCATTER
+    payload_view = view if payload_view is None else payload_view
+    header = Header(lsb=lsb, length=len(data), flags=flags, **fields)
+    start = payload_start(header, lsb, view.shape[1], payload_view.shape[1])
+    embed_bytes(view, header.pack(), lsb)
+    if scatter_key is not None:
+        permutation, first = _permutation(payload_view, start, scatter_key)
+        scatter_bytes(payload_view, data, lsb, permutation, first, progress=progress)
+    else:
+        embed_bytes(payload_view, data, lsb, start=start, progress=progress)
+    return header
+
+
+def write_container_stream(view: np.ndarray, chunks: Iterable[bytes], length: Optional[int], lsb: int,
+                           flags: int = 0, progress: Optional[Callable[[float], None]] = None,
+                           scatter_key: Optional[bytes] = None, payload_view: Optional[np.ndarray] = None,
+                           **fields) -> Header:
+    """Insère des données reçues par morceaux, puis l'en-tête.
+
+    La taille de l'en-tête ne dépend que des drapeaux : avec `length=None` (flux compressé),
+    la taille réelle n'est connue qu'à la fin et l'en-tête est écrit en dernier.
+    """
+    if scatter_key is not None:
+        flags |= FLAG_SCATTER
+    payload_view = view if payload_view is None else payload_view
+    header = Header(lsb=lsb, length=length or 0, flags=flags, **fields)
+    start = payload_start(header, lsb, view.shape[1], payload_view.shape[1])
+    available = (payload_view.size - start) * lsb // 8
+    if length is not None and length > available:
+        raise ValueError(f"Capacité insuffisante: {length} octets pour {available} octets disponibles")
+
+    if scatter_key is None:
+        writer = ChannelWriter(payload_view, lsb, start)
+    else:
+        writer = ScatterWriter(payload_view, lsb, scatter_key, start)
+    for chunk in chunks:
+        checkpoint()
+        if writer.written + len(chunk) > (available if length is None else length):
+            if length is not None:
+                raise ValueError("Les données dépassent la taille annoncée")
+            raise ValueError(f"Capacité insuffisante: plus de {available} octets à cacher")
+        writer.write(chunk)
+        if progress and length:
+            progress(writer.written / length)
+    writer.close()
+    if length is not None and writer.written != length:
+        raise ValueError(f"Données incomplètes: {writer.written} octets sur {length}")
+
+    header.length = writer.written
+    embed_bytes(view, header.pack(), lsb)
+    return header
+
+
+def read_header(view: np.ndarray, lsb: int) -> Optional[Header]:
+    """Lit l'en-tête en début d'image, ou retourne None s'il est absent."""
+    available = view.size * lsb // 8
+    if _FIXED.size > available:
+        return None
+    size = Header.peek(bytes(extract_bytes(view, lsb, _FIXED.size)))
+    if size is None or size > available:
+        return None
+    header = Header.unpack(bytes(extract_bytes(view, lsb, size)))
+    if header is None or header.lsb != lsb:
+        return None
+    return header
+
+
+def read_container(view: np.ndarray, lsb: int, progress: Optional[Callable[[float], None]] = None,
+                   scatter_key_for: Optional[Callable[[Header], bytes]] = None,
+                   pixels: Optional[np.ndarray] = None) -> Tuple[Optional[Header], bytearray]:
+    """Extrait les données d'un plan de composantes.
+
+    Avec un en-tête, seules les composantes couvertes par les données sont lues.
+    Sans en-tête (ancien format), les données s'arrêtent au premier octet nul.
+    `scatter_key_for` fournit la clé de dispersion d'après l'en-tête (données dispersées) ;
+    `pixels` (toutes les composantes) est requis si l'en-tête désigne un autre jeu de composantes.
+    """
+    header, chunks = read_container_stream(view, lsb, progress, scatter_key_for, pixels)
+    data = bytearray()
+    for chunk in chunks:
+        data += chunk
+    return header, data
+
+
+def read_container_stream(view: np.ndarray, lsb: int, progress: Optional[Callable[[float], None]] = None,
+                          scatter_key_for: Optional[Callable[[Header], bytes]] = None,
+                          pixels: Optional[np.ndarray] = None) -> Tuple[Optional[Header], Iterator[bytes]]:
+    """Comme `read_container`, mais les données d'un conteneur sont produites tranche par tranche."""
+    header = read_header(view, lsb)
+    if header is None:
+        return None, iter([bytes(extract_until_marker(view, lsb, progress=progress))])
+    payload_view = _payload_view(view, header, pixels)
+    start = payload_start(header, lsb, view.shape[1], payload_view.shape[1])
+    if header.scattered:
+        permutation, first = _scatter_permutation(payload_view, header, start, scatter_key_for)
+        return header, gather_bytes(payload_view, lsb, permutation, first, header.length, progress)
+    return header, iter_bytes(payload_view, lsb, start, header.length, progress)
+
+
+def _views(arr: np.ndarray, mode: str, channels: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Plans de composantes de l'en-tête (jeu par défaut du mode) et des données (jeu demandé)."""
+    return channel_view(arr, *base_channels(mode)), channel_view(arr, *channel_range(mode, channels))
+
+
+def embed_payload(img: Image.Image, data: bytes, lsb: int, flags: int = 0,
+                  progress: Optional[Callable[[float], None]] = None, scatter_key: Optional[bytes] = None,
+                  channels: Optional[str] = None, **fields) -> Image.Image:
+    """Retourne une copie de l'image contenant l'en-tête et les données.
+
+    `channels` choisit les composantes des données (`RGBA`, `A`, `L`, ...) ; il est enregistré dans l'en-tête.
+    """
+    with stage("decode"):
+        img = carrier_image(img)
+        arr = np.array(img)
+    with stage("embed"):
+        view, payload_view = _views(arr, img.mode, channels)
+        extra, channel_info = channel_fields(img.mode, channels)
+        write_container(view, data, lsb, flags | extra, progress, scatter_key, payload_view, **fields, **channel_info)
+        result = Image.fromarray(arr)
+    result.info = img.info.copy()
+    return result
+
+
+def embed_stream(img: Image.Image, chunks: Iterable[bytes], length: Optional[int], lsb: int, flags: int = 0,
+                 progress: Optional[Callable[[float], None]] = None, scatter_key: Optional[bytes] = None,
+                 channels: Optional[str] = None, **fields) -> Image.Image:
+    """Comme `embed_payload`, pour des données reçues par morceaux (fichier lu au fil de l'eau)."""
+    with stage("decode"):
+        img = carrier_image(img)
+        arr = np.array(img)
+    with stage("embed"):
+        view, payload_view = _views(arr, img.mode, channels)
+        extra, channel_info = channel_fields(img.mode, channels)
+        write_container_stream(view, chunks, length, lsb, flags | extra, progress, scatter_key, payload_view,
+                               **fields, **channel_info)
+        result = Image.fromarray(arr)
+    result.info = img.info.copy()
+    return result
+
+
+def extract_payload(img: Image.Image, lsb: int, progress: Optional[Callable[[float], None]] = None,
+                    scatter_key_for: Optional[Callable[[Header], bytes]] = None
+                    ) -> Tuple[Optional[Header], bytearray]:
+    """Extrait l'en-tête (s'il existe) et les données cachées dans une image."""
+    with stage("decode"):
+        img = carrier_image(img)
+        arr = np.asarray(img)
+    with stage("extract"):
+        return read_container(channel_view(arr, *base_channels(img.mode)), lsb, progress, scatter_key_for,
+                              pixel_view(arr))
+
+
+def extract_payload_stream(img: Image.Image, lsb: int, progress: Optional[Callable[[float], None]] = None,
+                           scatter_key_for: Optional[Callable[[Header], bytes]] = None
+                           ) -> Tuple[Optional[Header], Iterator[bytes]]:
+    """Extrait l'en-tête (s'il existe) et un itérateur sur les données cachées."""
+    with stage("decode"):
+        img = carrier_image(img)
+        arr = np.asarray(img)
+    with stage("extract"):
+        header, chunks = read_container_stream(channel_view(arr, *base_channels(img.mode)), lsb, progress,
+                                               scatter_key_for, pixel_view(arr))
+    return header, timed(chunks, "extract")
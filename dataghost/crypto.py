@@ -0,0 +1,262 @@
+# DATA-GHOST - Chiffrement AES-256 des données cachées
+
+import hashlib  # Pour la dérivation de clé (scrypt, PBKDF2)
+import os  # Pour la génération du vecteur d'initialisation et du sel
+import struct  # Pour le compteur de blocs des nonces
+import threading  # Pour protéger le cache partagé entre threads
+import time  # Pour l'expiration des clés en cache
+from collections import OrderedDict  # Pour l'ordre d'utilisation du cache LRU
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Iterable, Iterator, Optional  # Pour le typage
+
+from Crypto.Cipher import AES  # Pour le chiffrement AES
+from Crypto.Util.Padding import pad, unpad  # Pour le padding des données
+
+from .metrics import stage
+
+# Constantes
+BLOCK_SIZE = AES.block_size  # Taille de bloc pour AES (16 octets)
+KEY_LENGTH = 32  # Taille de la clé AES-256 en octets
+SALT_SIZE = 16  # Taille du sel de dérivation
+KDF_SCRYPT = 1  # Dérivation scrypt (coûteuse en mémoire)
+KDF_PBKDF2 = 2  # Dérivation PBKDF2-HMAC-SHA256 (si scrypt est indisponible)
+SCRYPT_N = 1 << 15  # Coût scrypt par défaut (32 Mo de mémoire avec r=8)
+PBKDF2_ITERATIONS = 600_000  # Nombre d'itérations PBKDF2 par défaut
+MAX_SCRYPT_N = 1 << 20  # Bornes acceptées à la lecture d'un en-tête
+MAX_PBKDF2_ITERATIONS = 10_000_000
+MAX_R, MAX_P = 32, 16
+MAX_SCRYPT_MEMORY = 256 << 20  # Mémoire scrypt maximale (128·N·r octets)
+MAX_SCRYPT_WORK = 1 << 20  # Coût scrypt maximal (p·N)
+FRAME_SIZE = 64 << 10  # Taille en clair d'un bloc authentifié (AES-GCM)
+MAX_FRAME_SIZE = 16 << 20  # Taille de bloc maximale acceptée à la lecture d'un en-tête
+TAG_SIZE = 16  # Taille de l'étiquette d'authentification de chaque bloc
+NONCE_SIZE = 8  # Préfixe aléatoire des nonces (complété par le numéro du bloc)
+CACHE_SIZE_ENV = "DATAGHOST_KDF_CACHE"  # Nombre de clés dérivées gardées en mémoire
+CACHE_TTL_ENV = "DATAGHOST_KDF_TTL"  # Durée de vie d'une clé dérivée en cache (secondes)
+
+
+# Classe pour stocker les paramètres de dérivation d'une clé (enregistrés dans l'en-tête)
+@dataclass(frozen=True)
+class KdfParams:
+    algorithm: int = KDF_SCRYPT  # Fonction de dérivation
+    salt: bytes = bytes(SALT_SIZE)  # Sel aléatoire
+    cost: int = SCRYPT_N  # N pour scrypt, nombre d'itérations pour PBKDF2
+    r: int = 8  # Taille de bloc scrypt
+    p: int = 1  # Parallélisme scrypt
+
+    @classmethod
+    def new(cls, algorithm: Optional[int] = None) -> "KdfParams":
+        """Paramètres par défaut avec un nouveau sel aléatoire."""
+        if algorithm is None:
+            algorithm = KDF_SCRYPT if hasattr(hashlib, 'scrypt') else KDF_PBKDF2
+        cost = SCRYPT_N if algorithm == KDF_SCRYPT else PBKDF2_ITERATIONS
+        return cls(algorithm, os.urandom(SALT_SIZE), cost)
+
+    @classmethod
+    def from_header(cls, header) -> "KdfParams":
+        """Paramètres enregistrés dans la section de dérivation d'un en-tête (refusés s'ils sont démesurés)."""
+        params = cls(header.kdf_algorithm, header.kdf_salt, header.kdf_cost, header.kdf_r, header.kdf_p)
+        params.check()
+        return params
+
+    def header_fields(self) -> dict:
+        """Champs de la section de dérivation de l'en-tête."""
+        return {'kdf_algorithm': self.algorithm, 'kdf_salt': self.salt, 'kdf_cost': self.cost,
+                'kdf_r': self.r, 'kdf_p': self.p}
+
+    def check(self):
+        """Refuse des paramètres inconnus ou démesurés (en-tête forgé ou corrompu).
+
+        Les mêmes bornes s'appliquent à l'écriture : une image ne peut exiger plus de MAX_SCRYPT_MEMORY
+        de mémoire ni plus de MAX_SCRYPT_WORK de calcul pour être lue.
+        """
+        if len(self.salt) != SALT_SIZE:
+            raise ValueError("Sel de dérivation invalide")
+        if self.algorithm == KDF_SCRYPT:
+            valid = 2 <= self.cost <= MAX_SCRYPT_N and not self.cost & (self.cost - 1)
+            valid = valid and 1 <= self.r <= MAX_R and 1 <= self.p <= MAX_P
+            valid = valid and 128 * self.cost * self.r <= MAX_SCRYPT_MEMORY and self.p * self.cost <= MAX_SCRYPT_WORK
+        elif self.algorithm == KDF_PBKDF2:
+            valid = 1 <= self.cost <= MAX_PBKDF2_ITERATIONS
+        else:
+            raise ValueError(f"Fonction de dérivation inconnue: {self.algorithm}")
+        if not valid:
+            raise ValueError("Paramètres de dérivation hors limites")
+
+
+class KeyCache:
+    """Cache LRU des clés dérivées, avec durée de vie, indexé par (empreinte de la phrase, paramètres)."""
+
+    def __init__(self, maxsize: int = 64, ttl: Optional[float] = 600.0):
+        self.maxsize = maxsize  # Nombre maximal d'entrées (0: cache désactivé)
+        self.ttl = ttl  # Durée de vie en secondes (None: illimitée)
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # Clé -> (clé dérivée, instant d'insertion)
+        self._lock = threading.Lock()
+
+    def get(self, passphrase: str, params: KdfParams) -> bytes:
+        """Retourne la clé dérivée, en ne payant la dérivation qu'une fois par sel."""
+        # Seule une empreinte de la phrase secrète sert d'index
+        index = (hashlib.sha256(passphrase.encode('utf-8')).digest(), params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(index)
+            if entry is not None and (self.ttl is None or now - entry[1] < self.ttl):
+                self._entries.move_to_end(index)
+                self.hits += 1
+                return entry[0]
+            self._entries.pop(index, None)
+            self.misses += 1
+
+        # La dérivation a lieu hors du verrou pour ne pas bloquer les autres threads
+        with stage("kdf"):
+            key = _derive(passphrase, params)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[index] = (key, now)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return key
+
+    def configure(self, maxsize: Optional[int] = None, ttl: Optional[float] = None):
+        """Modifie la taille et/ou la durée de vie (une durée nulle ou négative la rend illimitée)."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not None:
+                self.ttl = ttl if ttl > 0 else None
+            while len(self._entries) > max(0, self.maxsize):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+def _derive(passphrase: str, params: KdfParams) -> bytes:
+    """Dérive une clé AES-256 de la phrase secrète."""
+    params.check()
+    secret = passphrase.encode('utf-8')
+    if params.algorithm == KDF_SCRYPT:
+        memory = 128 * params.r * (params.cost + params.p + 2)
+        return hashlib.scrypt(secret, salt=params.salt, n=params.cost, r=params.r, p=params.p,
+                              maxmem=memory + (1 << 20), dklen=KEY_LENGTH)
+    return hashlib.pbkdf2_hmac('sha256', secret, params.salt, params.cost, dklen=KEY_LENGTH)
+
+
+# Cache partagé par le processus ; les processus d'un pool héritent de sa configuration par l'environnement
+key_cache = KeyCache(
+    int(os.environ.get(CACHE_SIZE_ENV, 64)), float(os.environ.get(CACHE_TTL_ENV, 600)) or None
+)
+
+
+def derive_key(passphrase: str, params: KdfParams) -> bytes:
+    """Dérive (ou retrouve dans le cache) la clé AES-256 d'une phrase secrète."""
+    return key_cache.get(passphrase, params)
+
+
+def cipher_key(key: str, kdf: Optional[KdfParams] = None) -> bytes:
+    """Clé AES : dérivée si des paramètres sont fournis, sinon ancien format (complété ou tronqué)."""
+    if kdf is not None:
+        return derive_key(key, kdf)
+    return key.encode('utf-8').ljust(KEY_LENGTH, b'\0')[:KEY_LENGTH]
+
+
+def encrypt_data(key: str, data: bytes, kdf: Optional[KdfParams] = None) -> bytes:
+    """Chiffre les données avec AES-256 en mode CBC.
+
+    Avec `kdf`, la clé est dérivée de la phrase secrète ; sinon elle est complétée ou tronquée à 32 octets.
+    """
+    key = cipher_key(key, kdf)
+
+    # Génère un vecteur d'initialisation et chiffre les données
+    iv = os.urandom(16)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    encrypted = cipher.encrypt(pad(data, BLOCK_SIZE))
+    return iv + encrypted  # Retourne IV + données chiffrées
+
+
+def decrypt_data(key: str, data: bytes, strict: bool = False, kdf: Optional[KdfParams] = None) -> bytes:
+    """Déchiffre les données avec AES-256 en mode CBC.
+
+    Avec `strict`, un padding invalide (mauvaise clé) lève une ValueError au lieu de retourner les données brutes.
+    """
+    if len(data) < 16:
+        raise ValueError("Données chiffrées trop courtes")
+
+    key = cipher_key(key, kdf)
+
+    # Extrait le vecteur d'initialisation et déchiffre
+    iv = data[:16]
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    try:
+        decrypted = unpad(cipher.decrypt(data[16:]), BLOCK_SIZE)
+        return decrypted
+    except ValueError as e:
+        if strict:
+            raise ValueError(f"Échec du déchiffrement: {str(e)}")
+        # Si le dépadding échoue, retourne les données brutes
+        return cipher.decrypt(data[16:])
+    except Exception as e:
+        raise ValueError(f"Échec du déchiffrement: {str(e)}")
+
+
+def sealed_size(size: int, frame_size: int = FRAME_SIZE) -> int:
+    """Taille chiffrée de `size` octets découpés en blocs authentifiés.
+
+    Le dernier bloc est toujours incomplet (éventuellement vide) : il marque la fin du flux.
+    """
+    return size + (size // frame_size + 1) * TAG_SIZE
+
+
+def _frame_cipher(key: bytes, nonce: bytes, index: int, final: bool):
+    """Chiffreur AES-GCM d'un bloc ; le rang et la position finale sont authentifiés."""
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce + struct.pack(">I", index))
+    cipher.update(b"\x01" if final else b"\x00")
+    return cipher
+
+
+def encrypt_stream(key: bytes, nonce: bytes, chunks: Iterable[bytes], frame_size: int = FRAME_SIZE) -> Iterator[bytes]:
+    """Redécoupe un flux en blocs et produit chaque bloc chiffré suivi de son étiquette."""
+    buffer, index = bytearray(), 0
+    for chunk in chunks:
+        buffer += chunk
+        # Un bloc complet n'est jamais le dernier
+        while len(buffer) >= frame_size:
+            sealed, tag = _frame_cipher(key, nonce, index, False).encrypt_and_digest(bytes(buffer[:frame_size]))
+            yield sealed + tag
+            del buffer[:frame_size]
+            index += 1
+    sealed, tag = _frame_cipher(key, nonce, index, True).encrypt_and_digest(bytes(buffer))
+    yield sealed + tag
+
+
+def decrypt_stream(key: bytes, nonce: bytes, chunks: Iterable[bytes],
+                   frame_size: int = FRAME_SIZE) -> Iterator[bytes]:
+    """Déchiffre un flux de blocs authentifiés reçu par morceaux quelconques.
+
+    Chaque bloc est vérifié dès qu'il est complet : une altération lève une ValueError sur ce bloc.
+    """
+    if not 0 < frame_size <= MAX_FRAME_SIZE:
+        raise ValueError(f"Taille de bloc invalide: {frame_size}")
+
+    sealed = frame_size + TAG_SIZE
+    buffer, index = bytearray(), 0
+
+    def frame(data: bytes, final: bool) -> bytes:
+        try:
+            return _frame_cipher(key, nonce, index, final).decrypt_and_verify(data[:-TAG_SIZE], data[-TAG_SIZE:])
+        except ValueError:
+            raise ValueError(f"Échec de l'authentification du bloc {index} (clé incorrecte ou données altérées)")
+
+    for chunk in chunks:
+        buffer += chunk
+        # Un bloc complet n'est jamais le dernier : il peut être vérifié immédiatement
+        while len(buffer) >= sealed:
+            yield frame(bytes(buffer[:sealed]), False)
+            del buffer[:sealed]
+            index += 1
+    if len(buffer) < TAG_SIZE:
+        raise ValueError("Flux chiffré tronqué")
+    yield frame(bytes(buffer), True)
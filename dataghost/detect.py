@@ -0,0 +1,98 @@
+# DATA-GHOST - Détection automatique de la profondeur LSB
+# Une seule lecture des premiers pixels suffit pour évaluer toutes les profondeurs
+
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Iterable, List, Optional  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+
+from . import MAX_LSB
+from .container import HEADER_MAX_SIZE, Header, read_header
+from .crypto import decrypt_data
+from .engine import channels_needed, extract_until_marker
+from .stream import StripReader
+
+# Constantes
+PROBE_SIZE = max(HEADER_MAX_SIZE, 512)  # Octets lus à la profondeur minimale
+TEXT_SHARPNESS = 8  # Exposant de la proportion de caractères imprimables (un octet aléatoire sur deux: 0,4 %)
+MIN_SCORE = 0.25  # Score minimal de la profondeur retenue (texte imprimable à plus de 91 %)
+
+
+# Classe pour stocker un candidat de profondeur LSB
+@dataclass
+class Candidate:
+    lsb: int  # Profondeur LSB testée
+    score: float  # Vraisemblance (0 à 1)
+    header: Optional[Header] = None  # En-tête trouvé à cette profondeur
+    reason: str = ""  # Motif du score
+    size: int = 0  # Octets lus jusqu'au marqueur de fin (ancien format)
+
+
+def text_score(data: bytes) -> float:
+    """Vraisemblance d'un texte terminé par l'octet nul : 1 s'il est entièrement imprimable, même très court.
+
+    Chaque caractère non imprimable fait chuter le score : à une mauvaise profondeur, les octets lus
+    jusqu'au premier octet nul sont aléatoires et à peine plus d'un tiers d'entre eux sont imprimables.
+    """
+    if not data:
+        return 0.0
+    text = data.decode('utf-8', errors='replace')
+    printable = sum(c != "\ufffd" and (c.isprintable() or c in "\r\n\t") for c in text)
+    return (printable / len(text)) ** TEXT_SHARPNESS
+
+
+def _wide_chars(data: bytes) -> int:
+    """Nombre de caractères multioctets valides (des octets aléatoires n'en forment presque jamais)."""
+    text = data.decode('utf-8', errors='replace')
+    return sum(c != "\ufffd" and ord(c) > 0x7F and c.isprintable() for c in text)
+
+
+def score_candidates(view: np.ndarray, key: Optional[str] = None,
+                     depths: Iterable[int] = range(1, MAX_LSB + 1)) -> List[Candidate]:
+    """Évalue chaque profondeur LSB sur le même plan de composantes, du plus au moins probable."""
+    candidates, wide = [], {}
+    for lsb in depths:
+        header = read_header(view, lsb)
+        if header is not None:
+            candidates.append(Candidate(lsb, 1.0, header, "en-tête valide"))
+            continue
+
+        # Ancien format : le message se termine au premier octet nul
+        data = bytes(extract_until_marker(view, lsb))
+        complete = len(data) < view.size * lsb // 8
+        if key and complete and len(data) >= 32:
+            try:
+                decrypt_data(key, data, strict=True)
+                candidates.append(Candidate(lsb, 0.9, reason="déchiffrement valide", size=len(data)))
+                continue
+            except ValueError:
+                pass
+        candidates.append(Candidate(lsb, 0.5 * text_score(data), reason="texte plausible", size=len(data)))
+        wide[lsb] = _wide_chars(data)
+
+    # Meilleur score d'abord, puis (textes courts ex aequo) le plus de caractères multioctets, puis la profondeur
+    # la plus faible : lus à une profondeur plus faible que la vraie, les bits de « é » donnent par exemple « 9 »
+    return sorted(candidates, key=lambda c: (-c.score, -wide.get(c.lsb, 0), c.lsb))
+
+
+def probe(path: str, rows: Optional[int] = None) -> np.ndarray:
+    """Lit (une seule fois) les premiers pixels nécessaires à l'évaluation de toutes les profondeurs."""
+    with StripReader(path) as reader:
+        if rows is None:
+            rows = reader.row_of(channels_needed(PROBE_SIZE, 1)) + 1
+        return reader.channels(0, min(rows, reader.height))
+
+
+def detect_lsb(path: str, key: Optional[str] = None) -> List[Candidate]:
+    """Classe les profondeurs LSB possibles pour une image à partir de ses premiers pixels."""
+    return score_candidates(probe(path), key)
+
+
+def best_lsb(path: str, key: Optional[str] = None) -> int:
+    """Profondeur LSB la plus probable ; refuse une image où aucune profondeur n'est plausible."""
+    best = detect_lsb(path, key)[0]
+    if best.score < MIN_SCORE:
+        raise ValueError(
+            "Profondeur LSB introuvable : ni en-tête, ni texte plausible (précisez la profondeur, ou la clé)"
+        )
+    return best.lsb
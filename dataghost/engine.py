@@ -0,0 +1,374 @@
+# DATA-GHOST - Moteur d'insertion et d'extraction LSB vectorisé
+# Travaille directement sur les tableaux NumPy de l'image, sans boucle par pixel
+
+import math  # Pour le calcul des blocs alignés
+from typing import Callable, Iterable, Iterator, Optional, Tuple  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+from PIL import Image  # Pour la manipulation d'images
+
+from . import MAX_LSB
+from .jobs import checkpoint
+
+# Constantes
+CHUNK_SIZE = 1 << 20  # Taille des tranches de données traitées en une fois (octets)
+CHANNELS = 3  # Nombre de composantes utilisées par pixel (R, G, B)
+NATIVE_MODES = ('RGB', 'RGBA', 'L', 'LA')  # Modes exploités sans conversion (les autres sont convertis en RGB)
+
+
+def _check_lsb(lsb: int):
+    """Vérifie que la profondeur LSB est exploitable."""
+    if not 1 <= lsb <= MAX_LSB:
+        raise ValueError(f"Profondeur LSB invalide: {lsb} (1 à {MAX_LSB})")
+
+
+def _unit(lsb: int):
+    """Retourne (octets par bloc aligné, groupes de bits par bloc) pour une profondeur LSB."""
+    unit = lsb // math.gcd(8, lsb)
+    return unit, unit * 8 // lsb
+
+
+def _unit_dtype(unit: int):
+    """Choisit le plus petit type entier capable de contenir un bloc aligné."""
+    if unit == 1:
+        return np.uint8
+    return np.uint32 if unit <= 4 else np.uint64
+
+
+def capacity(width: int, height: int, lsb: int, channels: int = CHANNELS) -> int:
+    """Calcule la capacité de stockage en octets d'une image."""
+    return (width * height * channels * lsb) // 8
+
+
+def channels_needed(size: int, lsb: int) -> int:
+    """Nombre de composantes modifiées pour écrire `size` octets."""
+    return -(-size * 8 // lsb)
+
+
+def bytes_to_groups(data: bytes, lsb: int) -> np.ndarray:
+    """Découpe les octets en groupes de `lsb` bits (poids fort en premier)."""
+    _check_lsb(lsb)
+    unit, per_unit = _unit(lsb)
+    count = channels_needed(len(data), lsb)
+    raw = np.frombuffer(data, dtype=np.uint8)
+
+    # Complète avec des zéros jusqu'à un bloc entier (comme le ljust de l'ancienne boucle)
+    if len(raw) % unit:
+        raw = np.concatenate([raw, np.zeros(unit - len(raw) % unit, dtype=np.uint8)])
+
+    # Regroupe les octets de chaque bloc en un entier, puis découpe en groupes de bits
+    dtype = _unit_dtype(unit)
+    blocks = raw.reshape(-1, unit).astype(dtype)
+    if unit > 1:
+        byte_shifts = np.arange(8 * (unit - 1), -1, -8, dtype=dtype)
+        blocks = np.bitwise_or.reduce(blocks << byte_shifts, axis=1, keepdims=True)
+    shifts = np.arange(lsb * (per_unit - 1), -1, -lsb, dtype=dtype)
+    groups = ((blocks >> shifts) & dtype((1 << lsb) - 1)).astype(np.uint8)
+    return groups.reshape(-1)[:count]
+
+
+def stream_groups(data: bytes, lsb: int, first: int, last: int) -> np.ndarray:
+    """Retourne les groupes de bits d'indices [first, last) du flux formé par les octets."""
+    unit, per_unit = _unit(lsb)
+    block = first // per_unit
+    groups = bytes_to_groups(data[block * unit:-(-last // per_unit) * unit], lsb)
+    return groups[first - block * per_unit:last - block * per_unit]
+
+
+def groups_to_bytes(groups: np.ndarray, lsb: int) -> bytes:
+    """Reconstitue les octets à partir de groupes de `lsb` bits (poids fort en premier)."""
+    _check_lsb(lsb)
+    unit, per_unit = _unit(lsb)
+    count = len(groups) * lsb // 8
+
+    # Complète avec des groupes nuls jusqu'à un bloc entier
+    if len(groups) % per_unit:
+        groups = np.concatenate([groups, np.zeros(per_unit - len(groups) % per_unit, dtype=np.uint8)])
+
+    # Assemble les groupes de chaque bloc en un entier, puis le redécoupe en octets
+    dtype = _unit_dtype(unit)
+    shifts = np.arange(lsb * (per_unit - 1), -1, -lsb, dtype=dtype)
+    blocks = np.bitwise_or.reduce(groups.reshape(-1, per_unit).astype(dtype) << shifts, axis=1)
+    if unit > 1:
+        byte_shifts = np.arange(8 * (unit - 1), -1, -8, dtype=dtype)
+        blocks = (blocks[:, None] >> byte_shifts) & dtype(0xFF)
+    return blocks.astype(np.uint8).reshape(-1)[:count].tobytes()
+
+
+def load_groups(view: np.ndarray, start: int, count: int, lsb: int) -> np.ndarray:
+    """Lit les `lsb` bits de poids faible de `count` composantes à partir de `start`."""
+    mask = np.uint8((1 << lsb) - 1)
+    if view.flags.c_contiguous:
+        return view.reshape(-1)[start:start + count] & mask
+
+    # Cas RGBA : ne copie que les pixels concernés
+    width = view.shape[1]
+    first, last = start // width, -(-(start + count) // width)
+    block = view[first:last].reshape(-1)
+    offset = start - first * width
+    return block[offset:offset + count] & mask
+
+
+def store_groups(view: np.ndarray, start: int, values: np.ndarray, lsb: int):
+    """Remplace les `lsb` bits de poids faible des composantes à partir de `start`."""
+    keep = np.uint8(0xFF ^ ((1 << lsb) - 1))
+    end = start + len(values)
+
+    if view.flags.c_contiguous:
+        # Cas RGB : le plan de composantes est directement adressable
+        flat = view.reshape(-1)
+        flat[start:end] &= keep
+        flat[start:end] |= values
+        return
+
+    # Cas RGBA : copie uniquement les pixels concernés puis les réécrit
+    width = view.shape[1]
+    first, last = start // width, -(-end // width)
+    block = view[first:last].reshape(-1)
+    offset = start - first * width
+    block[offset:offset + len(values)] &= keep
+    block[offset:offset + len(values)] |= values
+    view[first:last] = block.reshape(-1, width)
+
+
+def embed_bytes(view: np.ndarray, data: bytes, lsb: int, start: int = 0,
+                progress: Optional[Callable[[float], None]] = None) -> int:
+    """Insère les octets dans un plan de composantes (pixels x canaux), à partir de la composante `start`.
+
+    Retourne l'indice de la composante qui suit la dernière composante modifiée.
+    """
+    _check_lsb(lsb)
+    needed = channels_needed(len(data), lsb)
+    if start + needed > view.size:
+        raise ValueError(
+            f"Capacité insuffisante: {len(data)} octets pour "
+            f"{(view.size - start) * lsb // 8} octets disponibles"
+        )
+
+    # Traite les données par tranches alignées sur les blocs pour borner la mémoire
+    unit, per_unit = _unit(lsb)
+    step = CHUNK_SIZE - CHUNK_SIZE % unit
+    position = start
+    for offset in range(0, len(data), step):
+        checkpoint()
+        groups = bytes_to_groups(data[offset:offset + step], lsb)
+        store_groups(view, position, groups, lsb)
+        position += len(groups)
+        if progress:
+            progress(min((offset + step) / len(data), 1.0))
+    return position
+
+
+class ChannelWriter:
+    """Insère un flux d'octets reçu par morceaux, sans jamais couper un groupe de bits entre deux écritures."""
+
+    def __init__(self, view: np.ndarray, lsb: int, start: int = 0):
+        _check_lsb(lsb)
+        self.view = view
+        self.lsb = lsb
+        self.position = start  # Composante qui recevra le prochain groupe
+        self.written = 0  # Octets reçus
+        self._unit = _unit(lsb)[0]
+        self._carry = b""  # Octets en attente d'un bloc complet
+
+    def write(self, data: bytes):
+        """Insère les blocs complets et garde le reste pour l'écriture suivante."""
+        self.written += len(data)
+        data = self._carry + bytes(data)
+        aligned = len(data) - len(data) % self._unit
+        self._carry = data[aligned:]
+        if aligned:
+            self.position = embed_bytes(self.view, data[:aligned], self.lsb, self.position)
+
+    def close(self) -> int:
+        """Insère les derniers octets ; retourne l'indice de la composante qui suit la dernière modifiée."""
+        if self._carry:
+            self.position = embed_bytes(self.view, self._carry, self.lsb, self.position)
+            self._carry = b""
+        return self.position
+
+
+class ChunkReader:
+    """Redécoupe un flux d'octets reçu par morceaux en tranches de tailles choisies, lues à la demande."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""  # Octets reçus mais pas encore fournis
+        self.read = 0  # Octets fournis
+
+    def take(self, size: int) -> bytes:
+        """Retourne les `size` octets suivants (moins à la fin du flux)."""
+        parts, available = [self._pending], len(self._pending)
+        while available < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            available += len(chunk)
+        data = b"".join(parts)
+        self._pending = data[size:]
+        self.read += min(size, len(data))
+        return data[:size]
+
+    def exhausted(self) -> bool:
+        """Vrai si le flux ne contient plus aucun octet."""
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return True
+            self._pending = bytes(chunk)
+        return False
+
+
+class GroupReader:
+    """Fournit à la demande les groupes de `lsb` bits d'un flux d'octets reçu par morceaux."""
+
+    def __init__(self, chunks: Iterable[bytes], lsb: int):
+        _check_lsb(lsb)
+        self.source = ChunkReader(chunks)
+        self.lsb = lsb
+        self._unit = _unit(lsb)[0]  # Tranches alignées sur les blocs : aucun groupe n'est coupé
+        self._step = CHUNK_SIZE - CHUNK_SIZE % self._unit
+        self._groups = np.empty(0, dtype=np.uint8)  # Groupes convertis mais pas encore fournis
+
+    def take(self, count: int) -> np.ndarray:
+        """Retourne les `count` groupes suivants (moins à la fin du flux)."""
+        while len(self._groups) < count:
+            # Lit juste assez d'octets (par tranches bornées) pour compléter les groupes demandés
+            missing = -(-(count - len(self._groups)) * self.lsb // 8)
+            data = self.source.take(min(self._step, missing + -missing % self._unit))
+            if not data:
+                break
+            self._groups = np.concatenate([self._groups, bytes_to_groups(data, self.lsb)])
+        groups, self._groups = self._groups[:count], self._groups[count:]
+        return groups
+
+    @property
+    def read(self) -> int:
+        """Octets lus dans le flux."""
+        return self.source.read
+
+    def exhausted(self) -> bool:
+        """Vrai si tous les octets du flux ont été fournis."""
+        return not len(self._groups) and self.source.exhausted()
+
+
+def carrier_mode(mode: str) -> str:
+    """Mode dans lequel une image de ce mode est exploitée."""
+    return mode if mode in NATIVE_MODES else 'RGB'
+
+
+def carrier_image(img: Image.Image) -> Image.Image:
+    """Convertit l'image porteuse en RGB seulement si son mode n'est pas exploitable tel quel."""
+    return img if img.mode in NATIVE_MODES else img.convert('RGB')
+
+
+def base_channels(mode: str) -> Tuple[int, int]:
+    """Jeu de composantes par défaut d'un mode (R, G, B ou niveau de gris) : (première, nombre).
+
+    L'en-tête y est toujours écrit, ce qui permet de le lire avant de connaître le jeu des données.
+    """
+    return (0, 1) if carrier_mode(mode).startswith('L') else (0, CHANNELS)
+
+
+def channel_range(mode: str, channels: Optional[str] = None) -> Tuple[int, int]:
+    """(Première composante, nombre de composantes) d'un jeu nommé par ses lettres (`RGBA`, `A`, `L`, ...).
+
+    Les composantes doivent être contiguës dans le mode de l'image ; sans jeu, retourne le jeu par défaut.
+    """
+    mode = carrier_mode(mode)
+    if not channels:
+        return base_channels(mode)
+    start = mode.find(channels.upper())
+    if start < 0:
+        raise ValueError(f"Jeu de composantes invalide pour une image {mode}: {channels}")
+    return start, len(channels)
+
+
+def channel_name(mode: str, channels: Optional[str] = None) -> str:
+    """Nom du jeu de composantes effectivement utilisé (`RGB` par défaut, `L` en niveaux de gris)."""
+    start, count = channel_range(mode, channels)
+    return carrier_mode(mode)[start:start + count]
+
+
+def pixel_view(arr: np.ndarray) -> np.ndarray:
+    """Retourne la vue (pixels x composantes) de toutes les composantes d'un tableau d'image."""
+    return arr.reshape(-1, arr.shape[-1] if arr.ndim == 3 else 1)
+
+
+def channel_view(arr: np.ndarray, start: int = 0, count: int = CHANNELS) -> np.ndarray:
+    """Retourne la vue (pixels x canaux) des composantes [start, start + count) d'un tableau d'image."""
+    return pixel_view(arr)[:, start:start + count]
+
+
+def embed_image(img: Image.Image, data: bytes, lsb: int,
+                progress: Optional[Callable[[float], None]] = None) -> Image.Image:
+    """Retourne une copie de l'image contenant les données dans ses bits LSB."""
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+
+    arr = np.array(img)
+    end = embed_bytes(channel_view(arr), data, lsb, progress=progress)
+
+    # L'ancienne boucle réécrivait les pixels en (r, g, b), ce qui force l'alpha à 255
+    if img.mode == 'RGBA':
+        arr.reshape(-1, 4)[:-(-end // CHANNELS), 3] = 255
+
+    result = Image.fromarray(arr)
+    result.info = img.info.copy()
+    return result
+
+
+def iter_bytes(view: np.ndarray, lsb: int, start: int = 0, size: Optional[int] = None,
+               progress: Optional[Callable[[float], None]] = None) -> Iterator[bytes]:
+    """Extrait les octets cachés tranche par tranche, à partir de la composante `start`.
+
+    Sans `size`, lit jusqu'à la fin du plan de composantes.
+    """
+    _check_lsb(lsb)
+    available = (view.size - start) * lsb // 8
+    if size is None:
+        size = available
+    elif size > available:
+        raise ValueError(f"Lecture impossible: {size} octets demandés, {available} disponibles")
+
+    # Chaque tranche commence sur une frontière de bloc pour ne jamais couper un groupe
+    unit, per_unit = _unit(lsb)
+    step = CHUNK_SIZE - CHUNK_SIZE % unit
+    for offset in range(0, size, step):
+        checkpoint()
+        count = min(step, size - offset)
+        groups = load_groups(view, start + offset * 8 // lsb, channels_needed(count, lsb), lsb)
+        yield groups_to_bytes(groups, lsb)[:count]
+        if progress:
+            progress(min((offset + step) / size, 1.0))
+
+
+def extract_bytes(view: np.ndarray, lsb: int, size: int, start: int = 0,
+                  progress: Optional[Callable[[float], None]] = None) -> bytearray:
+    """Extrait exactement `size` octets cachés à partir de la composante `start`."""
+    data = bytearray()
+    for chunk in iter_bytes(view, lsb, start, size, progress):
+        data += chunk
+    return data
+
+
+def extract_until_marker(view: np.ndarray, lsb: int, start: int = 0,
+                         progress: Optional[Callable[[float], None]] = None) -> bytearray:
+    """Extrait les octets cachés jusqu'au premier octet nul (marqueur de fin)."""
+    data = bytearray()
+    for chunk in iter_bytes(view, lsb, start, progress=progress):
+        end = chunk.find(0)
+        if end >= 0:
+            data += chunk[:end]
+            break
+        data += chunk
+    return data
+
+
+def extract_image(img: Image.Image, lsb: int,
+                  progress: Optional[Callable[[float], None]] = None) -> bytearray:
+    """Extrait le message terminé par un octet nul caché dans une image."""
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGB')
+    return extract_until_marker(channel_view(np.asarray(img)), lsb, progress=progress)
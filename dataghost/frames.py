@@ -0,0 +1,308 @@
+# DATA-GHOST - Porteuses à plusieurs images : PNG animé, TIFF multipage, GIF animé
+# La charge est répartie sur toutes les images du fichier, dans leur ordre ; chacune reçoit un fragment indexé
+
+import os  # Pour l'identifiant de session et le nombre de cœurs
+from collections import deque  # Pour les tâches en cours dans le pool
+from concurrent.futures import ProcessPoolExecutor  # Pour le pool de processus
+from itertools import islice  # Pour les premières tâches confiées au pool
+from dataclasses import dataclass, field, replace  # Pour créer des classes de données
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union  # Pour le typage
+
+from PIL import Image, PngImagePlugin  # Pour le décodage et l'enregistrement des images
+
+from .container import FLAG_FRAMES, FLAG_SHARD, Header, embed_payload, extract_payload, payload_capacity
+from .engine import ChunkReader, carrier_image, carrier_mode
+from .jobs import atomic_output, checkpoint
+from .metrics import stage, timed
+from .output import OutputFormat, OutputOptions, check_output, header_of, save_options
+from .planner import split_sizes
+from .preview import image_info
+
+# Constantes
+PARALLEL_PIXELS = 8 << 20  # Pixels (toutes images comprises) à partir desquels les images vont au pool de processus
+MULTI_FRAME_FORMATS = ("PNG", "TIFF")  # Sorties gardant toutes les images sans perte (le WebP animé n'est pas exact)
+PAGE_TAGS = (  # Étiquettes TIFF recopiées page par page
+    270,  # Description
+    282, 283, 296,  # Résolution et unité
+    285, 286, 287,  # Nom et position de la page
+    305, 306, 315, 33432,  # Logiciel, date, auteur, copyright
+)
+FRAME_FLAGS = FLAG_SHARD | FLAG_FRAMES  # Drapeaux des fragments écrits dans chaque image
+WINDOW = 2  # Tâches confiées à l'avance à chaque processus (fragments en mémoire au même moment)
+
+
+# Classe pour stocker les images d'un fichier et ce qu'il faut pour le réenregistrer
+@dataclass
+class FrameSet:
+    format: str  # Format du fichier d'origine (PNG, TIFF, GIF, ...)
+    frames: List[Optional[Image.Image]] = field(default_factory=list)  # Images décodées (None: page lue par le pool)
+    shapes: List[Tuple[int, int, str]] = field(default_factory=list)  # (largeur, hauteur, mode exploité) par image
+    durations: List[float] = field(default_factory=list)  # Durée d'affichage de chaque image (millisecondes)
+    disposals: List[int] = field(default_factory=list)  # Effacement après chaque image (PNG animé)
+    tags: List[dict] = field(default_factory=list)  # Étiquettes descriptives de chaque page (TIFF)
+    loop: int = 0  # Répétitions de l'animation (0: infinie)
+    default_image: bool = False  # La première image ne fait pas partie de l'animation (PNG animé)
+
+
+def is_multiframe(path: str) -> bool:
+    """Vrai si le fichier contient plusieurs images (lecture de l'en-tête uniquement)."""
+    with Image.open(path) as img:
+        return getattr(img, 'n_frames', 1) > 1
+
+
+def _uniform(frames: List[Image.Image]) -> List[Image.Image]:
+    """Convertit les images d'une animation dans un même mode exploitable (le PNG animé n'en a qu'un)."""
+    alpha = any(f.mode in ('RGBA', 'LA', 'PA') or 'transparency' in f.info for f in frames)
+    gray = all(f.mode in ('L', 'LA') for f in frames)
+    mode = ('LA' if alpha else 'L') if gray else ('RGBA' if alpha else 'RGB')
+    return [f if f.mode == mode else f.convert(mode) for f in frames]
+
+
+def read_frames(path: str, decode: bool = True) -> FrameSet:
+    """Décode les images d'un fichier et relève leur minutage et leurs étiquettes.
+
+    Les images d'une animation sont composées (chacune est l'image affichée). Avec `decode=False`,
+    les pages d'un TIFF ne sont pas décodées : chaque processus du pool lit la sienne.
+    """
+    with Image.open(path) as img:
+        # Sans extension de répétition, un GIF n'est joué qu'une fois (0 signifie une répétition infinie)
+        loop = img.info.get('loop', 1 if img.format == 'GIF' else 0)
+        frameset = FrameSet(img.format, loop=loop, default_image=bool(img.info.get('default_image')))
+        for index in range(getattr(img, 'n_frames', 1)):
+            img.seek(index)
+            frameset.durations.append(img.info.get('duration') or 0)
+            frameset.disposals.append(img.info.get('disposal', PngImagePlugin.Disposal.OP_NONE))
+            if img.format == 'TIFF':
+                frameset.tags.append({tag: img.tag_v2[tag] for tag in PAGE_TAGS if tag in img.tag_v2})
+                frameset.shapes.append((img.width, img.height, carrier_mode(img.mode)))
+            frameset.frames.append(img.copy() if decode or img.format != 'TIFF' else None)
+    if frameset.format != 'TIFF':
+        frameset.frames = _uniform(frameset.frames)
+        frameset.shapes = [(f.width, f.height, f.mode) for f in frameset.frames]
+    return frameset
+
+
+def _frame(path: str, index: int, image: Optional[Image.Image]) -> Image.Image:
+    """Image déjà décodée, ou page `index` du fichier décodée par ce processus."""
+    if image is not None:
+        return image
+    with Image.open(path) as img:
+        img.seek(index)
+        return img.copy()
+
+
+def _embed_frame(task) -> Image.Image:
+    """Insère un fragment dans une image (exécuté dans un processus du pool, ou sur place)."""
+    path, index, image, chunk, fields, lsb, flags, scatter_key, channels = task
+    image = carrier_image(_frame(path, index, image))
+    if chunk is None:
+        return image  # Image trop petite pour un en-tête : enregistrée telle quelle
+    return embed_payload(image, chunk, lsb, flags, None, scatter_key, channels, **fields)
+
+
+def _read_frame(task) -> Tuple[Optional[Header], bytes]:
+    """Lit le fragment d'une image (exécuté dans un processus du pool, ou sur place)."""
+    path, index, image, lsb, scatter = task
+    scatter_key_for = (lambda header: scatter) if scatter else None
+    header, data = extract_payload(_frame(path, index, image), lsb, None, scatter_key_for)
+    return header, bytes(data)
+
+
+def _parallel(path: str, workers: Optional[int]) -> Tuple[int, bool]:
+    """Nombre de processus, et s'il vaut la peine de répartir les images du fichier sur un pool."""
+    frames = image_info(path).frames
+    workers = workers or os.cpu_count() or 1
+    return workers, workers > 1 and sum(width * height for width, height, mode in frames) >= PARALLEL_PIXELS
+
+
+def _run(function: Callable, tasks: Iterable, count: int, parallel: bool, workers: int,
+         progress: Optional[Callable[[float], None]] = None) -> Iterator:
+    """Applique `function` aux `count` tâches, dans un pool de processus si demandé (résultats dans l'ordre).
+
+    Les tâches sont produites à la demande : le pool n'en reçoit que quelques-unes d'avance par processus.
+    """
+    done = 0
+    if parallel:
+        workers = min(workers, count)
+        tasks = iter(tasks)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque(executor.submit(function, task) for task in islice(tasks, workers * WINDOW))
+            while pending:
+                result = pending.popleft().result()
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(executor.submit(function, task))
+                # Une interruption abandonne les images qui n'ont pas encore été confiées au pool
+                checkpoint()
+                done += 1
+                if progress:
+                    progress(done / count)
+                yield result
+    else:
+        for task in tasks:
+            checkpoint()
+            result = function(task)
+            done += 1
+            if progress:
+                progress(done / count)
+            yield result
+
+
+def embed_frames(carrier: str, data: Union[bytes, Iterable[bytes]], output: str, lsb: int, flags: int = 0,
+                 progress: Optional[Callable[[float], None]] = None, scatter_key: Optional[bytes] = None,
+                 channels: Optional[str] = None, encoder: Optional[OutputOptions] = None,
+                 workers: Optional[int] = None, length: Optional[int] = None, **fields):
+    """Répartit des données déjà préparées (chiffrées, ...) sur toutes les images d'un fichier et l'enregistre.
+
+    Chaque image reçoit, dans l'ordre du fichier, un fragment proportionnel à sa capacité.
+    `data` peut être un itérable de morceaux de taille totale `length` : chaque fragment n'est lu qu'au moment
+    d'être confié à son image. Sans `length` (flux compressé), les images sont remplies l'une après l'autre.
+    Le minutage de l'animation et les étiquettes descriptives des pages TIFF sont conservés.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data, length = [data], len(data)
+    if flags & FLAG_SHARD:
+        raise ValueError("Porteuse à plusieurs images indisponible pour une charge répartie sur plusieurs fichiers")
+    fmt = check_output(output)
+    if fmt.name not in MULTI_FRAME_FORMATS:
+        raise ValueError(
+            f"{fmt.name} n'enregistre qu'une image : choisissez PNG (animé) ou TIFF (multipage) "
+            "pour garder toutes les images du porteur"
+        )
+    workers, parallel = _parallel(carrier, workers)
+    with stage("decode"):
+        frameset = read_frames(carrier, decode=not parallel)
+    for width, height, mode in frameset.shapes:
+        check_output(output, mode)
+    if fmt.name == "PNG" and len(set(frameset.shapes)) > 1:
+        raise ValueError("Images de tailles ou de modes différents : enregistrez en TIFF (multipage)")
+
+    flags |= FRAME_FLAGS
+    capacities = [payload_capacity(width, height, lsb, flags, mode, channels)
+                  for width, height, mode in frameset.shapes]
+    used = [index for index, room in enumerate(capacities) if room]
+    if not used:
+        raise ValueError(f"Aucune image du fichier ne peut recevoir de données en LSB {lsb}")
+    room = [capacities[index] for index in used]
+    sizes = dict(zip(used, room if length is None else split_sizes(length, room)))
+    ranks = {index: rank for rank, index in enumerate(used)}
+    source = ChunkReader(data)
+
+    def tasks():
+        # Fragment et champs d'en-tête de chaque image utilisée ; le rang du fragment fixe l'ordre de relecture
+        session = os.urandom(8)
+        for index in range(len(frameset.frames)):
+            # L'image n'est plus référencée que par sa tâche
+            image, frameset.frames[index] = frameset.frames[index], None
+            if index not in sizes:
+                yield carrier, index, image, None, fields, lsb, flags, scatter_key, channels
+                continue
+            shard_fields = {'session': session, 'shard_index': ranks[index], 'shard_count': len(used)}
+            chunk = source.take(sizes[index])
+            yield carrier, index, image, chunk, {**fields, **shard_fields}, lsb, flags, scatter_key, channels
+
+    with stage("embed"):
+        images = list(_run(_embed_frame, tasks(), len(frameset.frames), parallel, workers, progress))
+    if not source.exhausted():
+        raise ValueError(f"Capacité insuffisante: plus de {sum(room)} octets à cacher")
+    if length is not None and source.read != length:
+        raise ValueError(f"Données incomplètes: {source.read} octets sur {length}")
+    expected = [header_of(images[index], lsb) for index in used] if encoder and encoder.verify else None
+    save_frames(frameset, images, output, fmt, encoder, expected, lsb)
+
+
+def save_frames(frameset: FrameSet, images: List[Image.Image], output: str, fmt: OutputFormat,
+                encoder: Optional[OutputOptions] = None, expected: Optional[List[Header]] = None, lsb: int = 1):
+    """Enregistre toutes les images sans perte (le fichier n'apparaît qu'une fois les fragments vérifiés)."""
+    params = save_options(fmt, encoder)
+    first, rest = images[0], images[1:]
+    with atomic_output(output) as partial:
+        with stage("encode"):
+            if fmt.name == "PNG":
+                # La première image d'un PNG animé peut n'être qu'une image par défaut, hors de l'animation
+                start = 1 if frameset.default_image else 0
+                # Les images sont déjà composées : chacune remplace la précédente (aucun mélange alpha)
+                first.save(partial, "PNG", save_all=True, append_images=rest, default_image=frameset.default_image,
+                           duration=frameset.durations[start:], disposal=frameset.disposals[start:],
+                           blend=PngImagePlugin.Blend.OP_SOURCE, loop=frameset.loop, **params)
+            else:
+                tags = frameset.tags or [{}] * len(images)
+                for image, page_tags in zip(rest, tags[1:]):
+                    image.encoderinfo = {"tiffinfo": page_tags}
+                first.save(partial, "TIFF", save_all=True, append_images=rest, tiffinfo=tags[0], **params)
+        if encoder and encoder.verify:
+            with stage("verify"):
+                verify_frames(partial, expected or [], lsb)
+
+
+def verify_frames(path: str, expected: List[Header], lsb: int):
+    """Relit l'en-tête de chaque image du fichier enregistré et vérifie que tous les fragments sont intacts."""
+    found = set()
+    with Image.open(path) as img:
+        for index in range(getattr(img, 'n_frames', 1)):
+            img.seek(index)
+            header = header_of(carrier_image(img), lsb)
+            if header is not None:
+                found.add(header.pack())
+    missing = [rank + 1 for rank, header in enumerate(expected) if header is None or header.pack() not in found]
+    if missing:
+        name = os.path.basename(path)
+        raise ValueError(f"Vérification échouée : fragments {missing} absents ou altérés dans {name}")
+
+
+def extract_frames(path: str, lsb: int, scatter_key_for: Optional[Callable[[Header], bytes]] = None,
+                   progress: Optional[Callable[[float], None]] = None,
+                   workers: Optional[int] = None) -> Tuple[Optional[Header], bytes]:
+    """Relit les fragments de toutes les images d'un fichier et les réassemble dans l'ordre enregistré.
+
+    Les images trop petites pour un en-tête n'ont pas reçu de fragment : le premier en-tête est cherché
+    image par image. Un fichier sans fragment (données dans la première image seule) est lu comme une image
+    simple. L'en-tête retourné décrit la charge réassemblée.
+    """
+    header, chunks = frame_payload(path, lsb, scatter_key_for, progress, workers)
+    data = b"".join(chunks)
+    return header, data
+
+
+def frame_payload(path: str, lsb: int, scatter_key_for: Optional[Callable[[Header], bytes]] = None,
+                  progress: Optional[Callable[[float], None]] = None,
+                  workers: Optional[int] = None) -> Tuple[Optional[Header], Iterator[bytes]]:
+    """Comme `extract_frames`, mais les fragments sont fournis un à un, dans l'ordre, au fil de la lecture des images.
+
+    La taille de l'en-tête retourné est complétée à mesure que les fragments sont fournis.
+    """
+    workers, parallel = _parallel(path, workers)
+    with stage("decode"):
+        frameset = read_frames(path, decode=not parallel)
+        for index in range(len(frameset.frames)):
+            frameset.frames[index] = _frame(path, index, frameset.frames[index])
+            header = header_of(carrier_image(frameset.frames[index]), lsb)
+            if header is not None:
+                break
+    if header is None or not header.multiframe:
+        found, data = extract_payload(frameset.frames[0], lsb, progress, scatter_key_for)
+        return found, iter([bytes(data)])
+
+    # La clé de dispersion ne dépend que du sel, commun à tous les fragments : elle est dérivée une fois
+    scatter = scatter_key_for(header) if header.scattered and scatter_key_for else None
+    tasks = [(path, index, image, lsb, scatter) for index, image in enumerate(frameset.frames)]
+    frameset.frames = []
+    payload = replace(header, flags=header.flags & ~FRAME_FLAGS, length=0)
+
+    def chunks() -> Iterator[bytes]:
+        # Un fragment lu avant son tour (images réordonnées) attend celui qui le précède
+        shards: Dict[int, bytes] = {}
+        rank = 0
+        for found, data in _run(_read_frame, tasks, len(tasks), parallel, workers, progress):
+            if found is not None and found.multiframe and found.session == header.session:
+                shards[found.shard_index] = data
+            while rank in shards:
+                data = shards.pop(rank)
+                payload.length += len(data)
+                rank += 1
+                yield data
+        missing = [index + 1 for index in range(rank, header.shard_count) if index not in shards]
+        if missing:
+            raise ValueError(f"Fragments absents des images du fichier: {missing} sur {header.shard_count}")
+
+    return payload, timed(chunks(), "extract")
@@ -0,0 +1,944 @@
+# DATA-GHOST - Interface graphique
+# Fonctionnalités : Chiffrement AES-256 | Multi-LSB (1-4 bits) 
+
+# Importation des bibliothèques nécessaires
+import customtkinter as ctk  # Pour l'interface graphique moderne
+from tkinter import filedialog, messagebox  # Pour les dialogues de fichiers et les boîtes de message
+from PIL import Image, ImageTk  # Pour la manipulation d'images
+import threading  # Pour exécuter des tâches en arrière-plan
+import os  # Pour les opérations système
+from dataclasses import dataclass, field  # Pour créer des classes de données
+from typing import Dict, List, Optional  # Pour le typage
+
+from . import MAX_LSB  # Nombre maximum de bits LSB supportés
+from .analysis import StegReport, analyze_image, format_report  # Stéganalyse
+from .api import embed, embed_file, extract, extract_file  # Opérations de stéganographie
+from .compress import SAMPLE_SIZE  # Échantillon pour estimer la compression
+from .engine import channel_name  # Jeux de composantes
+from .jobs import CANCELLED, DONE, Job, JobScheduler  # File de tâches exécutées hors de l'interface
+from .metrics import Metrics  # Durée de chaque étape
+from .output import BALANCED, FAST, SMALL, OutputOptions, output_format  # Enregistrement sans perte
+from .planner import (  # Planification
+    CarrierPlan, capacities, estimate_size, frame_capacities, payload_flags, plan, stored_size,
+)
+from .preview import ThumbnailCache, image_info  # Aperçus rapides
+
+# Configuration de l'interface
+ctk.set_appearance_mode("system")  # Thème système par défaut
+ctk.set_default_color_theme("dark-blue")  # Thème couleur bleu foncé
+
+# Constantes
+SUPPORTED_FORMATS = [("Tous fichiers", "*.*")]  # Formats de fichiers supportés
+JOB_POLL_MS = 100  # Intervalle de relève des tâches (millisecondes)
+DEFAULT_CHANNELS = "Défaut"  # Jeu de composantes par défaut (R, G, B ou niveau de gris)
+CHANNEL_CHOICES = [DEFAULT_CHANNELS, "RGBA", "RGB", "R", "G", "B", "A", "LA", "L"]  # Jeux proposés
+OUTPUT_PROFILES = {"Rapide": FAST, "Équilibré": BALANCED, "Compact": SMALL}  # Libellé -> profil d'encodage
+OUTPUT_TYPES = [  # Formats de sortie sans perte proposés à l'enregistrement
+    ("PNG", "*.png"), ("TIFF", "*.tif *.tiff"), ("BMP", "*.bmp"), ("WebP sans perte", "*.webp"),
+]
+FONTS = {  # Polices partagées par tous les écrans (créées une seule fois)
+    "title": {"size": 36, "weight": "bold"},
+    "subtitle": {"size": 14},
+    "button": {"size": 16, "weight": "bold"},
+    "heading": {"size": 20, "weight": "bold"},
+    "action": {"size": 14, "weight": "bold"},
+    "bold": {"weight": "bold"},
+    "text": {"size": 12},
+}
+
+# Définition des thèmes disponibles
+THEMES = {
+    "Classique": {"bg": "#2b2b2b", "text": "#ffffff", "primary": "#3b8eed"},
+    "Professionnel": {"bg": "#1e1e1e", "text": "#f0f0f0", "primary": "#2a6fc9"},
+    "Clair": {"bg": "#f5f5f5", "text": "#333333", "primary": "#1e88e5"}
+}
+
+def _size_text(size: int) -> str:
+    """Taille lisible (octets, Ko ou Mo)."""
+    if size < 10 << 10:
+        return f"{size} octets"
+    if size < 10 << 20:
+        return f"{size >> 10} Ko"
+    return f"{size >> 20} Mo"
+
+# Classe pour stocker les données de l'image
+@dataclass
+class ImageData:
+    path: str  # Chemin de l'image
+    width: int  # Largeur de l'image
+    height: int  # Hauteur de l'image
+    mode: str  # Mode de l'image (RGB, RGBA, etc.)
+    capacity: int = 0  # Capacité de stockage en octets (profondeur LSB courante)
+    capacities: Dict[int, int] = field(default_factory=dict)  # Capacité pour chaque profondeur LSB
+    frames: tuple = ()  # (largeur, hauteur, mode) de chaque image d'un PNG animé, TIFF multipage ou GIF animé
+
+# Classe pour stocker les paramètres de l'application
+@dataclass
+class GhostSettings:
+    lsb: int = 1  # Nombre de bits LSB à utiliser (1-4)
+    theme: str = "Classique"  # Thème actuel
+    encryption: bool = True  # Si le chiffrement est activé
+    compression: Optional[str] = None  # Compression avant chiffrement (zlib, lzma)
+    scatter: bool = False  # Dispersion des données sur des pixels choisis par la clé
+    channels: Optional[str] = None  # Composantes recevant les données (None: jeu par défaut de l'image)
+    output_profile: str = BALANCED  # Profil d'encodage de l'image de sortie
+    verify: bool = True  # Relire l'en-tête dans l'image enregistrée
+
+# Classe principale de l'application
+class DataGhostApp(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        # Configuration de la fenêtre principale
+        self.title("DATA-GHOST - Outil de stéganographie")
+        self.geometry("1000x750")
+        self.minsize(900, 650)
+        
+        # Initialisation des variables
+        self.settings = GhostSettings()
+        self.image_data = None
+        self.preview_image = None
+        self.last_decoded = ""
+        self.payload_file = None  # Fichier à cacher à la place du message
+        self.thumbnails = ThumbnailCache()  # Miniatures déjà construites
+        self._preview_paths = {}  # Canevas -> image dont l'aperçu est attendu
+        self.scheduler = JobScheduler()  # Insertions et extractions (pool de processus)
+        self._job_rows = {}  # Tâche -> widgets de sa ligne dans le panneau
+        self.screens = {}  # Nom -> cadre de l'écran (construit à la première visite)
+        self._screen = None  # Écran affiché
+        self._themed_widgets = []  # (widget, option -> clé du thème) recolorés au changement de thème
+        
+        # Configuration de l'interface
+        self._setup_main_window()
+        self._apply_theme()
+        self.show_home_screen()
+        
+        # Les résultats des tâches ne touchent l'interface que depuis ce thread
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(JOB_POLL_MS, self._poll_jobs)
+        
+    def _setup_main_window(self):
+        """Configure la structure de base de la fenêtre principale."""
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        
+        # Cadre principal
+        self.main_frame = ctk.CTkFrame(self)
+        self.main_frame.grid(row=0, column=0, sticky="nsew", padx=20, pady=20)
+        self.main_frame.grid_columnconfigure(0, weight=1)
+        self.main_frame.grid_rowconfigure(0, weight=1)
+        self.fonts = {name: ctk.CTkFont(**spec) for name, spec in FONTS.items()}
+        
+        # Panneau des tâches (affiché tant qu'il reste des tâches)
+        self.jobs_frame = ctk.CTkFrame(self)
+        jobs_header = ctk.CTkFrame(self.jobs_frame, fg_color="transparent")
+        jobs_header.pack(fill="x")
+        ctk.CTkLabel(jobs_header, text="Tâches", font=self.fonts["bold"]).pack(side="left", padx=5)
+        ctk.CTkButton(jobs_header, text="Effacer terminées", width=120, command=self.clear_finished_jobs).pack(side="right", padx=5)
+        self.jobs_list = ctk.CTkFrame(self.jobs_frame, fg_color="transparent")
+        self.jobs_list.pack(fill="x")
+        
+        # Barre de statut
+        self.status_bar = ctk.CTkLabel(
+            self, 
+            text="Prêt | Mode: Ghost | LSB: 1 | Thème: Classique",
+            anchor="w"
+        )
+        self.status_bar.grid(row=2, column=0, sticky="ew", padx=20)
+        
+    def _apply_theme(self):
+        """Applique le thème sélectionné à l'interface."""
+        theme = THEMES[self.settings.theme]
+        ctk.set_appearance_mode("dark" if self.settings.theme != "Clair" else "light")
+        self.main_frame.configure(fg_color=theme["bg"])
+        self.status_bar.configure(text_color=theme["primary"], fg_color=theme["bg"])
+        # Seuls les widgets aux couleurs du thème sont reconfigurés (les écrans ne sont pas reconstruits)
+        for widget, colors in self._themed_widgets:
+            widget.configure(**{option: theme[key] for option, key in colors.items()})
+        self._update_status()
+    
+    def _update_status(self):
+        """Met à jour le texte de la barre de statut."""
+        status_text = (
+            f"Prêt | Mode: {'Ghost' if self.settings.encryption else 'Stealth'} | "
+            f"LSB: {self.settings.lsb} | Thème: {self.settings.theme}"
+        )
+        self.status_bar.configure(text=status_text)
+    
+    def _show_metrics(self, metrics: Metrics):
+        """Affiche dans la barre de statut la durée de chaque étape de la dernière opération."""
+        self.status_bar.configure(text=f"Terminé | {metrics.summary()}")
+    
+    def _poll_jobs(self):
+        """Relaye la progression et les résultats des tâches, puis se reprogramme."""
+        self.scheduler.drain()
+        self._refresh_jobs()
+        self.after(JOB_POLL_MS, self._poll_jobs)
+    
+    def _refresh_jobs(self):
+        """Met à jour le panneau des tâches (une ligne par tâche : état, progression, annulation)."""
+        for job_id in list(self._job_rows):
+            if job_id not in self.scheduler.jobs:
+                self._job_rows.pop(job_id)[0].destroy()
+        
+        for job in self.scheduler.jobs.values():
+            if job.id not in self._job_rows:
+                row = ctk.CTkFrame(self.jobs_list, fg_color="transparent")
+                row.pack(fill="x", padx=5, pady=1)
+                label = ctk.CTkLabel(row, anchor="w", width=360)
+                label.pack(side="left")
+                bar = ctk.CTkProgressBar(row)
+                bar.pack(side="left", fill="x", expand=True, padx=5)
+                button = ctk.CTkButton(row, text="✖", width=30, command=lambda job_id=job.id: self.scheduler.cancel(job_id))
+                button.pack(side="left")
+                self._job_rows[job.id] = (row, label, bar, button)
+            row, label, bar, button = self._job_rows[job.id]
+            label.configure(text=f"{job.label} — {job.state}")
+            bar.set(job.progress)
+            if job.finished:
+                button.configure(state="disabled")
+        
+        if self._job_rows:
+            self.jobs_frame.grid(row=1, column=0, sticky="ew", padx=20, pady=(0, 5))
+        else:
+            self.jobs_frame.grid_remove()
+    
+    def clear_finished_jobs(self):
+        """Retire les tâches terminées du panneau."""
+        self.scheduler.clear_finished()
+        self._refresh_jobs()
+    
+    def on_close(self):
+        """Ferme la fenêtre en annulant proprement les tâches en cours (aucun fichier partiel n'est laissé)."""
+        if self.scheduler.active and not messagebox.askyesno(
+            "Tâches en cours", "Des tâches sont en cours. Les annuler et quitter ?"
+        ):
+            return
+        self.scheduler.shutdown(cancel=True, wait=True)
+        self.destroy()
+    
+    def _themed(self, widget, **colors):
+        """Enregistre un widget dont les couleurs suivent le thème (option -> clé de THEMES) et le colore."""
+        self._themed_widgets.append((widget, colors))
+        theme = THEMES[self.settings.theme]
+        widget.configure(**{option: theme[key] for option, key in colors.items()})
+        return widget
+    
+    def _show_screen(self, name: str, build):
+        """Affiche un écran, construit à sa première visite puis simplement masqué et réaffiché."""
+        if self._screen == name:
+            return
+        if self._screen:
+            self.screens[self._screen].grid_remove()
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = ctk.CTkFrame(self.main_frame, fg_color="transparent")
+            build(screen)
+            self.screens[name] = screen
+        screen.grid(row=0, column=0, sticky="nsew")
+        screen.tkraise()
+        self._screen = name
+    
+    def show_home_screen(self):
+        """Affiche l'écran d'accueil."""
+        self._show_screen("home", self._build_home_screen)
+        # Réglages modifiables ailleurs (profondeur choisie par la planification)
+        self.theme_menu.set(self.settings.theme)
+        self.lsb_menu.set(str(self.settings.lsb))
+    
+    def _build_home_screen(self, screen):
+        """Construit l'écran d'accueil."""
+        # En-tête
+        header = ctk.CTkFrame(screen)
+        header.pack(pady=(30, 40))
+        
+        self._themed(ctk.CTkLabel(header, text="DATA-GHOST", font=self.fonts["title"]), text_color="primary").pack()
+        self._themed(
+            ctk.CTkLabel(header, text="Solution professionnelle de stéganographie", font=self.fonts["subtitle"]),
+            text_color="text"
+        ).pack()
+        
+        # Boutons principaux
+        btn_frame = ctk.CTkFrame(screen)
+        btn_frame.pack(pady=20)
+        
+        # Bouton Mode Ghost
+        self._themed(ctk.CTkButton(
+            btn_frame,
+            text="🕵️ MODE GHOST",
+            width=220,
+            height=50,
+            font=self.fonts["button"],
+            hover_color="#2a6fc9",
+            command=self.show_ghost_mode
+        ), fg_color="primary").grid(row=0, column=0, padx=20, pady=10)
+        
+        # Bouton Mode Stealth
+        ctk.CTkButton(
+            btn_frame,
+            text="👻 MODE STEALTH",
+            width=220,
+            height=50,
+            font=self.fonts["button"],
+            fg_color="#7e57c2",
+            hover_color="#5e35b1",
+            command=self.show_stealth_mode
+        ).grid(row=0, column=1, padx=20, pady=10)
+        
+        # Paramètres
+        settings_frame = ctk.CTkFrame(screen)
+        settings_frame.pack(pady=30)
+        
+        # Sélecteur de thème
+        ctk.CTkLabel(settings_frame, text="Thème:", font=self.fonts["bold"]).grid(row=0, column=0, padx=5)
+        self.theme_menu = ctk.CTkOptionMenu(settings_frame, values=list(THEMES.keys()), command=self.change_theme)
+        self.theme_menu.grid(row=0, column=1, padx=5)
+        
+        # Sélecteur de bits LSB
+        ctk.CTkLabel(settings_frame, text="Bits LSB:", font=self.fonts["bold"]).grid(row=0, column=2, padx=5)
+        self.lsb_menu = ctk.CTkOptionMenu(settings_frame, values=[str(i) for i in range(1, MAX_LSB+1)], command=self.change_lsb)
+        self.lsb_menu.grid(row=0, column=3, padx=5)
+        
+        # Pied de page
+        ctk.CTkLabel(
+            screen,
+            text="© 2025 DATA-GHOST | Version Professionnelle",
+            text_color="gray50"
+        ).pack(side="bottom", pady=20)
+    
+    def show_ghost_mode(self):
+        """Affiche l'interface du mode Ghost (dissimulation de données)."""
+        self.settings.encryption = True
+        self._show_screen("ghost", self._build_ghost_mode)
+        self._update_status()
+        # Capacité recalculée pour la profondeur et le chiffrement courants
+        self._refresh_capacity()
+    
+    def _build_ghost_mode(self, screen):
+        """Construit l'interface du mode Ghost."""
+        header = ctk.CTkFrame(screen)
+        header.pack(fill="x", pady=(10, 20))
+        
+        # Bouton retour et titre
+        ctk.CTkButton(header, text="← Accueil", width=100, command=self.show_home_screen).pack(side="left")
+        ctk.CTkLabel(header, text="🕵️ MODE GHOST", font=self.fonts["heading"]).pack(side="left", padx=20)
+        
+        content_frame = ctk.CTkFrame(screen)
+        content_frame.pack(fill="both", expand=True)
+        
+        # Colonne image
+        left_col = ctk.CTkFrame(content_frame)
+        left_col.pack(side="left", fill="y", padx=10, pady=10)
+        
+        # Widgets pour l'image porteuse
+        ctk.CTkLabel(left_col, text="Image porteuse", font=self.fonts["bold"]).pack(pady=5)
+        self.img_btn = ctk.CTkButton(left_col, text="📁 Charger image", command=self.load_image)
+        self.img_btn.pack(pady=5)
+        
+        self.preview_label = ctk.CTkLabel(left_col, text="Aperçu:")
+        self.preview_label.pack(pady=5)
+        
+        self.canvas = ctk.CTkCanvas(left_col, width=300, height=200, bg="#333333")
+        self.canvas.pack()
+        self.img_info = ctk.CTkLabel(left_col, text="Aucune image chargée")
+        self.img_info.pack(pady=10)
+        
+        # Choix de l'image et de la profondeur parmi plusieurs candidates
+        self.plan_btn = ctk.CTkButton(left_col, text="📐 Planifier...", command=self.start_planning)
+        self.plan_btn.pack(pady=5)
+        
+        # Colonne configuration
+        right_col = ctk.CTkFrame(content_frame)
+        right_col.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+        
+        # Section message
+        msg_frame = ctk.CTkFrame(right_col)
+        msg_frame.pack(fill="x", pady=10)
+        ctk.CTkLabel(msg_frame, text="Message à dissimuler", font=self.fonts["bold"]).pack(anchor="w")
+        self.msg_entry = ctk.CTkTextbox(msg_frame, height=150, wrap="word", font=self.fonts["text"])
+        self.msg_entry.pack(fill="x", pady=5)
+        
+        # Fichier à cacher (lu par blocs, à la place du message)
+        file_frame = ctk.CTkFrame(msg_frame)
+        file_frame.pack(fill="x")
+        ctk.CTkButton(file_frame, text="📎 Fichier...", width=100, command=self.choose_payload_file).pack(side="left")
+        ctk.CTkButton(file_frame, text="✖", width=30, command=self.clear_payload_file).pack(side="left", padx=5)
+        self.payload_label = ctk.CTkLabel(file_frame, text="Aucun fichier (message texte)")
+        self.payload_label.pack(side="left", padx=5)
+        
+        # Section sécurité
+        security_frame = ctk.CTkFrame(right_col)
+        security_frame.pack(fill="x", pady=10)
+        ctk.CTkLabel(security_frame, text="Sécurité", font=self.fonts["bold"]).pack(anchor="w")
+        
+        # Champ pour la clé secrète
+        key_frame = ctk.CTkFrame(security_frame)
+        key_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(key_frame, text="Clé secrète:").pack(side="left")
+        self.key_entry = ctk.CTkEntry(key_frame, placeholder_text="Entrez votre phrase secrète", show="*")
+        self.key_entry.pack(side="left", fill="x", expand=True, padx=5)
+        self.show_key_btn = ctk.CTkButton(key_frame, text="👁", width=30, command=self.toggle_key_visibility)
+        self.show_key_btn.pack(side="left")
+        
+        # Compression avant chiffrement (ignorée si les données ne rétrécissent pas)
+        compress_frame = ctk.CTkFrame(security_frame)
+        compress_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(compress_frame, text="Compression:").pack(side="left")
+        compress_menu = ctk.CTkOptionMenu(compress_frame, values=["Aucune", "zlib", "lzma"], command=self.change_compression)
+        compress_menu.set(self.settings.compression or "Aucune")
+        compress_menu.pack(side="left", padx=5)
+        
+        # Dispersion : les données ne sont plus concentrées dans les premières lignes
+        self.scatter_check = ctk.CTkCheckBox(compress_frame, text="Disperser (clé)", command=self.toggle_scatter)
+        if self.settings.scatter:
+            self.scatter_check.select()
+        self.scatter_check.pack(side="left", padx=10)
+        
+        # Jeu de composantes : RGBA ou un seul canal permettent une profondeur LSB plus faible
+        channels_frame = ctk.CTkFrame(security_frame)
+        channels_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(channels_frame, text="Composantes:").pack(side="left")
+        self.channels_menu = ctk.CTkOptionMenu(channels_frame, values=CHANNEL_CHOICES, command=self.change_channels)
+        self.channels_menu.set(self.settings.channels or DEFAULT_CHANNELS)
+        self.channels_menu.pack(side="left", padx=5)
+        
+        # Enregistrement : profil d'encodage et vérification de l'en-tête relu
+        output_frame = ctk.CTkFrame(security_frame)
+        output_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(output_frame, text="Enregistrement:").pack(side="left")
+        output_menu = ctk.CTkOptionMenu(output_frame, values=list(OUTPUT_PROFILES), command=self.change_output_profile)
+        output_menu.set(next(label for label, p in OUTPUT_PROFILES.items() if p == self.settings.output_profile))
+        output_menu.pack(side="left", padx=5)
+        self.verify_check = ctk.CTkCheckBox(output_frame, text="Vérifier", command=self.toggle_verify)
+        if self.settings.verify:
+            self.verify_check.select()
+        self.verify_check.pack(side="left", padx=10)
+        
+        # Bouton principal
+        action_frame = ctk.CTkFrame(right_col)
+        action_frame.pack(fill="x", pady=20)
+        self.ghost_btn = self._themed(ctk.CTkButton(
+            action_frame,
+            text="👻 GHOSTIFIER",
+            hover_color="#2a6fc9",
+            font=self.fonts["action"],
+            height=40,
+            command=self.start_ghost_process
+        ), fg_color="primary")
+        self.ghost_btn.pack(fill="x")
+    
+    def show_stealth_mode(self):
+        """Affiche l'interface du mode Stealth (extraction de données)."""
+        self.settings.encryption = False
+        self._show_screen("stealth", self._build_stealth_mode)
+        self._update_status()
+    
+    def _build_stealth_mode(self, screen):
+        """Construit l'interface du mode Stealth."""
+        header = ctk.CTkFrame(screen)
+        header.pack(fill="x", pady=(10, 20))
+        
+        # Bouton retour et titre
+        ctk.CTkButton(header, text="← Accueil", width=100, command=self.show_home_screen).pack(side="left")
+        ctk.CTkLabel(header, text="👻 MODE STEALTH", font=self.fonts["heading"]).pack(side="left", padx=20)
+        
+        content_frame = ctk.CTkFrame(screen)
+        content_frame.pack(fill="both", expand=True)
+        
+        # Colonne image
+        left_col = ctk.CTkFrame(content_frame)
+        left_col.pack(side="left", fill="y", padx=10, pady=10)
+        
+        # Widgets pour l'image à analyser
+        ctk.CTkLabel(left_col, text="Image à analyser", font=self.fonts["bold"]).pack(pady=5)
+        self.stealth_img_btn = ctk.CTkButton(left_col, text="📁 Charger image", command=self.load_stealth_image)
+        self.stealth_img_btn.pack(pady=5)
+        
+        self.stealth_preview_label = ctk.CTkLabel(left_col, text="Aperçu:")
+        self.stealth_preview_label.pack(pady=5)
+        
+        self.stealth_canvas = ctk.CTkCanvas(left_col, width=300, height=200, bg="#333333")
+        self.stealth_canvas.pack()
+        self.stealth_img_info = ctk.CTkLabel(left_col, text="Aucune image chargée")
+        self.stealth_img_info.pack(pady=10)
+        
+        # Colonne configuration
+        right_col = ctk.CTkFrame(content_frame)
+        right_col.pack(side="right", fill="both", expand=True, padx=10, pady=10)
+        
+        # Options d'analyse
+        options_frame = ctk.CTkFrame(right_col)
+        options_frame.pack(fill="x", pady=10)
+        ctk.CTkLabel(options_frame, text="Paramètres d'analyse", font=self.fonts["bold"]).pack(anchor="w")
+        
+        # Sélecteur de bits LSB
+        lsb_frame = ctk.CTkFrame(options_frame)
+        lsb_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(lsb_frame, text="Bits LSB:").pack(side="left")
+        self.stealth_lsb_slider = ctk.CTkSlider(
+            lsb_frame, from_=1, to=MAX_LSB, number_of_steps=MAX_LSB-1,
+            command=lambda value: self.stealth_lsb_label.configure(text=str(int(value)))
+        )
+        self.stealth_lsb_slider.set(self.settings.lsb)
+        self.stealth_lsb_slider.pack(side="left", fill="x", expand=True, padx=5)
+        self.stealth_lsb_label = ctk.CTkLabel(lsb_frame, text=str(self.settings.lsb))
+        self.stealth_lsb_label.pack(side="left")
+        self.stealth_auto_lsb = ctk.CTkCheckBox(lsb_frame, text="Auto", width=60)
+        self.stealth_auto_lsb.pack(side="left", padx=5)
+        
+        # Champ pour la clé (optionnel)
+        key_frame = ctk.CTkFrame(options_frame)
+        key_frame.pack(fill="x", pady=5)
+        ctk.CTkLabel(key_frame, text="Clé (optionnel):").pack(side="left")
+        self.stealth_key_entry = ctk.CTkEntry(key_frame, placeholder_text="Phrase secrète si chiffrement utilisé", show="*")
+        self.stealth_key_entry.pack(side="left", fill="x", expand=True, padx=5)
+        
+        # Bouton d'analyse
+        action_frame = ctk.CTkFrame(right_col)
+        action_frame.pack(fill="x", pady=20)
+        self.analyze_btn = ctk.CTkButton(
+            action_frame,
+            text="🔍 ANALYSER",
+            fg_color="#7e57c2",
+            hover_color="#5e35b1",
+            font=self.fonts["action"],
+            height=40,
+            command=self.start_stealth_analysis
+        )
+        self.analyze_btn.pack(fill="x")
+        self.steganalysis_btn = ctk.CTkButton(
+            action_frame,
+            text="📊 STÉGANALYSE (khi-deux, RS, plans de bits)",
+            fg_color="#546e7a",
+            hover_color="#37474f",
+            command=self.start_steganalysis
+        )
+        self.steganalysis_btn.pack(fill="x", pady=(5, 0))
+        
+        # Zone de résultats
+        self.result_frame = ctk.CTkFrame(right_col)
+        ctk.CTkLabel(self.result_frame, text="Résultats", font=self.fonts["bold"]).pack(anchor="w", pady=5)
+        self.result_text = self._themed(
+            ctk.CTkTextbox(self.result_frame, height=150, wrap="word", font=self.fonts["text"]), text_color="text"
+        )
+        self.result_text.pack(fill="both", expand=True)
+        
+        # Boutons résultats
+        result_btn_frame = ctk.CTkFrame(self.result_frame)
+        result_btn_frame.pack(fill="x", pady=5)
+        ctk.CTkButton(result_btn_frame, text="Copier", width=80, command=self.copy_results).pack(side="left", padx=5)
+        ctk.CTkButton(result_btn_frame, text="Enregistrer...", width=100, command=self.save_extraction).pack(side="left", padx=5)
+        self._themed(
+            ctk.CTkButton(result_btn_frame, text="Ghostifier ce message", command=self.ghostify_result),
+            fg_color="primary"
+        ).pack(side="left", padx=5)
+    
+    # Fonctions utilitaires
+    def toggle_key_visibility(self):
+        """Bascule la visibilité de la clé secrète."""
+        current = self.key_entry.cget("show")
+        self.key_entry.configure(show="" if current == "*" else "*")
+        self.show_key_btn.configure(text="🔒" if current == "*" else "👁")
+    
+    def change_theme(self, choice):
+        """Change le thème de l'interface."""
+        self.settings.theme = choice
+        self._apply_theme()
+    
+    def change_lsb(self, choice):
+        """Change le nombre de bits LSB à utiliser."""
+        self.settings.lsb = int(choice)
+        self._update_status()
+        if "stealth" in self.screens:
+            self.stealth_lsb_slider.set(self.settings.lsb)
+            self.stealth_lsb_label.configure(text=choice)
+        self._refresh_capacity()
+    
+    def _refresh_capacity(self):
+        """Recalcule la capacité de l'image porteuse (profondeur, chiffrement et compression courants)."""
+        data = self.image_data
+        if not data:
+            return
+        try:
+            name = channel_name(data.mode, self.settings.channels)
+        except ValueError:
+            # Jeu absent de cette image (alpha d'une image RGB, ...) : retour au jeu par défaut
+            self.settings.channels = None
+            name = channel_name(data.mode)
+            if "ghost" in self.screens:
+                self.channels_menu.set(DEFAULT_CHANNELS)
+        flags = payload_flags(self.settings.encryption, bool(self.settings.compression))
+        if data.frames:
+            # Les données sont réparties sur toutes les images du fichier
+            data.capacities = frame_capacities(data.frames, flags, self.settings.channels)
+        else:
+            data.capacities = capacities(data.width, data.height, flags, data.mode, self.settings.channels)
+        data.capacity = data.capacities[self.settings.lsb]
+        
+        # Le libellé n'existe qu'une fois l'écran Ghost construit
+        if "ghost" in self.screens:
+            depths = " | ".join(f"{lsb}: {_size_text(room)}" for lsb, room in data.capacities.items())
+            frames = f" | {len(data.frames)} images" if data.frames else ""
+            self.img_info.configure(
+                text=f"{os.path.basename(data.path)}\n{data.width}x{data.height} | {data.mode} ({name}){frames}\n"
+                     f"Capacité (LSB {self.settings.lsb}): {data.capacity} octets\n{depths}"
+            )
+    
+    def load_image(self):
+        """Charge une image pour le mode Ghost."""
+        path = filedialog.askopenfilename(filetypes=SUPPORTED_FORMATS)
+        if not path: return
+        self.set_carrier(path)
+    
+    def set_carrier(self, path: str):
+        """Sélectionne l'image porteuse du mode Ghost."""
+        try:
+            # Seul l'en-tête est lu : les informations s'affichent tout de suite
+            info = image_info(path)
+            self.image_data = ImageData(path=path, width=info.width, height=info.height, mode=info.mode,
+                                        frames=info.frames)
+            self._refresh_capacity()
+            
+            # L'aperçu est construit en arrière-plan
+            self.load_preview(path, self.canvas)
+                
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de charger l'image:\n{str(e)}")
+    
+    def start_planning(self):
+        """Cherche, parmi plusieurs images, la porteuse et la profondeur LSB les plus adaptées."""
+        paths = filedialog.askopenfilenames(filetypes=SUPPORTED_FORMATS, title="Images candidates")
+        if not paths: return
+        
+        message = self.msg_entry.get("1.0", "end-1c").strip()
+        if not message and not self.payload_file:
+            messagebox.showerror("Erreur", "Veuillez entrer un message ou choisir un fichier")
+            return
+        
+        self.plan_btn.configure(state="disabled")
+        threading.Thread(
+            target=self.plan_worker,
+            args=(list(paths), message, self.payload_file),
+            daemon=True
+        ).start()
+    
+    def plan_worker(self, paths: List[str], message: str, payload_file: Optional[str]):
+        """Estime la taille cachée puis lit les en-têtes des images candidates."""
+        try:
+            if payload_file:
+                total = os.path.getsize(payload_file)
+                with open(payload_file, 'rb') as f:
+                    sample = f.read(SAMPLE_SIZE)
+            else:
+                sample = message.encode('utf-8')
+                total = len(sample)
+            compression = self.settings.compression
+            size = stored_size(estimate_size(sample, total, compression), self.settings.encryption)
+            flags = payload_flags(self.settings.encryption, bool(compression))
+            plans = plan(paths, size, flags, channels=self.settings.channels)
+            self.after(0, self.show_plan, plans, size)
+        except Exception as e:
+            self.after(0, lambda: messagebox.showerror("Erreur", f"Échec de la planification:\n{str(e)}"))
+        finally:
+            self.after(0, lambda: self.plan_btn.configure(state="normal"))
+    
+    def show_plan(self, plans: List[CarrierPlan], size: int):
+        """Affiche le classement des images et sélectionne la meilleure."""
+        lines = []
+        for p in plans[:8]:
+            name = os.path.basename(p.path)
+            if p.error:
+                lines.append(f"✖ {name}: {p.error}")
+            elif p.fits:
+                lines.append(f"✔ {name}: LSB {p.lsb} ({p.channels}), {p.modified_pixels} pixels modifiés")
+            else:
+                lines.append(f"✖ {name}: trop petite ({_size_text(p.capacities[max(p.capacities)])} au maximum)")
+        summary = "\n".join(lines)
+        
+        best = plans[0] if plans and plans[0].fits else None
+        if best is None:
+            messagebox.showwarning("Planification", f"Aucune image ne peut contenir {_size_text(size)}:\n\n{summary}")
+            return
+        
+        # Applique la recommandation : image porteuse et profondeur la plus faible suffisante
+        self.settings.lsb = best.lsb
+        self._update_status()
+        self.set_carrier(best.path)
+        messagebox.showinfo("Planification", f"{_size_text(size)} à cacher\n\n{summary}")
+    
+    def load_preview(self, path: str, canvas):
+        """Construit l'aperçu d'une image hors du thread de l'interface."""
+        canvas.delete("all")
+        canvas.create_text(150, 100, text="Chargement de l'aperçu...", fill="gray")
+        self._preview_paths[canvas] = path
+        threading.Thread(target=self.preview_worker, args=(path, canvas), daemon=True).start()
+    
+    def preview_worker(self, path: str, canvas):
+        """Récupère la miniature (cache ou décodage réduit)."""
+        try:
+            thumb = self.thumbnails.get(path)
+        except Exception:
+            thumb = None
+        self.after(0, self.show_preview, path, canvas, thumb)
+    
+    def show_preview(self, path: str, canvas, thumb: Optional[Image.Image]):
+        """Affiche la miniature si l'image est toujours celle sélectionnée."""
+        if self._preview_paths.get(canvas) != path or not canvas.winfo_exists():
+            return
+        canvas.delete("all")
+        if thumb is None:
+            canvas.create_text(150, 100, text="Aperçu indisponible", fill="gray")
+            return
+        # Les images Tk doivent être créées dans le thread de l'interface
+        photo = ImageTk.PhotoImage(thumb)
+        if canvas is self.canvas:
+            self.preview_image = photo
+        else:
+            self.stealth_preview_image = photo
+        canvas.create_image(150, 100, image=photo, anchor="center")
+    
+    def start_ghost_process(self):
+        """Lance le processus de dissimulation de données."""
+        if not self.image_data:
+            messagebox.showerror("Erreur", "Veuillez charger une image")
+            return
+        
+        message = self.msg_entry.get("1.0", "end-1c").strip()
+        if not message and not self.payload_file:
+            messagebox.showerror("Erreur", "Veuillez entrer un message ou choisir un fichier")
+            return
+        
+        key = self.key_entry.get().strip()
+        if not key and self.settings.encryption:
+            messagebox.showerror("Erreur", "Une clé est requise en mode Ghost")
+            return
+        
+        # Demande où sauvegarder l'image
+        save_path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=OUTPUT_TYPES,
+            title="Enregistrer l'image"
+        )
+        if not save_path: return
+        try:
+            output_format(save_path)  # Un format avec perte détruirait les données
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e))
+            return
+        
+        # Chiffre (si activé) et insère les données dans un processus du pool ; la tâche rejoint la file
+        key = key if self.settings.encryption else None
+        options = {'compression': self.settings.compression, 'scatter': self.settings.scatter,
+                   'channels': self.settings.channels,
+                   'encoder': OutputOptions(self.settings.output_profile, verify=self.settings.verify)}
+        label = f"Ghost: {os.path.basename(self.image_data.path)} → {os.path.basename(save_path)}"
+        done = lambda job: self.ghost_done(job, save_path)
+        if self.payload_file:
+            # Le fichier est lu, compressé et chiffré bloc par bloc pendant l'insertion
+            self.scheduler.submit(
+                embed_file, self.image_data.path, self.payload_file, save_path, self.settings.lsb, key,
+                label=label, on_done=done, **options
+            )
+        else:
+            self.scheduler.submit(
+                embed, self.image_data.path, message.encode('utf-8'), save_path, self.settings.lsb, key,
+                label=label, on_done=done, **options
+            )
+    
+    def choose_payload_file(self):
+        """Choisit un fichier quelconque à cacher à la place du message."""
+        path = filedialog.askopenfilename(title="Fichier à cacher")
+        if not path: return
+        self.payload_file = path
+        self.payload_label.configure(text=f"{os.path.basename(path)} ({os.path.getsize(path)} octets)")
+    
+    def clear_payload_file(self):
+        """Revient au message texte."""
+        self.payload_file = None
+        self.payload_label.configure(text="Aucun fichier (message texte)")
+    
+    def toggle_scatter(self):
+        """Active ou désactive la dispersion des données."""
+        self.settings.scatter = bool(self.scatter_check.get())
+    
+    def change_channels(self, value: str):
+        """Change le jeu de composantes qui reçoit les données."""
+        self.settings.channels = None if value == DEFAULT_CHANNELS else value
+        self._refresh_capacity()
+    
+    def change_output_profile(self, label: str):
+        """Change le profil d'encodage de l'image de sortie."""
+        self.settings.output_profile = OUTPUT_PROFILES[label]
+    
+    def toggle_verify(self):
+        """Active ou désactive la vérification de l'image enregistrée."""
+        self.settings.verify = bool(self.verify_check.get())
+    
+    def change_compression(self, value: str):
+        """Change l'algorithme de compression."""
+        self.settings.compression = None if value == "Aucune" else value
+        self._refresh_capacity()
+    
+    def ghost_done(self, job: Job, save_path: str):
+        """Fin d'une tâche d'insertion (thread de l'interface)."""
+        if job.state == DONE:
+            self._show_metrics(job.metrics)
+            messagebox.showinfo("Succès", f"Données cachées dans:\n{save_path}")
+        elif job.state != CANCELLED:
+            messagebox.showerror("Erreur", f"Échec:\n{str(job.error)}")
+    
+    def load_stealth_image(self):
+        """Charge une image pour le mode Stealth."""
+        path = filedialog.askopenfilename(filetypes=SUPPORTED_FORMATS)
+        if not path: return
+        
+        try:
+            info = image_info(path)
+            self.stealth_image_path = path
+            self.stealth_img_info.configure(text=f"{os.path.basename(path)}\n{info.width}x{info.height} | {info.mode}")
+            
+            # L'aperçu est construit en arrière-plan
+            self.load_preview(path, self.stealth_canvas)
+                
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de charger l'image:\n{str(e)}")
+    
+    def start_stealth_analysis(self):
+        """Lance l'analyse de l'image pour extraire les données cachées."""
+        if not hasattr(self, 'stealth_image_path'):
+            messagebox.showerror("Erreur", "Veuillez charger une image")
+            return
+        
+        # En mode automatique, la profondeur est détectée sur les premiers pixels
+        lsb = None if self.stealth_auto_lsb.get() else int(self.stealth_lsb_slider.get())
+        key = self.stealth_key_entry.get().strip()
+        
+        self.result_frame.pack_forget()
+        
+        # Lit l'en-tête puis uniquement les pixels couverts par les données, dans un processus du pool
+        # (les images à l'ancien format sont lues jusqu'au marqueur de fin)
+        self.scheduler.submit(
+            extract, self.stealth_image_path, lsb, key or None,
+            label=f"Stealth: {os.path.basename(self.stealth_image_path)}",
+            on_done=lambda job: self.stealth_done(job, lsb, key)
+        )
+    
+    def stealth_done(self, job: Job, lsb: Optional[int], key: str):
+        """Fin d'une tâche d'analyse (thread de l'interface)."""
+        if job.state == CANCELLED:
+            return
+        if job.state != DONE:
+            messagebox.showerror(
+                "Erreur",
+                f"Échec de l'analyse:\n{str(job.error)}\n\n"
+                "Conseils:\n"
+                "- Essayez différents bits LSB\n"
+                "- Vérifiez la clé\n"
+                "- L'image peut ne pas contenir de données"
+            )
+            return
+        
+        self._show_metrics(job.metrics)
+        extraction = job.result
+        result = ""
+        if lsb is None:
+            result += f"🔎 Profondeur LSB détectée: {extraction.lsb}\n\n"
+        if extraction.decrypted:
+            result += "✅ Données déchiffrées avec succès\n\n"
+        elif key and extraction.header is None:
+            result += "⚠️ Échec du déchiffrement\n\n"
+        
+        try:
+            # Essaie de décoder en UTF-8
+            text = extraction.data.decode('utf-8')
+            result += "=== MESSAGE EXTRAIT ===\n" + text
+            self.last_decoded = text
+        except UnicodeDecodeError:
+            # Si ce n'est pas du texte, affiche les données brutes
+            result += "⚠️ Format binaire (utilisez « Enregistrer... ») - Affichage brut:\n\n" + str(extraction.data[:4096])
+            self.last_decoded = ""
+        
+        self.show_stealth_results(result)
+    
+    def show_stealth_results(self, text: str):
+        """Affiche les résultats de l'analyse."""
+        self.result_text.delete("1.0", "end")
+        self.result_text.insert("1.0", text)
+        self.result_frame.pack(fill="both", expand=True, pady=10)
+        if self._screen != "stealth":
+            # L'utilisateur a quitté l'écran Stealth pendant l'analyse : le résultat l'y attend
+            messagebox.showinfo("Analyse terminée", text[:2000])
+    
+    def start_steganalysis(self):
+        """Lance la stéganalyse de l'image (statistiques LSB, sans clé ni profondeur)."""
+        if not hasattr(self, 'stealth_image_path'):
+            messagebox.showerror("Erreur", "Veuillez charger une image")
+            return
+        self.result_frame.pack_forget()
+        self.scheduler.submit(
+            analyze_image, self.stealth_image_path,
+            label=f"Stéganalyse: {os.path.basename(self.stealth_image_path)}",
+            on_done=self.steganalysis_done
+        )
+    
+    def steganalysis_done(self, job: Job):
+        """Affiche le rapport et le plan LSB de la première composante (thread de l'interface)."""
+        if job.state == CANCELLED:
+            return
+        if job.state != DONE:
+            messagebox.showerror("Erreur", f"Échec de la stéganalyse:\n{str(job.error)}")
+            return
+        self._show_metrics(job.metrics)
+        report: StegReport = job.result
+        self.last_decoded = ""
+        self.show_stealth_results(format_report(report))
+        
+        preview = next(iter(report.previews.values()), None)
+        if preview is not None:
+            # Réduction au plus proche voisin : un lissage effacerait le motif du plan de bits
+            preview = preview.copy()
+            preview.thumbnail((300, 200), Image.NEAREST)
+            self._preview_paths[self.stealth_canvas] = None
+            self.stealth_canvas.delete("all")
+            self.stealth_preview_image = ImageTk.PhotoImage(preview)
+            self.stealth_canvas.create_image(150, 100, image=self.stealth_preview_image, anchor="center")
+    
+    def save_extraction(self):
+        """Extrait les données cachées directement dans un fichier (déchiffrement bloc par bloc)."""
+        if not hasattr(self, 'stealth_image_path'):
+            messagebox.showerror("Erreur", "Veuillez charger une image")
+            return
+        save_path = filedialog.asksaveasfilename(title="Enregistrer les données extraites")
+        if not save_path: return
+        
+        lsb = None if self.stealth_auto_lsb.get() else int(self.stealth_lsb_slider.get())
+        key = self.stealth_key_entry.get().strip()
+        self.scheduler.submit(
+            extract_file, self.stealth_image_path, save_path, lsb, key or None,
+            label=f"Extraction: {os.path.basename(self.stealth_image_path)} → {os.path.basename(save_path)}",
+            on_done=lambda job: self.save_done(job, save_path)
+        )
+    
+    def save_done(self, job: Job, save_path: str):
+        """Fin d'une tâche d'extraction vers un fichier (thread de l'interface)."""
+        if job.state == DONE:
+            self._show_metrics(job.metrics)
+            messagebox.showinfo("Succès", f"{job.result.size} octets extraits dans:\n{save_path}")
+        elif job.state != CANCELLED:
+            messagebox.showerror("Erreur", f"Échec de l'extraction:\n{str(job.error)}")
+    
+    def copy_results(self):
+        """Copie les résultats dans le presse-papiers."""
+        text = self.result_text.get("1.0", "end-1c")
+        if text:
+            self.clipboard_clear()
+            self.clipboard_append(text)
+            messagebox.showinfo("Succès", "Texte copié dans le presse-papiers")
+    
+    def ghostify_result(self):
+        """Réutilise le message extrait dans le mode Ghost."""
+        if hasattr(self, 'last_decoded') and self.last_decoded:
+            self.show_ghost_mode()
+            self.msg_entry.delete("1.0", "end")
+            self.msg_entry.insert("1.0", self.last_decoded)
+        else:
+            messagebox.showwarning("Attention", "Aucun message valide à réutiliser")
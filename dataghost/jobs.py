@@ -0,0 +1,205 @@
+# DATA-GHOST - Planificateur de tâches : pool borné, file d'attente, annulation et écritures atomiques
+# Les tâches lourdes tournent dans des processus ; leurs résultats sont remis au thread qui appelle `drain()`
+
+import itertools  # Pour les identifiants des tâches
+import multiprocessing  # Pour les événements et la file partagés avec les processus
+import os  # Pour le renommage atomique
+import queue  # Pour les tâches terminées et la progression
+import threading  # Pour le mode sans processus
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor  # Pour le pool de travail
+from contextlib import contextmanager  # Pour les blocs d'annulation et d'écriture
+from contextvars import ContextVar  # Pour l'annulation propre à chaque tâche
+from dataclasses import dataclass, field  # Pour créer des classes de données
+from typing import Any, Callable, Dict, Iterator, List, Optional  # Pour le typage
+
+from .metrics import Metrics, collect, throttled
+
+# Constantes
+JOB_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # Tâches exécutées simultanément (un cœur reste à l'interface)
+WAITING = "en attente"  # Tâche dans la file
+RUNNING = "en cours"  # Tâche en cours d'exécution
+DONE = "terminée"  # Tâche réussie
+CANCELLED = "annulée"  # Tâche annulée
+FAILED = "échec"  # Tâche en erreur
+
+_cancel: ContextVar[Optional[Any]] = ContextVar("dataghost_cancel", default=None)
+
+
+class Cancelled(Exception):
+    """Tâche interrompue à un point de contrôle après une demande d'annulation."""
+
+
+@contextmanager
+def cancellation(event):
+    """Associe un événement d'annulation au thread courant (vérifié par `checkpoint`)."""
+    token = _cancel.set(event)
+    try:
+        yield
+    finally:
+        _cancel.reset(token)
+
+
+def checkpoint():
+    """Interrompt la tâche courante si son annulation a été demandée (sans effet hors d'une tâche)."""
+    event = _cancel.get()
+    if event is not None and event.is_set():
+        raise Cancelled("Tâche annulée")
+
+
+@contextmanager
+def atomic_output(path: str) -> Iterator[str]:
+    """Fournit un chemin temporaire, renommé en `path` seulement si le bloc se termine sans erreur.
+
+    Le fichier temporaire est dans le même répertoire (renommage atomique) et garde l'extension
+    (format de sortie déduit par Pillow) ; une tâche annulée ou en échec ne laisse jamais de fichier partiel.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    root, ext = os.path.splitext(name)
+    temporary = os.path.join(directory, f".{root}.{os.urandom(4).hex()}.part{ext}")
+    try:
+        yield temporary
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+# Classe pour suivre une tâche soumise au planificateur
+@dataclass
+class Job:
+    id: int  # Identifiant
+    label: str  # Libellé affiché
+    state: str = WAITING  # État (en attente, en cours, terminée, annulée, échec)
+    progress: float = 0.0  # Avancement (0 à 1)
+    result: Any = None  # Valeur retournée par la tâche
+    error: Optional[BaseException] = None  # Erreur de la tâche
+    metrics: Optional[Metrics] = None  # Durée de chaque étape
+    on_done: Optional[Callable[["Job"], None]] = field(default=None, repr=False)  # Rappel de fin
+    future: Optional[Future] = field(default=None, repr=False)  # Exécution dans le pool
+    cancel_event: Any = field(default=None, repr=False)  # Demande d'annulation
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, CANCELLED, FAILED)
+
+
+def _execute(func: Callable, args: tuple, kwargs: dict, job_id: int, cancel_event, updates):
+    """Exécute une tâche dans un processus du pool, avec annulation, progression et mesure des étapes."""
+    def report(value: float):
+        updates.put((job_id, value))
+
+    with cancellation(cancel_event):
+        checkpoint()  # Annulée pendant qu'elle attendait dans la file
+        updates.put((job_id, 0.0))
+        with collect() as metrics:
+            result = func(*args, progress=throttled(report), **kwargs)
+    return result, metrics
+
+
+class JobScheduler:
+    """File de tâches exécutées par un pool borné (processus par défaut).
+
+    `func` doit accepter un argument `progress` et, en mode processus, être définie au niveau d'un module.
+    Les rappels `on_done` ne s'exécutent que dans `drain()`, donc dans le thread de l'appelant (interface).
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, processes: bool = True):
+        self.workers = workers  # Tâches simultanées
+        self.processes = processes  # Pool de processus (sinon de threads)
+        self.jobs: Dict[int, Job] = {}  # Identifiant -> tâche, dans l'ordre de soumission
+        self._ids = itertools.count(1)
+        self._finished = queue.Queue()  # Tâches terminées, en attente de `drain()`
+        self._executor = None
+        self._manager = None
+        self._updates = None  # Progression envoyée par les tâches
+
+    def _start(self):
+        """Démarre le pool à la première soumission."""
+        if self._executor is not None:
+            return
+        if self.processes:
+            self._manager = multiprocessing.Manager()
+            self._updates = self._manager.Queue()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self._updates = queue.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+
+    def submit(self, func: Callable, *args, label: Optional[str] = None,
+               on_done: Optional[Callable[[Job], None]] = None, **kwargs) -> Job:
+        """Ajoute une tâche à la file."""
+        self._start()
+        job = Job(next(self._ids), label or func.__name__, on_done=on_done)
+        job.cancel_event = self._manager.Event() if self.processes else threading.Event()
+        job.future = self._executor.submit(_execute, func, args, kwargs, job.id, job.cancel_event, self._updates)
+        self.jobs[job.id] = job
+        job.future.add_done_callback(lambda future: self._finished.put(job))
+        return job
+
+    def cancel(self, job_id: int):
+        """Demande l'annulation d'une tâche (retirée de la file ou interrompue au prochain point de contrôle)."""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return
+        job.cancel_event.set()
+        job.future.cancel()
+
+    def cancel_all(self):
+        """Demande l'annulation de toutes les tâches non terminées."""
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    @property
+    def active(self) -> List[Job]:
+        """Tâches en attente ou en cours."""
+        return [job for job in self.jobs.values() if not job.finished]
+
+    def drain(self) -> List[Job]:
+        """Met à jour la progression et exécute, dans le thread appelant, les rappels des tâches terminées."""
+        if self._updates is None:
+            return []
+        while True:
+            try:
+                job_id, value = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            job = self.jobs.get(job_id)
+            if job is not None and not job.finished:
+                job.state, job.progress = RUNNING, value
+
+        finished = []
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                break
+            if job.future.cancelled():
+                job.state = CANCELLED
+            elif isinstance(job.future.exception(), Cancelled):
+                job.state = CANCELLED
+            elif job.future.exception() is not None:
+                job.state, job.error = FAILED, job.future.exception()
+            else:
+                job.state, job.progress = DONE, 1.0
+                job.result, job.metrics = job.future.result()
+            if job.on_done:
+                job.on_done(job)
+            finished.append(job)
+        return finished
+
+    def clear_finished(self):
+        """Oublie les tâches terminées."""
+        for job_id in [job.id for job in self.jobs.values() if job.finished]:
+            del self.jobs[job_id]
+
+    def shutdown(self, cancel: bool = True, wait: bool = True):
+        """Arrête le pool (en annulant d'abord les tâches si demandé)."""
+        if cancel:
+            self.cancel_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
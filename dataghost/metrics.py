@@ -0,0 +1,132 @@
+# DATA-GHOST - Mesures de performance : progression limitée en fréquence et durée de chaque étape
+# Les étapes sont chronométrées sans changer la signature des fonctions : il suffit d'ouvrir `collect()`
+
+import time  # Pour la mesure des durées
+from contextlib import contextmanager, nullcontext  # Pour les blocs chronométrés
+from contextvars import ContextVar  # Pour le collecteur propre à chaque thread
+from typing import Callable, Dict, Iterable, Iterator, Optional  # Pour le typage
+
+# Constantes
+PROGRESS_RATE = 20  # Nombre maximal d'appels de progression par seconde
+STAGE_LABELS = {  # Étape -> libellé affiché
+    "read": "lecture",
+    "decode": "décodage",
+    "detect": "détection",
+    "kdf": "dérivation de clé",
+    "compress": "compression",
+    "encrypt": "chiffrement",
+    "embed": "insertion",
+    "encode": "encodage",
+    "verify": "vérification",
+    "extract": "extraction",
+    "decrypt": "déchiffrement",
+    "decompress": "décompression",
+    "write": "écriture",
+    "analyze": "stéganalyse",
+    "probe": "sondage",
+}
+
+_current: ContextVar[Optional["Metrics"]] = ContextVar("dataghost_metrics", default=None)
+
+
+class Metrics:
+    """Durées propres de chaque étape : le temps passé dans une étape imbriquée n'est pas compté deux fois."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}  # Étape -> secondes
+        self._stack = []  # Étapes en cours : [nom, instant de reprise]
+        self._start = time.perf_counter()
+        self.total = 0.0  # Durée totale de la collecte
+
+    def _add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str):
+        """Chronomètre un bloc ; l'étape englobante est suspendue pendant ce temps."""
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self._add(parent[0], now - parent[1])
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            current = self._stack.pop()
+            self._add(current[0], now - current[1])
+            if self._stack:
+                self._stack[-1][1] = now
+
+    def merge(self, stages: Dict[str, float]):
+        """Ajoute des durées mesurées ailleurs (cumulées sur un pool : elles peuvent dépasser le total)."""
+        for name, seconds in stages.items():
+            self._add(name, seconds)
+
+    def report(self) -> dict:
+        """Rapport structuré : secondes par étape et durée totale."""
+        return {
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'total': round(self.total or time.perf_counter() - self._start, 4),
+        }
+
+    def summary(self) -> str:
+        """Résumé lisible, des étapes les plus longues aux plus courtes."""
+        stages = sorted(self.stages.items(), key=lambda item: -item[1])
+        parts = [f"{STAGE_LABELS.get(name, name)} {seconds:.2f} s" for name, seconds in stages]
+        return " | ".join(parts + [f"total {self.report()['total']:.2f} s"])
+
+
+@contextmanager
+def collect() -> Iterator[Metrics]:
+    """Active la collecte des durées pour le thread courant."""
+    metrics = Metrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        metrics.total = time.perf_counter() - metrics._start
+        _current.reset(token)
+
+
+def stage(name: str):
+    """Chronomètre un bloc si une collecte est active (sinon ne fait rien)."""
+    metrics = _current.get()
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def merge(stages: Dict[str, float]):
+    """Ajoute à la collecte active les durées mesurées dans d'autres processus (sinon ne fait rien)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.merge(stages)
+
+
+def timed(iterable: Iterable, name: str) -> Iterator:
+    """Attribue à l'étape `name` le temps passé à produire chaque élément d'un itérateur."""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def throttled(progress: Optional[Callable[[float], None]],
+              rate: float = PROGRESS_RATE) -> Optional[Callable[[float], None]]:
+    """Limite un rappel de progression à `rate` appels par seconde (la fin est toujours signalée)."""
+    if progress is None or getattr(progress, 'throttled', False):
+        return progress
+    interval = 1.0 / rate
+    last = [-interval]
+
+    def wrapper(value: float):
+        now = time.monotonic()
+        if value >= 1.0 or now - last[0] >= interval:
+            last[0] = now
+            progress(value)
+
+    wrapper.throttled = True
+    return wrapper
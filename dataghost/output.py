@@ -0,0 +1,140 @@
+# DATA-GHOST - Encodage de l'image de sortie : formats sans perte, profils de vitesse et vérification
+# Un format avec perte détruirait les bits cachés : il est refusé avant toute insertion
+
+import os  # Pour l'extension du fichier de sortie
+import zlib  # Pour les stratégies deflate du PNG
+from dataclasses import dataclass, field  # Pour créer des classes de données
+from typing import Dict, Optional, Tuple  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+from PIL import Image, features  # Pour l'enregistrement et les codecs disponibles
+
+from .container import HEADER_MAX_SIZE, Header, read_header
+from .engine import base_channels, carrier_mode, channel_view, channels_needed
+from .stream import StripReader
+
+# Constantes
+FAST = "fast"  # Débit maximal (traitement par lots)
+BALANCED = "balanced"  # Réglages par défaut de Pillow
+SMALL = "small"  # Fichiers les plus petits, encodage lent
+PROFILES = (FAST, BALANCED, SMALL)  # Profils d'encodage
+DEFAULT_PROFILE = BALANCED  # Profil par défaut
+PNG_STRATEGIES = {  # Nom -> stratégie deflate (le PNG n'expose que celle-ci, les filtres restent adaptatifs)
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED,
+}
+LOSSY_EXTENSIONS = ('.jpg', '.jpeg', '.jpe', '.jfif', '.gif', '.heic', '.heif', '.avif', '.jp2', '.j2k', '.jxr')
+
+
+# Classe pour décrire un format de sortie sans perte
+@dataclass
+class OutputFormat:
+    name: str  # Format Pillow
+    modes: Tuple[str, ...]  # Modes enregistrés sans conversion
+    profiles: Dict[str, dict] = field(default_factory=dict)  # Profil -> options d'enregistrement
+    feature: Optional[str] = None  # Codec Pillow requis
+
+
+# Classe pour stocker les réglages de l'encodage de sortie
+@dataclass
+class OutputOptions:
+    profile: str = DEFAULT_PROFILE  # Profil (fast, balanced, small)
+    compress_level: Optional[int] = None  # Niveau deflate du PNG (0 à 9, remplace celui du profil)
+    strategy: Optional[str] = None  # Stratégie deflate du PNG (filtered, huffman, rle, fixed)
+    verify: bool = False  # Relire la zone de l'en-tête après l'enregistrement
+
+
+_WEBP = {"lossless": True, "exact": True}  # `exact` garde les composantes des pixels transparents
+
+FORMATS = {  # Extension -> format sans perte
+    ".png": OutputFormat("PNG", ("RGB", "RGBA", "L", "LA"), {
+        FAST: {"compress_level": 1, "compress_type": zlib.Z_HUFFMAN_ONLY},
+        BALANCED: {"compress_level": 6},
+        SMALL: {"compress_level": 9},
+    }),
+    ".bmp": OutputFormat("BMP", ("RGB", "L")),
+    ".tif": OutputFormat("TIFF", ("RGB", "RGBA", "L", "LA"), {SMALL: {"compression": "tiff_adobe_deflate"}}),
+    ".tiff": OutputFormat("TIFF", ("RGB", "RGBA", "L", "LA"), {SMALL: {"compression": "tiff_adobe_deflate"}}),
+    ".ppm": OutputFormat("PPM", ("RGB",)),
+    ".pgm": OutputFormat("PPM", ("L",)),
+    ".webp": OutputFormat("WEBP", ("RGB", "RGBA"), {
+        FAST: {**_WEBP, "quality": 0, "method": 0},
+        BALANCED: {**_WEBP, "quality": 50, "method": 4},
+        SMALL: {**_WEBP, "quality": 100, "method": 6},
+    }, feature="webp"),
+}
+
+
+def output_format(path: str) -> OutputFormat:
+    """Format sans perte correspondant à l'extension du fichier de sortie (les formats avec perte sont refusés)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in LOSSY_EXTENSIONS:
+        raise ValueError(f"Format avec perte refusé: {ext} (les données cachées seraient détruites)")
+    fmt = FORMATS.get(ext)
+    if fmt is None:
+        raise ValueError(f"Format de sortie non supporté: {ext or 'sans extension'} (PNG, BMP, TIFF, PPM, WebP)")
+    if fmt.feature and not features.check(fmt.feature):
+        raise ValueError(f"Codec {fmt.name} indisponible dans cette installation de Pillow")
+    return fmt
+
+
+def _check_mode(fmt: OutputFormat, mode: str):
+    """Refuse un mode que le format ne peut enregistrer qu'en le convertissant (alpha perdu, ...)."""
+    if carrier_mode(mode) not in fmt.modes:
+        raise ValueError(
+            f"{fmt.name} ne peut pas enregistrer une image {carrier_mode(mode)} sans conversion "
+            f"({', '.join(fmt.modes)}) : choisissez PNG ou TIFF"
+        )
+
+
+def check_output(path: str, mode: Optional[str] = None) -> OutputFormat:
+    """Vérifie que le fichier de sortie peut recevoir une image de ce mode sans perte ni conversion."""
+    fmt = output_format(path)
+    if mode is not None:
+        _check_mode(fmt, mode)
+    return fmt
+
+
+def save_options(fmt: OutputFormat, options: Optional[OutputOptions] = None) -> dict:
+    """Options d'enregistrement Pillow d'un format pour un profil (réglages PNG explicites compris)."""
+    options = options or OutputOptions()
+    if options.profile not in PROFILES:
+        raise ValueError(f"Profil d'encodage inconnu: {options.profile} (choix: {', '.join(PROFILES)})")
+    params = dict(fmt.profiles.get(options.profile, {}))
+    if fmt.name == "PNG":
+        if options.compress_level is not None:
+            if not 0 <= options.compress_level <= 9:
+                raise ValueError(f"Niveau de compression PNG entre 0 et 9: {options.compress_level}")
+            params["compress_level"] = options.compress_level
+        if options.strategy is not None:
+            if options.strategy not in PNG_STRATEGIES:
+                raise ValueError(f"Stratégie PNG inconnue: {options.strategy} (choix: {', '.join(PNG_STRATEGIES)})")
+            params["compress_type"] = PNG_STRATEGIES[options.strategy]
+    return params
+
+
+def save_image(img: Image.Image, path: str, fmt: OutputFormat, options: Optional[OutputOptions] = None):
+    """Enregistre l'image dans un format sans perte (le format est imposé : `path` peut être temporaire)."""
+    _check_mode(fmt, img.mode)
+    img.save(path, fmt.name, **save_options(fmt, options))
+
+
+def header_of(img: Image.Image, lsb: int) -> Optional[Header]:
+    """En-tête d'une image en mémoire, lu dans ses premières lignes seulement."""
+    base = base_channels(img.mode)
+    rows = min(img.height, -(-channels_needed(HEADER_MAX_SIZE, lsb) // (img.width * base[1])))
+    return read_header(channel_view(np.asarray(img.crop((0, 0, img.width, rows))), *base), lsb)
+
+
+def verify_output(path: str, header: Optional[Header]):
+    """Relit la zone de l'en-tête dans le fichier enregistré et vérifie qu'elle est intacte."""
+    if header is None:
+        raise ValueError("Vérification impossible : aucun en-tête à comparer")
+    with StripReader(path) as reader:
+        rows = min(reader.height, reader.row_of(channels_needed(header.size, header.lsb) - 1) + 1)
+        found = read_header(reader.channels(0, rows), header.lsb)
+    if found is None or found.pack() != header.pack():
+        raise ValueError(f"Vérification échouée : en-tête absent ou altéré dans {os.path.basename(path)}")
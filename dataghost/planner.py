@@ -0,0 +1,142 @@
+# DATA-GHOST - Planification de capacité : choix de l'image porteuse et de la profondeur LSB
+# Seuls les en-têtes des fichiers sont lus (en parallèle) : aucun pixel n'est décodé
+
+from concurrent.futures import ThreadPoolExecutor  # Pour lire les en-têtes en parallèle
+from dataclasses import dataclass, field  # Pour créer des classes de données
+from typing import Dict, List, Optional, Sequence, Tuple  # Pour le typage
+
+from . import MAX_LSB
+from .compress import DEFAULT_LEVEL, algorithm_id, compress
+from .container import (
+    FLAG_AEAD, FLAG_COMPRESSED, FLAG_ENCRYPTED, FLAG_FRAMES, FLAG_KDF, FLAG_SHARD, Header, channel_fields,
+    payload_capacity, payload_start,
+)
+from .crypto import sealed_size
+from .engine import base_channels, channel_name, channel_range, channels_needed
+from .preview import ImageInfo, image_info
+
+# Constantes
+CHANNEL_SET = "RGB"  # Composantes modifiées par défaut (niveau de gris pour les images L et LA)
+HEADER_WORKERS = 8  # Lectures d'en-têtes simultanées
+
+
+# Classe pour décrire le plan d'insertion dans une image porteuse
+@dataclass
+class CarrierPlan:
+    path: str  # Chemin de l'image
+    width: int = 0  # Largeur
+    height: int = 0  # Hauteur
+    mode: str = ""  # Mode de l'image
+    capacities: Dict[int, int] = field(default_factory=dict)  # Profondeur LSB -> octets disponibles
+    lsb: Optional[int] = None  # Profondeur la plus faible suffisante (None: image trop petite)
+    channels: str = CHANNEL_SET  # Composantes utilisées
+    modified_pixels: int = 0  # Pixels modifiés par l'en-tête et les données
+    error: Optional[str] = None  # Erreur de lecture éventuelle
+
+    @property
+    def fits(self) -> bool:
+        return self.lsb is not None
+
+
+def payload_flags(encrypted: bool = False, compressed: bool = False) -> int:
+    """Indicateurs d'en-tête d'une insertion (ils déterminent la taille de l'en-tête)."""
+    flags = FLAG_ENCRYPTED | FLAG_KDF | FLAG_AEAD if encrypted else 0
+    return flags | FLAG_COMPRESSED if compressed else flags
+
+
+def stored_size(size: int, encrypted: bool = False) -> int:
+    """Nombre d'octets réellement cachés pour `size` octets de données (étiquettes de chiffrement comprises)."""
+    return sealed_size(size) if encrypted else size
+
+
+def estimate_size(sample: bytes, total: int, compression: Optional[str] = None, level: int = DEFAULT_LEVEL) -> int:
+    """Taille estimée après compression, d'après un échantillon du début des données."""
+    if not compression or not sample:
+        return total
+    packed = compress(sample, algorithm_id(compression), level)
+    if packed is None:
+        return total
+    return -(-total * len(packed) // len(sample))
+
+
+def capacities(width: int, height: int, flags: int = 0, mode: str = 'RGB',
+               channels: Optional[str] = None) -> Dict[int, int]:
+    """Capacité (en-tête déduit) pour chaque profondeur LSB."""
+    return {lsb: payload_capacity(width, height, lsb, flags, mode, channels) for lsb in range(1, MAX_LSB + 1)}
+
+
+def frame_capacities(frames: Sequence[Tuple[int, int, str]], flags: int = 0,
+                     channels: Optional[str] = None) -> Dict[int, int]:
+    """Capacité cumulée des images d'un fichier (un en-tête de fragment par image) pour chaque profondeur LSB."""
+    flags |= FLAG_SHARD | FLAG_FRAMES
+    return {lsb: sum(payload_capacity(width, height, lsb, flags, mode, channels) for width, height, mode in frames)
+            for lsb in range(1, MAX_LSB + 1)}
+
+
+def info_capacities(info: ImageInfo, flags: int = 0, channels: Optional[str] = None) -> Dict[int, int]:
+    """Capacité d'un fichier image pour chaque profondeur LSB, toutes ses images comprises."""
+    if info.frames:
+        return frame_capacities(info.frames, flags, channels)
+    return capacities(info.width, info.height, flags, info.mode, channels)
+
+
+def split_sizes(total: int, capacities: Sequence[int]) -> List[int]:
+    """Répartit `total` octets proportionnellement aux capacités (même densité sur chaque image)."""
+    available = sum(capacities)
+    if total > available:
+        raise ValueError(f"Capacité insuffisante: {total} octets pour {available} octets disponibles")
+    if not available:
+        return [0] * len(capacities)
+
+    sizes = [total * capacity // available for capacity in capacities]
+    # Distribue le reste aux images ayant encore de la place, par plus grand reste
+    remainders = sorted(range(len(capacities)), key=lambda i: -(total * capacities[i] % available))
+    for i in remainders[:total - sum(sizes)]:
+        sizes[i] += 1
+    return sizes
+
+
+def modified_pixels(size: int, lsb: int, flags: int = 0, mode: str = 'RGB', channels: Optional[str] = None) -> int:
+    """Pixels modifiés pour cacher `size` octets (en-tête compris)."""
+    base, count = base_channels(mode)[1], channel_range(mode, channels)[1]
+    header = Header(lsb=lsb, length=0, flags=flags | channel_fields(mode, channels)[0])
+    start = payload_start(header, lsb, base, count)
+    return -(-(start + channels_needed(size, lsb)) // count)
+
+
+def plan_carrier(path: str, size: int, flags: int = 0, channels: Optional[str] = None) -> CarrierPlan:
+    """Plan d'insertion de `size` octets (déjà compressés et chiffrés) dans une image."""
+    try:
+        info = image_info(path)
+        name = channel_name(info.mode, channels)
+    except Exception as e:
+        return CarrierPlan(path, error=f"{type(e).__name__}: {e}")
+
+    plan = CarrierPlan(path, info.width, info.height, info.mode, info_capacities(info, flags, channels),
+                       channels=name)
+    # Profondeur la plus faible suffisante : la moins visible
+    plan.lsb = next((lsb for lsb, room in plan.capacities.items() if room >= size), None)
+    if plan.lsb is not None:
+        plan.modified_pixels = modified_pixels(size, plan.lsb, flags, info.mode, channels)
+    return plan
+
+
+def plan(paths: Sequence[str], size: int, flags: int = 0, workers: Optional[int] = None,
+         channels: Optional[str] = None) -> List[CarrierPlan]:
+    """Plans de toutes les images, de la plus avantageuse à la moins avantageuse.
+
+    Ordre : profondeur la plus faible, puis le moins de pixels modifiés, puis la plus petite image
+    (la moins coûteuse à réencoder). Les images trop petites ou illisibles viennent en dernier.
+    """
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=workers or min(HEADER_WORKERS, len(paths))) as executor:
+        plans = list(executor.map(lambda path: plan_carrier(path, size, flags, channels), paths))
+    return sorted(plans, key=lambda p: (not p.fits, p.lsb or 0, p.modified_pixels, p.width * p.height))
+
+
+def recommend(paths: Sequence[str], size: int, flags: int = 0, workers: Optional[int] = None,
+              channels: Optional[str] = None) -> Optional[CarrierPlan]:
+    """Meilleure image porteuse pour `size` octets, ou None si aucune ne suffit."""
+    plans = plan(paths, size, flags, workers, channels)
+    return plans[0] if plans and plans[0].fits else None
@@ -0,0 +1,155 @@
+# DATA-GHOST - Aperçus rapides : décodage à résolution réduite et cache des miniatures
+# Les métadonnées ne demandent que l'en-tête du fichier ; la miniature est construite à part (hors du thread Tk)
+
+import hashlib  # Pour le nom des miniatures sur disque
+import os  # Pour les dates de modification et le répertoire du cache
+import threading  # Pour protéger le cache partagé entre threads
+from collections import OrderedDict  # Pour l'ordre d'utilisation du cache LRU
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Optional, Tuple  # Pour le typage
+
+import numpy as np  # Pour l'échantillonnage des lignes
+from PIL import Image  # Pour la manipulation d'images
+
+from .stream import StripReader
+
+# Constantes
+THUMB_SIZE = (300, 200)  # Taille maximale d'une miniature
+CACHE_DIR = os.path.join(  # Répertoire par défaut des miniatures sur disque
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'dataghost', 'thumbnails'
+)
+MAX_DISK_FILES = 512  # Nombre de miniatures gardées sur disque
+
+
+# Classe pour stocker les métadonnées d'une image (lues sans décoder les pixels)
+@dataclass
+class ImageInfo:
+    path: str  # Chemin de l'image
+    width: int  # Largeur
+    height: int  # Hauteur
+    mode: str  # Mode (RGB, RGBA, P, ...)
+    format: Optional[str]  # Format du fichier (PNG, JPEG, ...)
+    frames: Tuple[Tuple[int, int, str], ...] = ()  # (largeur, hauteur, mode) de chaque image d'un fichier qui en contient plusieurs
+
+
+def frame_shapes(img: Image.Image) -> Tuple[Tuple[int, int, str], ...]:
+    """Dimensions et mode de chaque image d'un fichier qui en contient plusieurs (vide s'il n'en a qu'une)."""
+    count = getattr(img, 'n_frames', 1)
+    if count < 2:
+        return ()
+    if img.format != 'TIFF':
+        # Les images d'une animation ont toutes la taille du canevas
+        return ((img.width, img.height, img.mode),) * count
+    # Les pages d'un TIFF ont chacune leur taille : seul leur répertoire d'étiquettes est lu
+    shapes = []
+    for index in range(count):
+        img.seek(index)
+        shapes.append((img.width, img.height, img.mode))
+    img.seek(0)
+    return tuple(shapes)
+
+
+def image_info(path: str) -> ImageInfo:
+    """Lit les dimensions et le mode dans l'en-tête du fichier uniquement."""
+    with Image.open(path) as img:
+        return ImageInfo(path, img.width, img.height, img.mode, img.format, frame_shapes(img))
+
+
+def _sampled(path: str, size: Tuple[int, int]) -> Optional[Image.Image]:
+    """Échantillonne les lignes d'un fichier non compressé sans lire le reste, ou retourne None."""
+    with StripReader(path) as reader:
+        if reader.layout is None:
+            return None
+        # Deux fois la résolution visée, pour un lissage correct lors de la réduction finale
+        step = max(1, min(reader.width // (2 * size[0]), reader.height // (2 * size[1])))
+        if step == 1:
+            return None
+        order = list(reader.layout.order)
+        rows = [reader.pixels(reader.read_block(row, row + 1))[0, ::step][:, order]
+                for row in range(0, reader.height, step)]
+    return Image.fromarray(np.ascontiguousarray(np.stack(rows)), 'RGB')
+
+
+def make_thumbnail(path: str, size: Tuple[int, int] = THUMB_SIZE) -> Image.Image:
+    """Construit une miniature en décodant le moins de pixels possible."""
+    thumb = _sampled(path, size)
+    if thumb is None:
+        with Image.open(path) as img:
+            # JPEG : décodage directement à 1/2, 1/4 ou 1/8 de la taille
+            img.draft('RGB', (size[0] * 2, size[1] * 2))
+            # Autres formats : réduction entière (rapide) puis rééchantillonnage de la petite image
+            img.thumbnail(size, reducing_gap=2.0)
+            thumb = img if img.mode in ('RGB', 'RGBA') else img.convert('RGBA' if 'A' in img.mode else 'RGB')
+            thumb.load()
+    thumb.thumbnail(size)
+    return thumb
+
+
+class ThumbnailCache:
+    """Cache LRU des miniatures, en mémoire et sur disque, indexé par (chemin, taille, date de modification)."""
+
+    def __init__(self, maxsize: int = 64, directory: Optional[str] = CACHE_DIR, max_files: int = MAX_DISK_FILES):
+        self.maxsize = maxsize  # Miniatures gardées en mémoire
+        self.directory = directory  # Répertoire sur disque (None: mémoire uniquement)
+        self.max_files = max_files  # Miniatures gardées sur disque
+        self._entries = OrderedDict()  # Clé -> miniature
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str, size: Tuple[int, int] = THUMB_SIZE) -> tuple:
+        """Clé d'une miniature : toute modification du fichier l'invalide."""
+        stat = os.stat(path)
+        return os.path.realpath(path), tuple(size), stat.st_mtime_ns, stat.st_size
+
+    def _disk_path(self, key: tuple) -> str:
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode('utf-8')).hexdigest() + '.png')
+
+    def _remember(self, key: tuple, thumb: Image.Image):
+        with self._lock:
+            self._entries[key] = thumb
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, path: str, size: Tuple[int, int] = THUMB_SIZE) -> Image.Image:
+        """Retourne la miniature d'une image, en la construisant au besoin."""
+        key = self.key(path, size)
+        with self._lock:
+            thumb = self._entries.get(key)
+            if thumb is not None:
+                self._entries.move_to_end(key)
+                return thumb
+
+        if self.directory:
+            disk_path = self._disk_path(key)
+            try:
+                with Image.open(disk_path) as cached:
+                    thumb = cached.copy()
+                os.utime(disk_path)  # Dernière utilisation (éviction LRU)
+            except OSError:
+                thumb = None
+
+        if thumb is None:
+            thumb = make_thumbnail(path, size)
+            if self.directory:
+                self._store(disk_path, thumb)
+        self._remember(key, thumb)
+        return thumb
+
+    def _store(self, disk_path: str, thumb: Image.Image):
+        """Enregistre une miniature sur disque et supprime les moins récemment utilisées."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            thumb.save(disk_path, compress_level=1)
+            files = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.png')]
+            if len(files) > self.max_files:
+                files.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in files[:len(files) - self.max_files]:
+                    os.remove(entry.path)
+        except OSError:
+            pass  # Le cache disque est facultatif
+
+    def clear(self):
+        """Vide le cache en mémoire."""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,176 @@
+# DATA-GHOST - Recherche rapide de données cachées dans une arborescence d'images
+# Seules les premières lignes de chaque image sont lues ; un index sur disque évite de relire les fichiers inchangés
+
+import hashlib  # Pour l'empreinte des clés
+import json  # Pour l'index et les rapports JSONL
+import os  # Pour les dates de modification
+import time  # Pour la mesure des durées
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # Pour le pool de processus
+from typing import Dict, Iterable, Iterator, List, Optional  # Pour le typage
+
+from .batch import iter_images
+from .detect import probe, score_candidates
+from .jobs import atomic_output, checkpoint
+
+# Constantes
+SUSPECT_SCORE = 0.45  # Score à partir duquel une profondeur est signalée (texte presque entièrement imprimable)
+SUSPECT_TEXT = 16  # Longueur minimale d'un texte signalé sans en-tête (quelques caractères naissent du hasard)
+SCAN_CHUNK = 16  # Images analysées par tâche envoyée à un processus
+WINDOW = 4  # Tâches en cours par processus (le parcours du répertoire avance au rythme de l'analyse)
+KEY_SALT = b"dataghost-scan-index"  # Sel de l'empreinte des clés enregistrée dans l'index
+KEY_ITERATIONS = 100_000  # Itérations PBKDF2 de l'empreinte (calculée une fois par analyse)
+
+
+def key_fingerprint(key: Optional[str]) -> Optional[str]:
+    """Empreinte d'une clé pour l'index (PBKDF2-HMAC : la clé n'est jamais écrite), ou None sans clé."""
+    if not key:
+        return None
+    return hashlib.pbkdf2_hmac('sha256', key.encode('utf-8'), KEY_SALT, KEY_ITERATIONS, 16).hex()
+
+
+def _stamp(path: str) -> dict:
+    """Identité d'un fichier dans l'index : toute modification l'invalide."""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def probe_file(path: str, key: Optional[str] = None) -> dict:
+    """Évalue chaque profondeur LSB sur les premières lignes d'une image (en-tête valide ou texte plausible)."""
+    start = time.perf_counter()
+    result = _stamp(path)
+    try:
+        candidates = score_candidates(probe(path), key)
+        result['depths'] = [
+            {'lsb': c.lsb, 'score': round(c.score, 4), 'header': c.header is not None,
+             'length': c.header.length if c.header else None, 'reason': c.reason}
+            for c in sorted(candidates, key=lambda c: c.lsb)
+        ]
+        best = candidates[0]
+        result['suspect'] = best.score >= SUSPECT_SCORE and (best.header is not None or best.size >= SUSPECT_TEXT)
+        result['lsb'] = best.lsb if result['suspect'] else None
+        result['status'] = 'ok'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _probe_chunk(task) -> List[dict]:
+    """Analyse une tranche d'images dans un processus du pool."""
+    paths, key = task
+    return [probe_file(path, key) for path in paths]
+
+
+class ScanIndex:
+    """Index JSONL des analyses, complété au fil de l'eau : une analyse interrompue reprend où elle s'est arrêtée."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}  # Chemin absolu -> dernière analyse
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Dernière ligne tronquée par une interruption
+                    self.entries[entry['path']] = entry
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def lookup(self, path: str, key_id: Optional[str] = None) -> Optional[dict]:
+        """Analyse enregistrée d'un fichier, s'il n'a pas changé depuis et qu'elle a été faite avec la même clé.
+
+        `key_id` est l'empreinte de la clé (`key_fingerprint`) ; une entrée sans empreinte enregistrée
+        (index d'une version antérieure) est toujours refaite.
+        """
+        stamp = _stamp(path)
+        entry = self.entries.get(stamp['path'])
+        if entry and entry['mtime_ns'] == stamp['mtime_ns'] and entry['size'] == stamp['size'] \
+                and 'key_id' in entry and entry['key_id'] == key_id:
+            return entry
+        return None
+
+    def add(self, entry: dict):
+        """Enregistre une analyse (ajoutée immédiatement au fichier) ; une erreur de lecture n'est pas gardée."""
+        if entry['status'] == 'error':
+            return  # Erreur peut-être passagère (fichier en cours d'écriture, verrou) : l'image sera relue
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self.entries[entry['path']] = entry
+
+    def compact(self):
+        """Réécrit l'index avec une seule ligne par fichier (la plus récente)."""
+        self.close()
+        with atomic_output(self.path) as partial, open(partial, 'w', encoding='utf-8') as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def _chunks(paths: Iterable[str], index: Optional[ScanIndex], key_id: Optional[str], size: int) -> Iterator[tuple]:
+    """Sépare les fichiers déjà analysés avec la même clé (retournés seuls) des tranches d'images à analyser."""
+    pending = []
+    for path in paths:
+        entry = index.lookup(path, key_id) if index else None
+        if entry is not None:
+            yield entry, None
+            continue
+        pending.append(path)
+        if len(pending) == size:
+            yield None, pending
+            pending = []
+    if pending:
+        yield None, pending
+
+
+def scan_images(root: str, key: Optional[str] = None, workers: Optional[int] = None,
+                index: Optional[ScanIndex] = None, recursive: bool = True, chunk: int = SCAN_CHUNK) -> Iterator[dict]:
+    """Analyse les images d'un répertoire en parallèle et produit les résultats au fur et à mesure.
+
+    Les fichiers inchangés depuis leur analyse dans `index` avec la même clé ne sont pas relus : leur entrée
+    est produite avec `cached` à vrai. L'ordre des résultats est celui de la fin des analyses.
+    """
+    workers = workers or os.cpu_count() or 1
+    key_id = key_fingerprint(key)
+    executor = None  # Démarré à la première image à analyser (aucun processus si tout est dans l'index)
+    running = set()
+
+    def finished(done) -> Iterator[dict]:
+        for future in done:
+            running.discard(future)
+            for entry in future.result():
+                entry['key_id'] = key_id
+                if index:
+                    index.add(entry)
+                yield {**entry, 'cached': False}
+
+    try:
+        for cached, paths in _chunks(iter_images(root, recursive), index, key_id, chunk):
+            checkpoint()
+            if cached is not None:
+                yield {**cached, 'cached': True}
+                continue
+            executor = executor or ProcessPoolExecutor(max_workers=workers)
+            running.add(executor.submit(_probe_chunk, (paths, key)))
+            if len(running) >= workers * WINDOW:
+                yield from finished(wait(running, return_when=FIRST_COMPLETED).done)
+        while running:
+            checkpoint()
+            yield from finished(wait(running, return_when=FIRST_COMPLETED).done)
+    finally:
+        if executor:
+            # Interruption : les tranches en attente sont abandonnées, seules celles en cours sont attendues
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,170 @@
+# DATA-GHOST - Dispersion des données sur des pixels choisis par la clé
+# Seules les positions réellement utilisées sont calculées : le coût dépend de la taille des données, pas de l'image
+
+import hashlib  # Pour les clés de tour
+import hmac  # Pour la clé de dispersion
+from typing import Callable, Iterator, Optional  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+
+from .engine import CHUNK_SIZE, _check_lsb, bytes_to_groups, channels_needed, groups_to_bytes
+from .jobs import checkpoint
+
+# Constantes
+ROUNDS = 6  # Tours du réseau de Feistel
+SCATTER_LABEL = b"dataghost-scatter"  # Contexte de la clé de dispersion (distincte de la clé AES)
+
+# Constantes de mélange 64 bits (finaliseur splitmix64)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def scatter_key(aes_key: bytes) -> bytes:
+    """Clé de dispersion dérivée de la clé de chiffrement."""
+    return hmac.new(aes_key, SCATTER_LABEL, hashlib.sha256).digest()
+
+
+class KeyedPermutation:
+    """Permutation pseudo-aléatoire de [0, n) dérivée d'une clé.
+
+    Réseau de Feistel équilibré sur le plus petit domaine 2^2h couvrant n, ramené dans [0, n)
+    par itération (cycle-walking) : chaque indice est calculé indépendamment, sans table.
+    """
+
+    def __init__(self, key: bytes, n: int):
+        if n < 1:
+            raise ValueError("Domaine de permutation vide")
+        self.n = n
+        bits = max(2, (n - 1).bit_length())
+        self.half = np.uint64((bits + 1) // 2)
+        self.mask = np.uint64((1 << int(self.half)) - 1)
+        digest = hashlib.sha512(key + n.to_bytes(8, 'big')).digest()
+        self.keys = np.frombuffer(digest[:8 * ROUNDS], dtype='>u8').astype(np.uint64)
+
+    def _round(self, x: np.ndarray, key: np.uint64) -> np.ndarray:
+        z = (x ^ key) * _MIX1
+        z = (z ^ (z >> np.uint64(31))) * _MIX2
+        return (z ^ (z >> np.uint64(29))) & self.mask
+
+    def _encrypt(self, x: np.ndarray) -> np.ndarray:
+        left, right = x >> self.half, x & self.mask
+        for key in self.keys:
+            left, right = right, left ^ self._round(right, key)
+        return (left << self.half) | right
+
+    def __call__(self, indices: np.ndarray) -> np.ndarray:
+        """Images des indices (tableau d'entiers de [0, n))."""
+        x = self._encrypt(np.asarray(indices, dtype=np.uint64))
+        outside = x >= self.n
+        # Le domaine couvre moins de 4n valeurs : quelques itérations suffisent
+        while outside.any():
+            x[outside] = self._encrypt(x[outside])
+            outside = x >= self.n
+        return x.astype(np.int64)
+
+
+def scatter_domain(view: np.ndarray, start: int) -> tuple:
+    """Premier pixel et nombre de pixels disponibles après la composante `start` (alignée sur un pixel)."""
+    first = -(-start // view.shape[1])
+    return first, len(view) - first
+
+
+def _pixels(permutation: KeyedPermutation, first: int, index: int, count: int) -> np.ndarray:
+    """Pixels recevant les groupes des pixels logiques [index, index + count)."""
+    return first + permutation(np.arange(index, index + count, dtype=np.uint64))
+
+
+def _step(lsb: int, channels: int) -> int:
+    """Tranche de données alignée sur des pixels entiers (8 pixels = composantes x lsb octets)."""
+    unit = channels * lsb
+    return CHUNK_SIZE - CHUNK_SIZE % unit
+
+
+def scatter_bytes(view: np.ndarray, data: bytes, lsb: int, permutation: KeyedPermutation, first: int,
+                  index: int = 0, progress: Optional[Callable[[float], None]] = None) -> int:
+    """Insère les octets sur les pixels désignés par la permutation, à partir du pixel logique `index`.
+
+    `index` doit correspondre à un multiple de composantes x lsb octets déjà écrits ;
+    retourne le pixel logique suivant.
+    """
+    _check_lsb(lsb)
+    channels = view.shape[1]
+    needed = -(-channels_needed(len(data), lsb) // channels)
+    if index + needed > permutation.n:
+        raise ValueError(
+            f"Capacité insuffisante: {len(data)} octets pour "
+            f"{(permutation.n - index) * channels * lsb // 8} octets disponibles"
+        )
+
+    keep = np.uint8(0xFF ^ ((1 << lsb) - 1))
+    step = _step(lsb, channels)
+    for offset in range(0, len(data), step):
+        checkpoint()
+        groups = bytes_to_groups(data[offset:offset + step], lsb)
+        count = -(-len(groups) // channels)
+        pixels = _pixels(permutation, first, index, count)
+
+        # Rassemble les pixels visés, remplace leurs bits de poids faible puis les réécrit
+        block = view[pixels]
+        flat = block.reshape(-1)
+        flat[:len(groups)] = (flat[:len(groups)] & keep) | groups
+        view[pixels] = block
+        index += count
+        if progress:
+            progress(min((offset + step) / len(data), 1.0))
+    return index
+
+
+def gather_bytes(view: np.ndarray, lsb: int, permutation: KeyedPermutation, first: int, size: int,
+                 progress: Optional[Callable[[float], None]] = None) -> Iterator[bytes]:
+    """Extrait tranche par tranche `size` octets dispersés sur les pixels désignés par la permutation."""
+    _check_lsb(lsb)
+    channels = view.shape[1]
+    available = permutation.n * channels * lsb // 8
+    if size > available:
+        raise ValueError(f"Lecture impossible: {size} octets demandés, {available} disponibles")
+
+    mask = np.uint8((1 << lsb) - 1)
+    step = _step(lsb, channels)
+    index = 0
+    for offset in range(0, size, step):
+        checkpoint()
+        count = min(step, size - offset)
+        groups = channels_needed(count, lsb)
+        pixels = _pixels(permutation, first, index, -(-groups // channels))
+        values = view[pixels].reshape(-1)[:groups] & mask
+        index += len(pixels)
+        yield groups_to_bytes(values, lsb)[:count]
+        if progress:
+            progress(min((offset + step) / size, 1.0))
+
+
+class ScatterWriter:
+    """Équivalent dispersé de `ChannelWriter` : insère un flux reçu par morceaux sur des pixels choisis par la clé."""
+
+    def __init__(self, view: np.ndarray, lsb: int, key: bytes, start: int = 0):
+        _check_lsb(lsb)
+        self.view = view
+        self.lsb = lsb
+        self.first, pixels = scatter_domain(view, start)
+        self.permutation = KeyedPermutation(key, max(pixels, 1))
+        self.index = 0  # Pixel logique qui recevra le prochain groupe
+        self.written = 0  # Octets reçus
+        self._unit = view.shape[1] * lsb  # Octets remplissant exactement 8 pixels
+        self._carry = b""  # Octets en attente d'un bloc complet
+
+    def write(self, data: bytes):
+        """Insère les blocs complets et garde le reste pour l'écriture suivante."""
+        self.written += len(data)
+        data = self._carry + bytes(data)
+        aligned = len(data) - len(data) % self._unit
+        self._carry = data[aligned:]
+        if aligned:
+            self.index = scatter_bytes(self.view, data[:aligned], self.lsb, self.permutation, self.first, self.index)
+
+    def close(self) -> int:
+        """Insère les derniers octets ; retourne le nombre de pixels modifiés."""
+        if self._carry:
+            self.index = scatter_bytes(self.view, self._carry, self.lsb, self.permutation, self.first, self.index)
+            self._carry = b""
+        return self.index
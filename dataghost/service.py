@@ -0,0 +1,432 @@
+# DATA-GHOST - Service local : insertion, extraction, sondage et capacité servis par un processus résident
+# Les modules sont importés une fois et les porteurs récents restent décodés : une requête ne paie que son traitement
+
+import base64  # Pour les données binaires dans le JSON
+import hmac  # Pour comparer le jeton en temps constant
+import http.client  # Pour le client du service
+import json  # Pour les requêtes et réponses
+import os  # Pour les fichiers et la socket Unix
+import secrets  # Pour le jeton de lancement
+import socket  # Pour la connexion par socket Unix
+import socketserver  # Pour le serveur sur socket Unix
+import threading  # Pour le cache et la file bornée
+import time  # Pour la durée des requêtes
+from collections import OrderedDict  # Pour le cache LRU
+from concurrent.futures import ThreadPoolExecutor  # Pour le pool de travail
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Pour le protocole HTTP
+from typing import Callable, Dict, Optional, Tuple  # Pour le typage
+
+from PIL import Image  # Pour le décodage des porteurs
+
+from .api import carrier_capacity, embed, extract, prepare_payload
+from .container import embed_payload, extract_payload
+from .detect import detect_lsb
+from .engine import carrier_image
+from .frames import is_multiframe
+from .jobs import JOB_WORKERS, atomic_output
+from .metrics import collect
+from .output import OutputOptions
+from .stream import is_raw
+
+# Constantes
+DEFAULT_HOST = "127.0.0.1"  # Écoute locale uniquement : les clés transitent en clair dans les requêtes
+DEFAULT_PORT = 8765  # Port TCP par défaut
+SERVICE_WORKERS = JOB_WORKERS  # Requêtes traitées simultanément
+MAX_PENDING = 4 * SERVICE_WORKERS  # Requêtes acceptées (en cours + en attente) ; au-delà : 503
+CACHE_BYTES = 512 << 20  # Mémoire des porteurs décodés gardés en cache
+MAX_BODY = 64 << 20  # Taille maximale d'une requête
+TOKEN_HEADER = "X-DataGhost-Token"  # En-tête portant le jeton du service
+TOKEN_ENV = "DATAGHOST_TOKEN"  # Variable d'environnement du jeton (fixé au lancement, lu par le client)
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "[::1]")  # Noms admis dans l'en-tête Host, avec le port d'écoute
+
+
+class ServiceBusy(Exception):
+    """File du service pleine : la requête doit être renvoyée plus tard."""
+
+
+class CarrierCache:
+    """Cache LRU des porteurs décodés, borné en octets, indexé par (chemin, date de modification, taille)."""
+
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes  # Mémoire maximale (0: cache désactivé)
+        self.size = 0  # Mémoire utilisée
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # Clé -> image décodée
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: str) -> tuple:
+        """Clé d'un porteur : toute modification du fichier l'invalide."""
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str) -> Image.Image:
+        """Retourne l'image décodée (à ne pas modifier), en la décodant au besoin."""
+        key = self.key(path)
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        # Le décodage a lieu hors du verrou pour ne pas bloquer les autres requêtes
+        with Image.open(path) as opened:
+            img = carrier_image(opened).copy()
+        cost = img.width * img.height * len(img.getbands())
+        with self._lock:
+            if cost <= self.max_bytes and key not in self._entries:
+                self._entries[key] = img
+                self.size += cost
+                while self.size > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self.size -= old.width * old.height * len(old.getbands())
+        return img
+
+    def clear(self):
+        """Oublie tous les porteurs."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """Entrées, mémoire utilisée et taux de succès."""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.size, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+def _decoded(service: "GhostService", path: str) -> Optional[Image.Image]:
+    """Porteur décodé en cache ; None pour un fichier non compressé (lu par projection) ou à plusieurs images."""
+    return None if is_raw(path) or is_multiframe(path) else service.cache.get(path)
+
+
+def _payload(service: "GhostService", params: dict) -> bytes:
+    """Données à cacher : `data` (base64), `message` (texte) ou `source` (fichier sous la racine du service)."""
+    if params.get('source'):
+        with open(service.resolve(params['source']), 'rb') as f:
+            return f.read()
+    if params.get('message') is not None:
+        return params['message'].encode('utf-8')
+    return base64.b64decode(params.get('data', ''))
+
+
+def op_embed(service: "GhostService", params: dict) -> dict:
+    """Cache des données dans `carrier` et enregistre `output`."""
+    data = _payload(service, params)
+    carrier, output = service.resolve(params['carrier']), service.resolve(params['output'])
+    encoder = OutputOptions(params.get('profile', 'balanced'), params.get('png_level'), params.get('png_strategy'),
+                            bool(params.get('verify')))
+    embed(carrier, data, output, params.get('lsb', 1), params.get('key'),
+          compression=params.get('compression'), level=params.get('level', 6), scatter=bool(params.get('scatter')),
+          channels=params.get('channels'), encoder=encoder, image=_decoded(service, carrier))
+    return {'bytes': len(data), 'output': params['output']}
+
+
+def op_extract(service: "GhostService", params: dict) -> dict:
+    """Extrait les données de `path` (retournées en base64, ou écrites dans `output`)."""
+    path = service.resolve(params['path'])
+    extraction = extract(path, params.get('lsb', 1), params.get('key'), image=_decoded(service, path))
+    result = {'bytes': len(extraction.data), 'header': extraction.header is not None,
+              'decrypted': extraction.decrypted, 'lsb': extraction.lsb}
+    if params.get('output'):
+        with atomic_output(service.resolve(params['output'])) as partial, open(partial, 'wb') as f:
+            f.write(extraction.data)
+        result['output'] = params['output']
+    else:
+        result['data'] = base64.b64encode(extraction.data).decode('ascii')
+    return result
+
+
+def op_probe(service: "GhostService", params: dict) -> dict:
+    """Classe les profondeurs LSB possibles de `path` (premières lignes seulement)."""
+    candidates = detect_lsb(service.resolve(params['path']), params.get('key'))
+    return {'candidates': [
+        {'lsb': c.lsb, 'score': round(c.score, 4), 'reason': c.reason,
+         'length': c.header.length if c.header else None} for c in candidates
+    ]}
+
+
+def op_capacity(service: "GhostService", params: dict) -> dict:
+    """Octets que peut recevoir `path`, en-tête déduit (lecture de l'en-tête du fichier uniquement)."""
+    path = service.resolve(params['path'])
+    return {'capacity': carrier_capacity(path, params.get('lsb', 1), params.get('channels'))}
+
+
+OPERATIONS: Dict[str, Callable[["GhostService", dict], dict]] = {
+    "embed": op_embed,
+    "extract": op_extract,
+    "probe": op_probe,
+    "capacity": op_capacity,
+}
+
+
+def _warm():
+    """Exerce une fois le chemin complet (compression, insertion, extraction) sur une image minuscule."""
+    data, flags, fields = prepare_payload(b"warm", compression="zlib")
+    extract_payload(embed_payload(Image.new('RGB', (16, 16)), data, 1, flags, **fields), 1)
+
+
+class GhostService:
+    """Pool de travail borné, précédé d'une file limitée : une requête en trop est refusée, pas mise en attente.
+
+    Les chemins reçus sont lus relativement à `root` et ne peuvent pas en sortir ; `token`, s'il est fixé,
+    doit accompagner chaque requête (en-tête X-DataGhost-Token).
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, max_pending: int = MAX_PENDING,
+                 cache_bytes: int = CACHE_BYTES, root: Optional[str] = None, token: Optional[str] = None):
+        self.root = os.path.realpath(root or os.getcwd())  # Dossier hors duquel aucun fichier n'est lu ni écrit
+        self.token = token  # Jeton exigé des clients (None: aucun, socket Unix réservée au propriétaire)
+        self.workers = workers  # Requêtes traitées simultanément
+        self.max_pending = max(workers, max_pending)  # Requêtes acceptées en même temps
+        self.cache = CarrierCache(cache_bytes)
+        self.served = self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dataghost")
+
+    def resolve(self, path: str) -> str:
+        """Chemin réel de `path` (relatif à la racine) ; PermissionError s'il sort de la racine."""
+        real = os.path.realpath(os.path.join(self.root, path))
+        if os.path.commonpath((real, self.root)) != self.root:
+            raise PermissionError(f"Chemin hors de la racine du service: {path}")
+        return real
+
+    def warm(self):
+        """Exerce une fois chaque étape dans le pool, avant la première requête."""
+        self._executor.submit(_warm).result()
+
+    def run(self, operation: str, params: dict) -> dict:
+        """Exécute une opération dans le pool ; ServiceBusy si la file est pleine."""
+        func = OPERATIONS.get(operation)
+        if func is None:
+            raise KeyError(operation)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise ServiceBusy(f"Service saturé ({self._pending} requêtes en cours)")
+            self._pending += 1
+        try:
+            return self._executor.submit(self._timed, func, params).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.served += 1
+
+    def _timed(self, func: Callable[["GhostService", dict], dict], params: dict) -> dict:
+        """Exécute une opération en mesurant sa durée et celle de chaque étape."""
+        start = time.perf_counter()
+        with collect() as metrics:
+            result = func(self, params)
+        result['seconds'] = round(time.perf_counter() - start, 4)
+        result['stages'] = metrics.report()['stages']
+        return result
+
+    def status(self) -> dict:
+        """État du pool, de la file et du cache."""
+        with self._lock:
+            queue = {'workers': self.workers, 'pending': self._pending, 'max_pending': self.max_pending,
+                     'served': self.served, 'rejected': self.rejected}
+        return {**queue, 'cache': self.cache.stats()}
+
+    def shutdown(self):
+        """Arrête le pool après les requêtes en cours."""
+        self._executor.shutdown(wait=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Requêtes JSON : `POST /<opération>` et `GET /status`."""
+
+    # Connexions persistantes : un client peut enchaîner ses requêtes sans attendre les réponses (pipelining)
+    protocol_version = "HTTP/1.1"
+    server_version = "DataGhost"
+
+    def _reply(self, code: int, payload: dict, headers: Tuple[Tuple[str, str], ...] = ()):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _refusal(self, post: bool) -> Optional[Tuple[int, str]]:
+        """Code et motif du refus d'une requête qui ne vient pas d'un client local légitime ; None si elle est admise.
+
+        Une page web peut viser le service (formulaire text/plain, rebond DNS) : elle envoie un en-tête Origin,
+        un Host qui n'est pas celui d'écoute et ne connaît pas le jeton.
+        """
+        if self.headers.get("Origin") is not None:
+            return 403, "Requête issue d'une page web refusée"
+        hosts = self.server.hosts
+        if hosts is not None and (self.headers.get("Host") or "").lower() not in hosts:
+            return 421, f"Hôte inattendu: {self.headers.get('Host')}"
+        token = self.server.service.token
+        if token and not hmac.compare_digest((self.headers.get(TOKEN_HEADER) or "").encode(), token.encode()):
+            return 401, "Jeton du service absent ou invalide"
+        if post and self.headers.get_content_type() != "application/json":
+            return 415, "Type de contenu attendu: application/json"
+        return None
+
+    def _refuse(self, post: bool) -> bool:
+        """Répond au refus éventuel (et ferme la connexion, le corps n'étant pas lu) ; True si la requête est refusée."""
+        refusal = self._refusal(post)
+        if refusal is None:
+            return False
+        self.close_connection = True
+        self._reply(refusal[0], {'error': refusal[1]})
+        return True
+
+    def do_GET(self):
+        if self._refuse(False):
+            return
+        if self.path.rstrip("/") == "/status":
+            self._reply(200, self.server.service.status())
+        else:
+            self._reply(404, {'error': f"Ressource inconnue: {self.path}"})
+
+    def do_POST(self):
+        if self._refuse(True):
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self.close_connection = True
+            self._reply(413, {'error': f"Requête trop volumineuse ({length} octets)"})
+            return
+        body = self.rfile.read(length)  # Lue en entier même en cas d'erreur : la requête suivante reste alignée
+        operation = self.path.strip("/")
+        if operation not in OPERATIONS:
+            self._reply(404, {'error': f"Opération inconnue: {operation}"})
+            return
+        try:
+            params = json.loads(body or b"{}")
+            self._reply(200, self.server.service.run(operation, params))
+        except ServiceBusy as e:
+            self._reply(503, {'error': str(e)}, (("Retry-After", "1"),))
+        except KeyError as e:
+            self._reply(400, {'error': f"Paramètre manquant: {e}"})
+        except PermissionError as e:
+            self._reply(403, {'error': str(e)})
+        except (OSError, ValueError, TypeError) as e:
+            self._reply(400, {'error': f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+
+    def log_message(self, format, *args):
+        pass  # Pas de journal par requête : il coûterait plus que les petites opérations
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def make_server(service: GhostService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                socket_path: Optional[str] = None) -> socketserver.BaseServer:
+    """Crée le serveur HTTP du service, sur un port local ou une socket Unix (accessible au seul propriétaire).
+
+    Sur un port, l'en-tête Host doit nommer l'adresse d'écoute (ou localhost) et son port.
+    """
+    if socket_path:
+        if not hasattr(socketserver, "UnixStreamServer"):
+            raise ValueError("Socket Unix indisponible sur ce système : utilisez un port local")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = _UnixServer(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+        server.hosts = None  # Inaccessible à un navigateur : pas de Host à vérifier
+    else:
+        server = _TCPServer((host, port), _Handler)
+        port = server.server_address[1]  # Port effectif (0: choisi par le système)
+        server.hosts = {f"{name}:{port}".lower() for name in (host, *LOCAL_HOSTS)}
+    server.service = service
+    return server
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+          workers: int = SERVICE_WORKERS, max_pending: int = MAX_PENDING, cache_bytes: int = CACHE_BYTES,
+          ready: Optional[Callable[[socketserver.BaseServer], None]] = None, root: Optional[str] = None,
+          token: Optional[str] = None):
+    """Démarre le service et traite les requêtes jusqu'à l'interruption.
+
+    Sans jeton fourni (argument ou variable DATAGHOST_TOKEN), un jeton est tiré à chaque lancement sur un port ;
+    la socket Unix, réservée au propriétaire, s'en passe.
+    """
+    token = token or os.environ.get(TOKEN_ENV) or (None if socket_path else secrets.token_urlsafe(24))
+    service = GhostService(workers, max_pending, cache_bytes, root, token)
+    service.warm()
+    server = make_server(service, host, port, socket_path)
+    if ready:
+        ready(server)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    """Connexion HTTP sur une socket Unix."""
+
+    def __init__(self, socket_path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class ServiceClient:
+    """Client du service local, sur une connexion persistante (jeton par défaut : variable DATAGHOST_TOKEN)."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+                 timeout: Optional[float] = None, token: Optional[str] = None):
+        self.token = token or os.environ.get(TOKEN_ENV)
+        if socket_path:
+            self._connection = _UnixConnection(socket_path, timeout)
+        else:
+            self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, method: str, path: str, params: Optional[dict] = None) -> dict:
+        body = json.dumps(params).encode('utf-8') if params is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if self.token:
+            headers[TOKEN_HEADER] = self.token
+        self._connection.request(method, path, body, headers)
+        response = self._connection.getresponse()
+        payload = json.loads(response.read() or b"{}")
+        if response.status == 503:
+            raise ServiceBusy(payload.get('error', "Service saturé"))
+        if response.status != 200:
+            raise ValueError(payload.get('error', f"Erreur HTTP {response.status}"))
+        return payload
+
+    def call(self, operation: str, **params) -> dict:
+        """Exécute une opération (embed, extract, probe, capacity) et retourne sa réponse."""
+        return self._request("POST", f"/{operation}", params)
+
+    def status(self) -> dict:
+        """État du service."""
+        return self._request("GET", "/status")
+
+    def close(self):
+        self._connection.close()
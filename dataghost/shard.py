@@ -0,0 +1,110 @@
+# DATA-GHOST - Répartition d'une charge sur plusieurs images porteuses
+# Chaque image reçoit un fragment indexé ; les fragments sont écrits et relus en parallèle
+
+import os  # Pour l'identifiant de session et le nombre de cœurs
+from concurrent.futures import ProcessPoolExecutor  # Pour le pool de processus
+from dataclasses import dataclass, field  # Pour créer des classes de données
+from typing import List, Optional, Sequence  # Pour le typage
+
+from PIL import Image  # Pour la lecture des dimensions
+
+from .api import prepare_payload, read_carrier, unpack_payload, write_carrier
+from .compress import DEFAULT_LEVEL
+from .container import FLAG_SHARD, payload_capacity
+from .output import OutputOptions
+from .planner import split_sizes
+
+# Constantes
+MAX_SHARDS = 0xFFFF  # Nombre maximal de fragments (champ 16 bits de l'en-tête)
+
+
+# Classe pour stocker le résultat d'un réassemblage
+@dataclass
+class Reassembly:
+    session: str  # Identifiant de session (hexadécimal)
+    count: int  # Nombre de fragments attendus
+    found: List[int] = field(default_factory=list)  # Fragments retrouvés
+    missing: List[int] = field(default_factory=list)  # Fragments manquants
+    data: Optional[bytes] = None  # Données reconstituées (None si incomplètes)
+    decrypted: bool = False  # Si les données ont été déchiffrées
+    errors: dict = field(default_factory=dict)  # Images illisibles -> erreur
+
+
+def _embed_shard(task) -> str:
+    """Écrit un fragment dans son image (exécuté dans un processus du pool)."""
+    carrier, chunk, output, lsb, flags, fields, strip_budget, encoder = task
+    write_carrier(carrier, chunk, output, lsb, flags, strip_budget=strip_budget, encoder=encoder, **fields)
+    return output
+
+
+def shard_embed(carriers: Sequence[str], data: bytes, outputs: Sequence[str], lsb: int = 1,
+                key: Optional[str] = None, workers: Optional[int] = None,
+                strip_budget: Optional[int] = None, compression: Optional[str] = None,
+                level: int = DEFAULT_LEVEL, encoder: Optional[OutputOptions] = None) -> str:
+    """Répartit les données sur plusieurs images et retourne l'identifiant de session."""
+    if len(carriers) != len(outputs):
+        raise ValueError("Il faut une image de sortie par image porteuse")
+    if not 0 < len(carriers) <= MAX_SHARDS:
+        raise ValueError(f"Nombre d'images porteuses invalide: {len(carriers)}")
+
+    # La compression et le chiffrement portent sur la charge entière, avant le découpage
+    data, flags, payload_fields = prepare_payload(data, key, compression=compression, level=level)
+    flags |= FLAG_SHARD
+
+    capacities = []
+    for path in carriers:
+        with Image.open(path) as img:
+            capacities.append(payload_capacity(img.width, img.height, lsb, flags, img.mode))
+    sizes = split_sizes(len(data), capacities)
+
+    session = os.urandom(8)
+    tasks, offset = [], 0
+    for index, (carrier, output, size) in enumerate(zip(carriers, outputs, sizes)):
+        fields = {'session': session, 'shard_index': index, 'shard_count': len(carriers), **payload_fields}
+        tasks.append((carrier, data[offset:offset + size], output, lsb, flags, fields, strip_budget, encoder))
+        offset += size
+
+    with ProcessPoolExecutor(max_workers=workers or min(len(tasks), os.cpu_count() or 1) or 1) as executor:
+        list(executor.map(_embed_shard, tasks))
+    return session.hex()
+
+
+def _read_shard(task):
+    """Lit le fragment d'une image (exécuté dans un processus du pool)."""
+    path, lsb, key, strip_budget = task
+    try:
+        header, data, lsb = read_carrier(path, lsb, key, strip_budget=strip_budget)
+        return path, header, data, None
+    except Exception as e:
+        return path, None, b"", f"{type(e).__name__}: {e}"
+
+
+def shard_extract(paths: Sequence[str], lsb: Optional[int] = 1, key: Optional[str] = None,
+                  workers: Optional[int] = None, strip_budget: Optional[int] = None) -> Reassembly:
+    """Relit en parallèle des images fournies dans n'importe quel ordre et reconstitue la charge."""
+    sessions, errors = {}, {}
+    tasks = [(path, lsb, key, strip_budget) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers or min(len(tasks), os.cpu_count() or 1) or 1) as executor:
+        for path, header, data, error in executor.map(_read_shard, tasks):
+            if error:
+                errors[path] = error
+            elif header is None or not header.sharded:
+                errors[path] = "Aucun fragment trouvé"
+            else:
+                sessions.setdefault(header.session, {})[header.shard_index] = (header, data)
+
+    if not sessions:
+        raise ValueError("Aucun fragment trouvé dans les images fournies")
+
+    # Retient la session la mieux représentée
+    session, shards = max(sessions.items(), key=lambda item: len(item[1]))
+    first = next(iter(shards.values()))[0]
+    result = Reassembly(session=session.hex(), count=first.shard_count, errors=errors)
+    result.found = sorted(shards)
+    result.missing = [i for i in range(first.shard_count) if i not in shards]
+    if result.missing:
+        return result
+
+    data = b"".join(shards[i][1] for i in range(first.shard_count))
+    result.data, result.decrypted = unpack_payload(key, data, first), first.encrypted
+    return result
@@ -0,0 +1,463 @@
+# DATA-GHOST - Traitement par bandes horizontales pour les images plus grandes que la mémoire
+# Seules les lignes couvertes par l'en-tête et les données sont lues (et réécrites)
+# Les fichiers non compressés sont projetés en mémoire (mmap) : les lignes sont modifiées en place
+
+import mmap  # Pour projeter les pixels des fichiers non compressés
+import re  # Pour la validation des modes bruts
+import shutil  # Pour la copie du fichier porteur
+import struct  # Pour les blocs d'un fichier PNG
+import sys  # Pour détecter Linux (clonage de fichier)
+from dataclasses import dataclass  # Pour créer des classes de données
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union  # Pour le typage
+
+import numpy as np  # Pour les opérations vectorisées
+from PIL import Image  # Pour la manipulation d'images
+
+try:
+    import fcntl  # Clonage de fichier par ioctl (Unix uniquement)
+except ImportError:
+    fcntl = None
+
+from .container import HEADER_MAX_SIZE, Header, payload_start, read_header
+from .jobs import atomic_output, checkpoint
+from .metrics import stage
+from .engine import (
+    CHANNELS, CHUNK_SIZE, GroupReader, base_channels, carrier_image, carrier_mode, channel_view, channels_needed, groups_to_bytes,
+    load_groups, store_groups, stream_groups,
+)
+
+# Constantes
+DEFAULT_STRIP_BUDGET = 64 << 20  # Mémoire allouée à une bande (octets)
+PREFIX_CODECS = ('raw', 'zip')  # Décodeurs séquentiels capables de s'arrêter après les premières lignes
+PREFIX_READ = 64 << 10  # Octets compressés lus avant un premier essai de décodage (doublés à chaque essai)
+MAX_PIXEL_BYTES = 8  # Taille maximale d'un pixel brut (RGBA 16 bits), pour borner la lecture des lignes
+_RAWMODE = re.compile(r"^[RGBAX]+$")  # Modes bruts 8 bits par composante
+FICLONE = 0x40049409  # ioctl Linux : copie sur écriture (Btrfs, XFS)
+
+
+class Unstreamable(ValueError):
+    """Données illisibles bande par bande (dispersion, jeu de composantes) : l'image doit être décodée."""
+
+
+# Classe pour décrire une bande de lignes stockée telle quelle dans le fichier
+@dataclass
+class RawStrip:
+    top: int  # Première ligne
+    bottom: int  # Ligne suivant la dernière
+    offset: int  # Position dans le fichier
+    bottom_up: bool = False  # Lignes stockées de bas en haut (BMP)
+
+
+# Classe pour décrire l'organisation des pixels d'un fichier non compressé
+@dataclass
+class RawLayout:
+    stride: int  # Taille d'une ligne dans le fichier (remplissage compris)
+    pixel_size: int  # Taille d'un pixel en octets
+    order: Tuple[int, ...]  # Position des composantes R, G, B dans un pixel
+    strips: List[RawStrip]  # Bandes de lignes
+    alpha: Optional[int] = None  # Position de la composante A dans un pixel (None : pas de transparence)
+
+
+def raw_layout(img: Image.Image) -> Optional[RawLayout]:
+    """Décrit l'organisation brute des pixels (BMP, PPM, TIFF non compressé), ou None."""
+    if img.mode not in ('RGB', 'RGBA'):
+        return None
+
+    layout = None
+    for codec, extents, offset, args in (tuple(tile)[:4] for tile in img.tile):
+        args = args if isinstance(args, tuple) else (args,)
+        rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+        left, top, right, bottom = extents
+        if codec != 'raw' or left != 0 or right != img.width:
+            return None
+        if not _RAWMODE.match(rawmode) or not all(c in rawmode for c in "RGB"):
+            return None
+
+        stride = stride or img.width * len(rawmode)
+        if layout is None:
+            order = tuple(rawmode.index(c) for c in "RGB")
+            alpha = rawmode.index('A') if 'A' in rawmode else None
+            layout = RawLayout(stride=stride, pixel_size=len(rawmode), order=order, strips=[], alpha=alpha)
+        elif (stride, len(rawmode)) != (layout.stride, layout.pixel_size):
+            return None
+        strip = RawStrip(top, bottom, offset, orientation < 0)
+        last = layout.strips[-1] if layout.strips else None
+        if last and not last.bottom_up and not strip.bottom_up and last.bottom == top \
+                and last.offset + (top - last.top) * stride == offset:
+            # Bandes TIFF consécutives dans le fichier : une seule projection les couvre
+            last.bottom = bottom
+        else:
+            layout.strips.append(strip)
+    return layout
+
+
+def prefix_image(path: str, rows: int) -> Optional[Image.Image]:
+    """Décode les `rows` premières lignes à partir des seuls octets qui les portent, ou retourne None.
+
+    Seuls les octets du fichier sont lus ici : le décodeur de Pillow est appelé par `Image.frombytes`
+    sur des lignes brutes stockées de haut en bas, ou sur le flux zlib des blocs IDAT d'un PNG non entrelacé.
+    """
+    with Image.open(path) as img:
+        if len(img.tile) != 1 or img.info.get('interlace') or rows >= img.height:
+            return None
+        codec, extents, offset, args = tuple(img.tile[0])[:4]
+        args = args if isinstance(args, tuple) else (args,)
+        if codec not in PREFIX_CODECS or tuple(extents) != (0, 0, img.width, img.height):
+            return None
+        if codec == 'raw' and len(args) > 2 and args[2] < 0:
+            return None  # Lignes stockées de bas en haut (BMP) : les premières lues seraient celles du bas
+        mode, size, palette = img.mode, (img.width, rows), img.palette
+
+    with open(path, 'rb') as f:
+        if codec == 'raw':
+            f.seek(offset)
+            stride = args[1] if len(args) > 1 and args[1] else img.width * MAX_PIXEL_BYTES
+            prefix = _decoded(mode, size, f.read(rows * stride), codec, args)
+        else:
+            prefix = _decoded_idat(f, offset, mode, size, args)
+    if prefix is not None and palette is not None and mode in ('P', 'PA'):
+        prefix.putpalette(palette)
+    return prefix
+
+
+def _decoded(mode: str, size: Tuple[int, int], data: bytes, codec: str, args: tuple) -> Optional[Image.Image]:
+    """Image décodée, ou None si les octets ne suffisent pas à remplir ses lignes."""
+    try:
+        return Image.frombytes(mode, size, data, codec, *args)
+    except ValueError:
+        return None
+
+
+def _decoded_idat(f, offset: int, mode: str, size: Tuple[int, int], args: tuple) -> Optional[Image.Image]:
+    """Premières lignes d'un PNG : les blocs IDAT sont lus jusqu'à ce que le flux zlib les couvre."""
+    compressed, target = bytearray(), PREFIX_READ
+    f.seek(offset - 8)  # Le décodage commence aux données du premier bloc IDAT, précédées de sa taille et son type
+    while True:
+        chunk = f.read(8)
+        length, kind = struct.unpack(">I4s", chunk) if len(chunk) == 8 else (0, b"")
+        if kind == b"IDAT":
+            compressed += f.read(length)
+            f.seek(4, 1)  # CRC
+        if kind != b"IDAT" or len(compressed) >= target:
+            image = _decoded(mode, size, bytes(compressed), 'zip', args)
+            if image is not None or kind != b"IDAT":
+                return image
+            target *= 2
+
+
+def is_raw(path: str) -> bool:
+    """Vrai si les pixels du fichier sont stockés sans compression (lecture de l'en-tête uniquement)."""
+    with Image.open(path) as img:
+        return raw_layout(img) is not None
+
+
+def clone_file(source: str, target: str):
+    """Copie un fichier en partageant ses blocs (copie sur écriture) quand le système de fichiers le permet."""
+    if fcntl and sys.platform.startswith('linux'):
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass  # Ext4, tmpfs, autre volume : copie classique
+    shutil.copyfile(source, target)
+
+
+class StripReader:
+    """Lit une image par bandes de lignes sans la décoder entièrement.
+
+    Un fichier non compressé est projeté en mémoire : les blocs lus sont des vues sur le fichier,
+    modifiables en place avec `writable`.
+    """
+
+    def __init__(self, path: str, budget: int = DEFAULT_STRIP_BUDGET, writable: bool = False):
+        self.path = path
+        self.img = Image.open(path)
+        self.width, self.height = self.img.size
+        self.layout = raw_layout(self.img)
+        self.writable = writable
+        self._file = self._map = None
+        if self.layout:
+            self._file = open(path, 'r+b' if writable else 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        elif writable:
+            self.img.close()
+            raise ValueError("Mode bandes : image non compressée requise (BMP, PPM ou TIFF)")
+        self._prefix = None  # Premières lignes décodées (formats compressés)
+        self.base = base_channels(self.img.mode)  # Composantes portant l'en-tête (R, G, B ou niveau de gris)
+        self.components = self.base[1]  # Composantes lues par pixel
+
+        row_size = self.layout.stride if self.layout else self.width * len(carrier_mode(self.img.mode))
+        self.rows_per_strip = max(1, budget // row_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Ferme les fichiers ouverts (les lignes modifiées sont d'abord écrites sur le disque)."""
+        self.img.close()
+        if self._map:
+            if self.writable:
+                self._map.flush()
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # Une vue est encore utilisée : la projection sera libérée avec elle
+        if self._file:
+            self._file.close()
+
+    def _pieces(self, top: int, bottom: int):
+        """Découpe les lignes [top, bottom) en blocs contigus du fichier."""
+        stride = self.layout.stride
+        for strip in self.layout.strips:
+            first, last = max(top, strip.top), min(bottom, strip.bottom)
+            if first >= last:
+                continue
+            if strip.bottom_up:
+                yield strip.offset + (strip.bottom - last) * stride, first, last, True
+            else:
+                yield strip.offset + (first - strip.top) * stride, first, last, False
+
+    def _rows(self, offset: int, count: int, reverse: bool) -> np.ndarray:
+        """Vue sur `count` lignes projetées à partir de `offset`, de haut en bas."""
+        rows = np.frombuffer(self._map, dtype=np.uint8, count=count * self.layout.stride, offset=offset)
+        rows = rows.reshape(count, self.layout.stride)
+        return rows[::-1] if reverse else rows
+
+    def read_block(self, top: int, bottom: int) -> np.ndarray:
+        """Octets bruts des lignes [top, bottom), de haut en bas.
+
+        Les lignes d'une même bande du fichier sont retournées sans copie ; seules les pages couvertes sont lues.
+        """
+        pieces = list(self._pieces(top, bottom))
+        if len(pieces) == 1:
+            offset, first, last, reverse = pieces[0]
+            return self._rows(offset, last - first, reverse)
+
+        block = np.empty((bottom - top, self.layout.stride), dtype=np.uint8)
+        for offset, first, last, reverse in pieces:
+            block[first - top:last - top] = self._rows(offset, last - first, reverse)
+        return block
+
+    def write_block(self, top: int, bottom: int, block: np.ndarray):
+        """Recopie dans le fichier les lignes [top, bottom) d'un bloc qui n'est pas déjà une vue projetée."""
+        for offset, first, last, reverse in self._pieces(top, bottom):
+            rows, target = block[first - top:last - top], self._rows(offset, last - first, reverse)
+            if not np.may_share_memory(rows, target):
+                target[...] = rows
+
+    def pixels(self, block: np.ndarray) -> np.ndarray:
+        """Vue (lignes x largeur x octets par pixel) d'un bloc brut."""
+        row_size = self.width * self.layout.pixel_size
+        return block[:, :row_size].reshape(len(block), self.width, self.layout.pixel_size)
+
+    def _decode_prefix(self, rows: int) -> np.ndarray:
+        """Décode uniquement les `rows` premières lignes quand le format le permet (sinon l'image entière)."""
+        prefix = prefix_image(self.path, rows)
+        if prefix is not None:
+            return np.asarray(carrier_image(prefix))
+        with Image.open(self.path) as img:
+            return np.asarray(carrier_image(img))
+
+    def channels(self, top: int, bottom: int) -> np.ndarray:
+        """Retourne le plan de composantes (pixels x R, G, B ou niveau de gris) des lignes [top, bottom)."""
+        if self.layout:
+            return self.pixels(self.read_block(top, bottom))[..., list(self.layout.order)].reshape(-1, CHANNELS)
+
+        # Formats compressés : les lignes décodées sont conservées et étendues au besoin
+        if self._prefix is None or len(self._prefix) < bottom:
+            rows = min(self.height, max(bottom, 2 * (0 if self._prefix is None else len(self._prefix))))
+            self._prefix = self._decode_prefix(rows)
+        return channel_view(self._prefix[top:bottom], *self.base)
+
+    def row_of(self, channel: int) -> int:
+        """Ligne contenant la composante d'indice `channel`."""
+        return channel // (self.width * self.components)
+
+
+def _read_stream(reader: StripReader, lsb: int, start: int, length: Optional[int] = None,
+                 progress: Optional[Callable[[float], None]] = None) -> Iterator[bytes]:
+    """Extrait bande par bande le flux d'octets commençant à la composante `start`."""
+    row_channels = reader.width * reader.components
+    end = reader.height * row_channels
+    if length is not None:
+        end = min(end, start + channels_needed(length, lsb))
+
+    carry = np.empty(0, dtype=np.uint8)
+    first_row, last_row = reader.row_of(start), reader.row_of(end - 1) + 1
+    for top in range(first_row, last_row, reader.rows_per_strip):
+        checkpoint()
+        bottom = min(top + reader.rows_per_strip, last_row)
+        low, high = max(start, top * row_channels), min(end, bottom * row_channels)
+        with stage("decode"):
+            view = reader.channels(top, bottom)
+        with stage("extract"):
+            groups = np.concatenate([carry, load_groups(view, low - top * row_channels, high - low, lsb)])
+
+            # Un multiple de 8 groupes correspond toujours à un nombre entier d'octets
+            aligned = len(groups) - len(groups) % 8
+            carry = groups[aligned:]
+            chunk = groups_to_bytes(groups[:aligned], lsb)
+        yield chunk
+        if progress:
+            progress((bottom - first_row) / (last_row - first_row))
+    yield groups_to_bytes(carry, lsb)
+
+
+def stream_payload(path: str, lsb: int, budget: int = DEFAULT_STRIP_BUDGET,
+                   progress: Optional[Callable[[float], None]] = None) -> Tuple[Optional[Header], Iterator[bytes]]:
+    """Lit l'en-tête puis retourne un itérateur sur les données, lues bande par bande à la demande."""
+    reader = StripReader(path, budget)
+    try:
+        prefix = channels_needed(HEADER_MAX_SIZE, lsb)
+        with stage("decode"):
+            view = reader.channels(0, min(reader.height, reader.row_of(prefix) + 1))
+        with stage("extract"):
+            header = read_header(view, lsb)
+        if header is not None and header.scattered:
+            raise Unstreamable("Mode bandes indisponible : les données sont dispersées sur toute l'image")
+        if header is not None and header.channels is not None:
+            raise Unstreamable("Mode bandes indisponible : les données utilisent un autre jeu de composantes")
+    except Exception:
+        reader.close()
+        raise
+
+    def chunks() -> Iterator[bytes]:
+        with reader:
+            if header is None:
+                # Ancien format : lecture jusqu'au marqueur de fin
+                for chunk in _read_stream(reader, lsb, 0, progress=progress):
+                    end = chunk.find(0)
+                    if end >= 0:
+                        yield chunk[:end]
+                        return
+                    yield chunk
+                return
+
+            remaining = header.length
+            start = payload_start(header, lsb, reader.components)
+            for chunk in _read_stream(reader, lsb, start, header.length, progress):
+                yield chunk[:remaining]
+                remaining -= min(remaining, len(chunk))
+
+    return header, chunks()
+
+
+def stream_extract(path: str, lsb: int, budget: int = DEFAULT_STRIP_BUDGET,
+                   progress: Optional[Callable[[float], None]] = None) -> Tuple[Optional[Header], bytearray]:
+    """Extrait l'en-tête et les données d'une image en ne lisant que les lignes nécessaires."""
+    header, chunks = stream_payload(path, lsb, budget, progress)
+    data = bytearray()
+    for chunk in chunks:
+        data += chunk
+    return header, data
+
+
+def stream_embed(carrier: str, data: Union[bytes, Iterable[bytes]], output: str, lsb: int, flags: int = 0,
+                 budget: int = DEFAULT_STRIP_BUDGET, progress: Optional[Callable[[float], None]] = None,
+                 length: Optional[int] = None, **fields) -> Header:
+    """Insère l'en-tête et les données dans une copie du fichier, en ne réécrivant que les lignes concernées.
+
+    Le fichier porteur doit être non compressé (BMP, PPM ou TIFF) ; la sortie garde son format.
+    La copie est clonée quand le système de fichiers le permet, puis modifiée en place par projection.
+    `data` peut être un itérable de morceaux (fichier chiffré au fil de la lecture) : seuls ceux de la bande
+    en cours sont gardés en mémoire. Leur taille totale est annoncée par `length` ; sans elle (flux compressé),
+    elle n'est connue qu'à la fin. L'en-tête est écrit une fois toutes les données insérées.
+    """
+    if isinstance(data, (bytes, bytearray)):
+        data, length = [data], len(data)
+    with StripReader(carrier, budget) as reader:
+        if reader.layout is None:
+            raise ValueError("Mode bandes : image non compressée requise (BMP, PPM ou TIFF)")
+
+        header = Header(lsb=lsb, length=length or 0, flags=flags, **fields)
+        start = payload_start(header, lsb)
+        available = (reader.height * reader.width * CHANNELS - start) * lsb // 8
+        if length is not None and length > available:
+            raise ValueError(f"Capacité insuffisante: {length} octets pour {available} octets disponibles")
+
+        # La copie n'est renommée en `output` qu'une fois toutes les bandes écrites
+        with atomic_output(output) as partial:
+            with stage("encode"):
+                clone_file(carrier, partial)
+            with StripReader(partial, budget, writable=True) as target:
+                header.length = _stream_strips(target, GroupReader(data, lsb), start, length, available, progress)
+                packed = header.pack()
+                _embed_strips(target, [(0, packed)], lsb, target.row_of(channels_needed(len(packed), lsb) - 1) + 1)
+    return header
+
+
+def _store_strip(reader: StripReader, top: int, bottom: int, lsb: int, writes):
+    """Remplace les bits LSB des lignes [top, bottom) : `writes` donne (composante dans la bande, groupes)."""
+    with stage("decode"):
+        block = reader.read_block(top, bottom)
+    with stage("embed"):
+        pixels = reader.pixels(block)
+        order = list(reader.layout.order)
+        view = pixels[..., order].reshape(-1, CHANNELS)
+        for start, groups in writes:
+            store_groups(view, start, groups, lsb)
+        pixels[..., order] = view.reshape(len(block), reader.width, CHANNELS)
+    with stage("encode"):
+        reader.write_block(top, bottom, block)
+
+
+def _embed_strips(reader: StripReader, segments, lsb: int, last_row: int,
+                  progress: Optional[Callable[[float], None]] = None):
+    """Modifie, bande par bande, les lignes [0, last_row) qui reçoivent les segments (composante, octets)."""
+    row_channels = reader.width * CHANNELS
+    for top in range(0, last_row, reader.rows_per_strip):
+        checkpoint()
+        bottom = min(top + reader.rows_per_strip, last_row)
+
+        # Écrit la partie de chaque segment qui tombe dans la bande
+        first, writes = top * row_channels, []
+        for start, chunk in segments:
+            low = max(start, first)
+            high = min(start + channels_needed(len(chunk), lsb), bottom * row_channels)
+            if low < high:
+                writes.append((low - first, stream_groups(chunk, lsb, low - start, high - start)))
+        _store_strip(reader, top, bottom, lsb, writes)
+        if progress:
+            progress(bottom / last_row)
+
+
+def _take_groups(source: GroupReader, start: int, count: int) -> Iterator[Tuple[int, np.ndarray]]:
+    """Groupes destinés aux `count` composantes d'une bande à partir de `start`, lus tranche par tranche."""
+    end = start + count
+    while start < end:
+        groups = source.take(min(end - start, CHUNK_SIZE))
+        if not len(groups):
+            return
+        yield start, groups
+        start += len(groups)
+
+
+def _stream_strips(reader: StripReader, source: GroupReader, start: int, length: Optional[int], available: int,
+                   progress: Optional[Callable[[float], None]] = None) -> int:
+    """Insère bande par bande les données lues dans `source` à partir de la composante `start` ; retourne leur taille."""
+    lsb = source.lsb
+    row_channels = reader.width * CHANNELS
+    end = reader.height * row_channels if length is None else start + channels_needed(length, lsb)
+    first_row, last_row = reader.row_of(start), reader.row_of(end - 1) + 1
+    for top in range(first_row, last_row, reader.rows_per_strip):
+        checkpoint()
+        if source.exhausted():
+            break
+        bottom = min(top + reader.rows_per_strip, last_row)
+        low, high = max(start, top * row_channels), min(end, bottom * row_channels)
+        # Seuls les morceaux de cette bande sont lus (et chiffrés), par tranches bornées
+        _store_strip(reader, top, bottom, lsb, _take_groups(source, low - top * row_channels, high - low))
+        if progress and length:
+            progress((bottom - first_row) / (last_row - first_row))
+
+    if not source.exhausted():
+        if length is not None:
+            raise ValueError("Les données dépassent la taille annoncée")
+        raise ValueError(f"Capacité insuffisante: plus de {available} octets à cacher")
+    if length is not None and source.read != length:
+        raise ValueError(f"Données incomplètes: {source.read} octets sur {length}")
+    return source.read
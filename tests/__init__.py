@@ -0,0 +1 @@
+# DATA-GHOST - Tests de non-régression
@@ -0,0 +1,61 @@
+# DATA-GHOST - Porteuses et références communes aux tests
+# Les boucles `legacy_*` reproduisent, pixel par pixel, l'insertion et l'extraction de l'ancienne interface
+
+import os  # Pour les sels de dérivation
+
+import numpy as np  # Pour générer les pixels
+import pytest  # Pour les fixtures
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost.crypto import KDF_SCRYPT, KdfParams
+
+
+def noise_image(mode: str = 'RGB', size=(64, 48), seed: int = 0) -> Image.Image:
+    """Image de bruit reproductible (toutes les composantes prennent toutes les valeurs)."""
+    bands = len(Image.new(mode, (1, 1)).getbands())
+    arr = np.random.default_rng(seed).integers(0, 256, (size[1], size[0], bands), dtype=np.uint8)
+    return Image.fromarray(arr[..., 0] if bands == 1 else arr, mode)
+
+
+def legacy_embed(img: Image.Image, data: bytes, lsb: int) -> Image.Image:
+    """Ancienne boucle d'insertion : chaîne de bits, complétée par un octet nul, écrite composante par composante."""
+    img = img.convert('RGB') if img.mode not in ('RGB', 'RGBA') else img.copy()
+    binary_data = ''.join(f"{byte:08b}" for byte in data) + "00000000"
+    pixels = img.load()
+    bit_index = 0
+    for y in range(img.height):
+        for x in range(img.width):
+            if bit_index >= len(binary_data):
+                return img
+            rgb = list(pixels[x, y][:3])
+            for i in range(3):
+                if bit_index < len(binary_data):
+                    bits = binary_data[bit_index:bit_index + lsb].ljust(lsb, '0')
+                    rgb[i] = (rgb[i] & ~((1 << lsb) - 1)) | int(bits, 2)
+                    bit_index += lsb
+            pixels[x, y] = tuple(rgb)
+    return img
+
+
+def legacy_extract(img: Image.Image, lsb: int) -> bytes:
+    """Ancienne boucle d'extraction : bits LSB de R, G, B lus jusqu'au premier octet nul."""
+    img = img.convert('RGB') if img.mode not in ('RGB', 'RGBA') else img
+    pixels = img.load()
+    bits = ''.join(f"{c & ((1 << lsb) - 1):0{lsb}b}"
+                   for y in range(img.height) for x in range(img.width) for c in pixels[x, y][:3])
+    data = bytes(int(bits[i:i + 8], 2) for i in range(0, len(bits) - 7, 8))
+    return data.split(b"\0", 1)[0]
+
+
+@pytest.fixture
+def kdf():
+    """Paramètres de dérivation peu coûteux (le format et le chiffrement sont ceux des vrais réglages)."""
+    return KdfParams(KDF_SCRYPT, os.urandom(16), 1 << 10)
+
+
+@pytest.fixture
+def carrier(tmp_path):
+    """Chemin d'une image PNG de bruit (RGB, 64x48)."""
+    path = tmp_path / "carrier.png"
+    noise_image().save(path)
+    return str(path)
@@ -0,0 +1,58 @@
+# DATA-GHOST - Stéganalyse : une image propre n'est pas signalée, une image modifiée l'est
+
+import os  # Pour les données aléatoires
+
+import numpy as np  # Pour générer les pixels
+import pytest  # Pour les tests paramétrés
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost import api
+from dataghost.analysis import CHI_BANDS, _sustained, analyze_image
+
+
+def natural_image(mode: str = 'RGB', size=(256, 192), seed: int = 0) -> Image.Image:
+    """Image lisse et faiblement bruitée, proche d'une photographie (le bruit uniforme trompe la stéganalyse)."""
+    rng = np.random.default_rng(seed)
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width] / max(size)
+    bands = []
+    for _ in mode:
+        field = sum(rng.uniform(0.3, 1) * np.cos(2 * np.pi * (fx * x + fy * y) + rng.uniform(0, 6.3))
+                    for fx, fy in rng.uniform(0, 6, (6, 2)))
+        field = (field - field.min()) / np.ptp(field) * rng.uniform(150, 230) + rng.uniform(10, 25)
+        field += rng.normal(0, rng.uniform(1, 4), field.shape)
+        bands.append(np.clip(np.rint(field), 0, 255).astype(np.uint8))
+    return Image.fromarray(np.stack(bands, axis=-1), mode)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_clean_and_embedded_images_are_separated(tmp_path, seed):
+    clean, embedded = str(tmp_path / "clean.png"), str(tmp_path / "embedded.png")
+    natural_image(seed=seed).save(clean)
+    report = analyze_image(clean, workers=1)
+    assert not report.suspect and report.rate < 0.1
+
+    room = api.carrier_capacity(clean, 1)
+    for fraction in (0.3, 1.0):
+        api.embed(clean, os.urandom(int(room * fraction)), embedded, 1)
+        report = analyze_image(embedded, workers=1)
+        assert report.suspect and report.to_dict()['suspect']
+
+
+def test_chi_square_extent_requires_a_sustained_signal():
+    high, low = 0.99, 0.5
+    assert _sustained([high] * (CHI_BANDS - 1) + [low] * 10) == 0
+    assert _sustained([low, high] + [high] * CHI_BANDS + [low] * 3) == CHI_BANDS + 2
+    assert _sustained([low] * CHI_BANDS + [high] * 20) == 0
+    assert _sustained([None, high] + [high] * 10) == 12
+
+
+def test_raw_alpha_is_analysed(tmp_path):
+    image = natural_image('RGBA', seed=5)
+    raw, decoded = str(tmp_path / "raw.tif"), str(tmp_path / "decoded.png")
+    image.save(raw)
+    image.save(decoded)
+    report = analyze_image(raw, workers=1)
+    assert report.mode == 'RGBA' and [channel.name for channel in report.channels] == list("RGBA")
+    # La lecture directe donne les mêmes mesures que le décodage
+    assert report.to_dict() | {'path': None} == analyze_image(decoded, workers=1).to_dict() | {'path': None}
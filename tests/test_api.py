@@ -0,0 +1,69 @@
+# DATA-GHOST - API de haut niveau et ligne de commande
+
+import json  # Pour le rapport des durées
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api, cli
+
+MESSAGE = "Message caché ✓".encode('utf-8')
+
+
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_embed_extract_round_trip(carrier, tmp_path, lsb):
+    output = str(tmp_path / "out.png")
+    api.embed(carrier, MESSAGE, output, lsb)
+    extraction = api.extract(output, lsb)
+    assert extraction.data == MESSAGE
+    assert extraction.header.length == len(MESSAGE)
+
+
+def test_file_round_trip(carrier, tmp_path):
+    source, output, restored = tmp_path / "secret.bin", str(tmp_path / "out.png"), str(tmp_path / "restored.bin")
+    source.write_bytes(bytes(range(256)) * 4)
+    api.embed_file(carrier, str(source), output, 2)
+    assert api.extract_file(output, restored, 2).size == 1024
+    assert open(restored, 'rb').read() == source.read_bytes()
+
+
+@pytest.mark.parametrize("lsb", [1, 4])
+def test_capacity_is_what_embed_accepts(carrier, tmp_path, lsb):
+    output = str(tmp_path / "out.png")
+    room = api.carrier_capacity(carrier, lsb)
+    api.embed(carrier, b"\xaa" * room, output, lsb)
+    assert api.extract(output, lsb).data == b"\xaa" * room
+    with pytest.raises(ValueError, match="Capacité insuffisante"):
+        api.embed(carrier, b"\xaa" * (room + 1), output, lsb)
+
+
+def test_cli_capacity_matches_api(carrier, capsys):
+    assert cli.main(["capacity", carrier, "--lsb", "2"]) == 0
+    assert f"{api.carrier_capacity(carrier, 2)} octets" in capsys.readouterr().out
+
+
+def test_cli_extract_to_pipe_is_byte_exact(carrier, tmp_path, capsysbinary):
+    output = str(tmp_path / "out.png")
+    api.embed(carrier, b"AB", output, 1)
+    assert cli.main(["extract", output, "--lsb", "1"]) == 0
+    assert capsysbinary.readouterr().out == b"AB"
+
+
+def _timings(err: str) -> dict:
+    """Rapport --timings : dernière ligne JSON de la sortie d'erreur."""
+    return json.loads(err.strip().splitlines()[-1])
+
+
+def test_cli_timings_on_long_commands(carrier, tmp_path, capsys):
+    output = str(tmp_path / "images" / "out.png")
+    (tmp_path / "images").mkdir()
+    api.embed(carrier, MESSAGE, output, 1)
+    assert cli.main(["analyze", output, "--timings"]) == 0
+    assert {"decode", "analyze"} <= set(_timings(capsys.readouterr().err)['stages'])
+
+    assert cli.main(["scan", str(tmp_path / "images"), "-w", "1", "--timings"]) == 0
+    assert "probe" in _timings(capsys.readouterr().err)['stages']
+
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text(json.dumps({'carrier': carrier, 'output': str(tmp_path / "b.png"), 'message': "x"}))
+    assert cli.main(["batch", "embed", str(manifest), "-w", "1", "-r", str(tmp_path / "r.jsonl"), "--timings"]) == 0
+    assert "embed" in _timings(capsys.readouterr().err)['stages']
@@ -0,0 +1,44 @@
+# DATA-GHOST - Traitement par lots : une ligne ou une tâche en erreur n'interrompt pas le lot
+
+import json  # Pour les manifestes JSONL
+
+from dataghost import api
+from dataghost.batch import EmbedJob, InvalidJob, load_manifest, run_batch, run_embed_job, write_report
+
+
+def _write_jsonl(path, lines):
+    path.write_text("\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines), encoding='utf-8')
+    return str(path)
+
+
+def test_invalid_rows_become_failed_jobs(carrier, tmp_path):
+    good = {'carrier': carrier, 'output': str(tmp_path / "a.png"), 'message': "lot", 'lsb': 2}
+    manifest = _write_jsonl(tmp_path / "jobs.jsonl", [
+        good,
+        {'carrier': carrier, 'ouptut': str(tmp_path / "b.png"), 'message': "coquille"},
+        "{pas du json",
+        {'carrier': carrier, 'output': str(tmp_path / "c.png"), 'lsb': "deux"},
+        "",
+        {'carrier': carrier, 'output': str(tmp_path / "d.png"), 'message': "fin"},
+    ])
+    jobs = load_manifest(manifest)
+    assert [type(job) for job in jobs] == [EmbedJob, InvalidJob, InvalidJob, InvalidJob, EmbedJob]
+    assert "ouptut" in jobs[1].error and jobs[1].carrier == carrier and jobs[2].line == 3
+
+    reports = list(run_batch(run_embed_job, jobs, workers=1))
+    assert [report['status'] for report in reports] == ['ok', 'error', 'error', 'error', 'ok']
+    assert "Colonne inconnue: ouptut" in reports[1]['error'] and reports[3]['line'] == 4
+    assert api.extract(str(tmp_path / "a.png"), 2).data == b"lot"
+    assert api.extract(str(tmp_path / "d.png"), 1).data == b"fin"
+
+
+def test_csv_manifest_and_report(carrier, tmp_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text(f"carrier,output,message,couleur\n{carrier},{tmp_path / 'a.png'},csv,\n"
+                        f"{carrier},{tmp_path / 'b.png'},csv,rouge\n{carrier},,sans sortie,\n", encoding='utf-8')
+    jobs = load_manifest(str(manifest), lsb=3)
+    assert jobs[0].lsb == 3 and jobs[1].line == 3 and "output" in jobs[2].error
+
+    with open(tmp_path / "report.jsonl", 'w', encoding='utf-8') as f:
+        summary = write_report(run_batch(run_embed_job, jobs, workers=1), f)
+    assert (summary['jobs'], summary['ok'], summary['error']) == (3, 1, 2)
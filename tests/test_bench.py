@@ -0,0 +1,67 @@
+# DATA-GHOST - Banc d'essai : cas reproductibles, mesures correctes et détection des régressions
+# Le rapport d'un cas minuscule sert de référence ; les durées comparées sont fabriquées
+
+import os  # Pour les fichiers générés
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost.bench import (
+    MIN_DELTA, MODES, BenchCase, build_cases, compare, make_carrier, run_case, run_suite,
+)
+from dataghost.container import payload_capacity
+
+
+def _result(name, embed=0.1, extract=0.05, rss=100.0, ok=True):
+    return {'case': name, 'embed_seconds': embed, 'extract_seconds': extract, 'peak_rss_mb': rss, 'ok': ok,
+            'error': None if ok else "ValueError: panne"}
+
+
+def test_cases_fit_their_carrier():
+    cases = build_cases(resolutions=((64, 48),), payload_sizes=(16, 1 << 10, 4 << 10))
+    names = [case.name for case in cases]
+    assert len(names) == len(set(names)) and "RGB-64x48-lsb1-clair-16" in names
+    assert all(case.payload_size <= payload_capacity(64, 48, case.lsb, 0, case.mode) for case in cases)
+    assert not any(case.lsb == 1 and case.payload_size == 4 << 10 for case in cases)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_carriers_are_reproducible(tmp_path, mode):
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    paths = [make_carrier(str(directory), mode, 40, 30) for directory in (first, second)]
+    with open(paths[0], 'rb') as a, open(paths[1], 'rb') as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize("encrypted", [False, True])
+def test_case_round_trip_is_measured(tmp_path, encrypted):
+    case = BenchCase("RGBA", 64, 48, 2, encrypted, 256)
+    carrier = make_carrier(str(tmp_path), case.mode, case.width, case.height)
+    result = run_case((case, carrier, str(tmp_path), 2))
+    assert result['ok'] and result['error'] is None and result['case'] == case.name
+    assert result['embed_seconds'] > 0 and result['extract_seconds'] > 0 and 'embed' in result['stages']
+    assert os.listdir(tmp_path) == [os.path.basename(carrier)]
+
+
+def test_suite_report(tmp_path):
+    report = run_suite([BenchCase("L", 32, 24, 1, False, 64)], repeat=1, directory=str(tmp_path))
+    assert report['repeat'] == 1 and report['machine']['cpus']
+    assert [result['ok'] for result in report['results']] == [True]
+    assert compare(report, report) == [] and os.listdir(tmp_path) == []
+
+
+def test_regressions_are_reported():
+    baseline = {'results': [_result("a"), _result("b"), _result("c"), _result("d")]}
+    report = {'results': [
+        _result("a", embed=0.2),  # Deux fois plus lent
+        _result("b", extract=0.05 + MIN_DELTA / 2),  # Écart sous le bruit de mesure
+        _result("c", rss=150.0),  # Pic mémoire en hausse de 50 %
+        _result("d", ok=False),
+        _result("nouveau", embed=9.0),  # Absent de la référence
+    ]}
+    regressions = compare(report, baseline)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("a: embed_seconds 0.2 s") and "+100%" in regressions[0]
+    assert regressions[1].startswith("c: pic mémoire")
+    assert regressions[2] == "d: aller-retour incorrect ValueError: panne"
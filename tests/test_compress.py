@@ -0,0 +1,103 @@
+# DATA-GHOST - Compression puis chiffrement en flux : morceaux de taille quelconque, à cheval sur les blocs
+# Le découpage reçu ne doit jamais changer les données, et un flux tronqué ou altéré doit être refusé
+
+import os  # Pour les clés et les nonces
+
+import numpy as np  # Pour les données peu compressibles
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.compress import ALGORITHMS, compress, compress_stream, decompress_stream
+from dataghost.crypto import FRAME_SIZE, NONCE_SIZE, KEY_LENGTH, decrypt_stream, encrypt_stream, sealed_size
+from dataghost.engine import CHUNK_SIZE
+
+from .conftest import noise_image
+
+# Texte répétitif (très compressible) suivi d'octets aléatoires (incompressibles)
+DATA = b"ligne de journal\n" * 4000 + np.random.default_rng(1).bytes(3 * FRAME_SIZE // 2)
+SMALL_FRAME = 100  # Blocs minuscules : chaque morceau en chevauche plusieurs
+
+
+def _pieces(data: bytes, sizes=(1, 7, 4093, 65537, 13)):
+    """Découpe les données en morceaux de tailles irrégulières (répétées), dont des morceaux vides."""
+    pieces, offset, index = [], 0, 0
+    while offset < len(data):
+        size = sizes[index % len(sizes)]
+        pieces.extend((data[offset:offset + size], b""))
+        offset += size
+        index += 1
+    return pieces
+
+
+def _key():
+    return os.urandom(KEY_LENGTH), os.urandom(NONCE_SIZE)
+
+
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_compression_stream_ignores_chunking(name):
+    algorithm = ALGORITHMS[name]
+    packed = b"".join(compress_stream(_pieces(DATA), algorithm, 3))
+    assert len(packed) < len(DATA)
+    for sizes in ((1, 3), (len(packed),), (4096, 17)):
+        out = list(decompress_stream(_pieces(packed, sizes), algorithm))
+        assert b"".join(out) == DATA and max(map(len, out)) <= CHUNK_SIZE
+
+
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_compression_stream_refuses_truncated_or_trailing_data(name):
+    algorithm = ALGORITHMS[name]
+    packed = compress(DATA, algorithm)
+    with pytest.raises(ValueError, match="tronqué"):
+        b"".join(decompress_stream(_pieces(packed[:-5]), algorithm))
+    with pytest.raises(ValueError):
+        b"".join(decompress_stream([packed, b"reste"], algorithm))
+
+
+@pytest.mark.parametrize("size", [0, 1, SMALL_FRAME - 1, SMALL_FRAME, 3 * SMALL_FRAME, 3 * SMALL_FRAME + 1, 5000])
+def test_encryption_stream_across_frame_boundaries(size):
+    key, nonce = _key()
+    data = DATA[:size]
+    sealed = b"".join(encrypt_stream(key, nonce, _pieces(data), SMALL_FRAME))
+    # Un flux multiple de la taille de bloc se termine par un bloc vide (sa seule étiquette)
+    assert len(sealed) == sealed_size(size, SMALL_FRAME)
+    for sizes in ((1,), (SMALL_FRAME + 16,), (37, 250)):
+        assert b"".join(decrypt_stream(key, nonce, _pieces(sealed, sizes), SMALL_FRAME)) == data
+
+
+def test_encryption_stream_refuses_tampering():
+    key, nonce = _key()
+    frame = SMALL_FRAME + 16
+    sealed = b"".join(encrypt_stream(key, nonce, [DATA[:1000]], SMALL_FRAME))
+
+    altered = bytearray(sealed)
+    altered[3 * frame + 5] ^= 1
+    with pytest.raises(ValueError, match="bloc 3"):
+        b"".join(decrypt_stream(key, nonce, [bytes(altered)], SMALL_FRAME))
+    # Sans son dernier bloc, ou blocs permutés : le flux est refusé même si chaque bloc est intact
+    with pytest.raises(ValueError):
+        b"".join(decrypt_stream(key, nonce, [sealed[:-(len(sealed) % frame)]], SMALL_FRAME))
+    with pytest.raises(ValueError, match="bloc 0"):
+        b"".join(decrypt_stream(key, nonce, [sealed[frame:2 * frame] + sealed[:frame] + sealed[2 * frame:]],
+                                SMALL_FRAME))
+    with pytest.raises(ValueError, match="tronqué"):
+        b"".join(decrypt_stream(key, nonce, [sealed[:10]], SMALL_FRAME))
+
+
+@pytest.mark.parametrize("name", ALGORITHMS)
+def test_compressed_then_encrypted_stream(name):
+    algorithm, (key, nonce) = ALGORITHMS[name], _key()
+    sealed = encrypt_stream(key, nonce, compress_stream(_pieces(DATA), algorithm))
+    restored = decompress_stream(decrypt_stream(key, nonce, _pieces(b"".join(sealed), (FRAME_SIZE - 3, 5))), algorithm)
+    assert b"".join(restored) == DATA
+
+
+def test_lzma_file_round_trip(tmp_path, kdf):
+    carrier, source = str(tmp_path / "carrier.png"), tmp_path / "secret.log"
+    noise_image(size=(400, 300)).save(carrier)
+    source.write_bytes(DATA)
+    output, restored = str(tmp_path / "out.png"), str(tmp_path / "restored.log")
+    api.embed_file(carrier, str(source), output, 4, "clé", kdf=kdf, compression='lzma', level=3)
+    extraction = api.extract_file(output, restored, 4, "clé")
+    assert extraction.header.compressed and extraction.decrypted
+    with open(restored, 'rb') as f:
+        assert f.read() == DATA
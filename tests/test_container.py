@@ -0,0 +1,55 @@
+# DATA-GHOST - Format conteneur : en-tête, données contenant des octets nuls, alpha préservé
+
+import numpy as np  # Pour comparer les pixels
+import pytest  # Pour les tests paramétrés
+
+from dataghost.container import (
+    FLAG_COMPRESSED, FLAG_ENCRYPTED, HEADER_MAX_SIZE, Header, embed_payload, extract_payload, payload_capacity,
+)
+
+from .conftest import noise_image
+
+
+def test_header_round_trip():
+    header = Header(lsb=3, length=123456789, flags=FLAG_ENCRYPTED | FLAG_COMPRESSED, compression=1)
+    packed = header.pack()
+    assert len(packed) == header.size <= HEADER_MAX_SIZE
+    assert Header.unpack(packed) == header
+
+
+def test_corrupted_header_is_ignored():
+    packed = bytearray(Header(lsb=1, length=42).pack())
+    packed[8] ^= 0x01
+    assert Header.unpack(bytes(packed)) is None
+    assert Header.unpack(b"not a header at all") is None
+
+
+def test_header_depth_beyond_max_lsb_is_refused():
+    # CRC valide mais profondeur de 8 bits : en-tête fabriqué, refusé à la lecture
+    with pytest.raises(ValueError, match="Profondeur LSB invalide"):
+        Header.unpack(Header(lsb=8, length=42).pack())
+
+
+@pytest.mark.parametrize("mode", ['RGB', 'RGBA', 'L'])
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_payload_round_trip(mode, lsb):
+    data = bytes(range(256)) + bytes(16)  # Octets nuls compris : l'ancien marqueur de fin les aurait tronqués
+    img = embed_payload(noise_image(mode, seed=lsb), data, lsb)
+    header, extracted = extract_payload(img, lsb)
+    assert header.lsb == lsb and header.length == len(data)
+    assert bytes(extracted) == data
+
+
+def test_alpha_left_untouched():
+    img = noise_image('RGBA')
+    result = embed_payload(img, b"x" * 500, 2)
+    assert np.array_equal(np.asarray(result)[..., 3], np.asarray(img)[..., 3])
+
+
+def test_capacity_is_exact():
+    img = noise_image(size=(20, 10))
+    room = payload_capacity(20, 10, 2)
+    header, data = extract_payload(embed_payload(img, b"\xff" * room, 2), 2)
+    assert bytes(data) == b"\xff" * room
+    with pytest.raises(ValueError, match="Capacité insuffisante"):
+        embed_payload(img, b"\xff" * (room + 1), 2)
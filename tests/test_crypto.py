@@ -0,0 +1,61 @@
+# DATA-GHOST - Dérivation de clé : paramètres bornés et cache des clés dérivées
+
+import os  # Pour les sels
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.container import FLAG_ENCRYPTED, FLAG_KDF, embed_payload
+from dataghost.crypto import (
+    KDF_PBKDF2, KDF_SCRYPT, MAX_SCRYPT_MEMORY, SALT_SIZE, KdfParams, KeyCache, derive_key,
+)
+
+from .conftest import noise_image
+
+SALT = bytes(range(SALT_SIZE))
+
+
+def test_default_parameters_are_accepted():
+    KdfParams.new(KDF_SCRYPT).check()
+    KdfParams.new(KDF_PBKDF2).check()
+
+
+@pytest.mark.parametrize("params", [
+    KdfParams(KDF_SCRYPT, SALT, 1 << 20, 8, 1),  # 1 Gio de mémoire
+    KdfParams(KDF_SCRYPT, SALT, 1 << 17, 32, 1),  # 512 Mio
+    KdfParams(KDF_SCRYPT, SALT, 1 << 17, 1, 16),  # p·N trop grand, mémoire modeste
+    KdfParams(KDF_SCRYPT, SALT, 3000, 8, 1),  # N n'est pas une puissance de 2
+    KdfParams(KDF_SCRYPT, b"court", 1 << 10, 8, 1),
+    KdfParams(KDF_PBKDF2, SALT, 0),
+    KdfParams(7, SALT, 1 << 10),
+])
+def test_unreasonable_parameters_are_refused(params):
+    with pytest.raises(ValueError):
+        params.check()
+    with pytest.raises(ValueError):
+        derive_key("clé", params)
+
+
+def test_memory_bound_matches_scrypt_usage():
+    assert 128 * (1 << 18) * 8 == MAX_SCRYPT_MEMORY
+    KdfParams(KDF_SCRYPT, SALT, 1 << 18, 8, 1).check()
+    with pytest.raises(ValueError):
+        KdfParams(KDF_SCRYPT, SALT, 1 << 18, 9, 1).check()
+
+
+def test_forged_header_is_refused_before_derivation(tmp_path):
+    # En-tête valide dont la section de dérivation exigerait 4 Gio de mémoire
+    forged = KdfParams(KDF_SCRYPT, SALT, 1 << 20, 32, 1)
+    path = str(tmp_path / "forged.png")
+    embed_payload(noise_image(), bytes(48), 1, FLAG_ENCRYPTED | FLAG_KDF, **forged.header_fields()).save(path)
+    with pytest.raises(ValueError, match="hors limites"):
+        api.extract(path, 1, "clé")
+
+
+def test_key_cache_derives_once_per_salt():
+    cache = KeyCache(maxsize=2, ttl=None)
+    first, second = (KdfParams(KDF_SCRYPT, os.urandom(SALT_SIZE), 1 << 10) for _ in range(2))
+    key = cache.get("clé", first)
+    assert cache.get("clé", first) == key and (cache.hits, cache.misses) == (1, 1)
+    assert cache.get("clé", second) != key and cache.get("autre", first) != key
+    assert len(cache._entries) == 2
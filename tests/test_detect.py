@@ -0,0 +1,41 @@
+# DATA-GHOST - Détection automatique de la profondeur LSB
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.detect import MIN_SCORE, detect_lsb, text_score
+
+from .conftest import legacy_embed, noise_image
+
+
+def test_short_text_scores_above_random_bytes():
+    assert text_score(b"x") == text_score("é".encode('utf-8')) == 1.0
+    assert text_score(b"Bonjour\n") == 1.0
+    random_run = bytes(range(1, 256))
+    assert text_score(random_run) < 0.01 < text_score(b"presque\x01du texte")
+
+
+@pytest.mark.parametrize("message", [b"x", b"hi", "é".encode('utf-8'), b"Bonjour tout le monde"])
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+@pytest.mark.parametrize("seed", range(4))
+def test_legacy_depth_detected(tmp_path, message, lsb, seed):
+    path = str(tmp_path / "legacy.png")
+    legacy_embed(noise_image(seed=100 * seed + lsb), message, lsb).save(path)
+    extraction = api.extract(path, lsb=None)
+    assert (extraction.lsb, extraction.data) == (lsb, message)
+
+
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_header_depth_detected(carrier, tmp_path, lsb):
+    output = str(tmp_path / "out.png")
+    api.embed(carrier, b"x", output, lsb)
+    best = detect_lsb(output)[0]
+    assert (best.lsb, best.score, best.header.length) == (lsb, 1.0, 1)
+
+
+def test_no_plausible_depth_is_refused(tmp_path):
+    path = str(tmp_path / "binary.png")
+    legacy_embed(noise_image(), bytes(range(0x80, 0x100)), 2).save(path)
+    assert detect_lsb(path)[0].score < MIN_SCORE
+    with pytest.raises(ValueError, match="Profondeur LSB introuvable"):
+        api.extract(path, lsb=None)
@@ -0,0 +1,60 @@
+# DATA-GHOST - Moteur vectorisé : résultats identiques à l'ancienne boucle pixel par pixel
+
+import numpy as np  # Pour comparer les pixels
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.engine import capacity, embed_image, extract_image
+
+from .conftest import legacy_embed, legacy_extract, noise_image
+
+MESSAGE = "Données cachées : ü€ 0123456789".encode('utf-8')
+
+
+@pytest.mark.parametrize("mode", ['RGB', 'RGBA', 'L', 'P'])
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_embed_matches_legacy_loop(mode, lsb):
+    img = noise_image(mode if mode != 'P' else 'RGB', seed=lsb)
+    if mode == 'P':
+        img = img.convert('P')
+    expected = legacy_embed(img, MESSAGE, lsb)
+    result = embed_image(img, MESSAGE + b"\0", lsb)
+    assert result.mode == expected.mode
+    assert np.array_equal(np.asarray(result), np.asarray(expected))
+
+
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_extract_matches_legacy_loop(lsb):
+    img = legacy_embed(noise_image(seed=lsb), MESSAGE, lsb)
+    assert bytes(extract_image(img, lsb)) == legacy_extract(img, lsb) == MESSAGE
+
+
+def test_payload_filling_the_image():
+    img = noise_image(size=(8, 8))
+    data = bytes(range(1, 256)) * 2
+    data = data[:capacity(8, 8, 3) - 1]
+    expected = legacy_embed(img, data, 3)
+    assert np.array_equal(np.asarray(embed_image(img, data + b"\0", 3)), np.asarray(expected))
+
+
+@pytest.mark.parametrize("lsb", [0, 5, 8])
+def test_depth_beyond_max_lsb_is_refused(lsb):
+    with pytest.raises(ValueError, match="1 à 4"):
+        embed_image(noise_image(), MESSAGE, lsb)
+    with pytest.raises(ValueError, match="Profondeur LSB invalide"):
+        extract_image(noise_image(), lsb)
+
+
+def test_payload_too_large_is_refused():
+    img = noise_image(size=(8, 8))
+    with pytest.raises(ValueError, match="Capacité insuffisante"):
+        embed_image(img, bytes(capacity(8, 8, 1) + 1), 1)
+
+
+@pytest.mark.parametrize("lsb", [1, 2, 3, 4])
+def test_legacy_marker_image_still_readable(tmp_path, lsb):
+    path = tmp_path / "legacy.png"
+    legacy_embed(noise_image(seed=lsb), MESSAGE, lsb).save(path)
+    extraction = api.extract(str(path), lsb)
+    assert extraction.header is None
+    assert extraction.data == MESSAGE
@@ -0,0 +1,71 @@
+# DATA-GHOST - Porteuses à plusieurs images : fragments répartis sur toutes les images, dans l'ordre
+
+import pytest  # Pour les tests paramétrés
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost import api
+from dataghost.frames import is_multiframe
+
+from .conftest import noise_image
+
+MESSAGE = b"hello, plusieurs pages " * 40
+
+
+def _tiff(path, sizes, descriptions=None):
+    """TIFF multipage de bruit, une page par taille."""
+    pages = [noise_image(size=size, seed=index) for index, size in enumerate(sizes)]
+    tags = [{270: text} for text in descriptions] if descriptions else [{}] * len(pages)
+    for page, page_tags in zip(pages[1:], tags[1:]):
+        page.encoderinfo = {"tiffinfo": page_tags}
+    pages[0].save(path, save_all=True, append_images=pages[1:], tiffinfo=tags[0])
+    return str(path)
+
+
+@pytest.mark.parametrize("key", [None, "clé"])
+def test_first_page_too_small_for_a_header(tmp_path, kdf, key):
+    carrier = _tiff(tmp_path / "c.tif", [(4, 4), (200, 200)])
+    output = str(tmp_path / "o.tif")
+    api.embed(carrier, MESSAGE, output, 1, key, kdf=kdf if key else None)
+    extraction = api.extract(output, 1, key)
+    assert extraction.data == MESSAGE and extraction.header is not None
+    with Image.open(output) as img:
+        assert img.n_frames == 2 and img.size == (4, 4)
+
+
+def test_pages_and_descriptions_are_kept(tmp_path):
+    carrier = _tiff(tmp_path / "c.tif", [(64, 48), (40, 30), (64, 48)], ["un", "deux", "trois"])
+    output = str(tmp_path / "o.tif")
+    api.embed(carrier, MESSAGE, output, 2)
+    assert api.extract(output, 2).data == MESSAGE
+    with Image.open(output) as img:
+        pages = []
+        for index in range(img.n_frames):
+            img.seek(index)
+            pages.append((img.size, img.tag_v2.get(270)))
+    assert pages == [((64, 48), "un"), ((40, 30), "deux"), ((64, 48), "trois")]
+
+
+def test_animated_gif_becomes_an_animated_png(tmp_path):
+    carrier = tmp_path / "c.gif"
+    frames = [noise_image(size=(60, 40), seed=seed).convert('P') for seed in range(3)]
+    frames[0].save(carrier, save_all=True, append_images=frames[1:], duration=[30, 40, 50], loop=0)
+    output = str(tmp_path / "o.png")
+    api.embed(str(carrier), MESSAGE, output, 1)
+    assert is_multiframe(output) and api.extract(output, 1).data == MESSAGE
+    with Image.open(output) as img:
+        durations = []
+        for index in range(img.n_frames):
+            img.seek(index)
+            durations.append(img.info['duration'])
+    assert durations == [30, 40, 50]
+
+
+def test_unsupported_layouts_are_refused(tmp_path):
+    carrier = _tiff(tmp_path / "c.tif", [(64, 48), (40, 30)])
+    with pytest.raises(ValueError, match="enregistrez en TIFF"):
+        api.embed(carrier, MESSAGE, str(tmp_path / "o.png"), 1)
+    with pytest.raises(ValueError, match="n'enregistre qu'une image"):
+        api.embed(carrier, MESSAGE, str(tmp_path / "o.bmp"), 1)
+    tiny = _tiff(tmp_path / "tiny.tif", [(2, 2), (3, 3)])
+    with pytest.raises(ValueError, match="Aucune image"):
+        api.embed(tiny, b"x", str(tmp_path / "o.tif"), 1)
@@ -0,0 +1,128 @@
+# DATA-GHOST - Planificateur de tâches : une tâche annulée ou en échec ne laisse aucun fichier partiel
+# L'annulation est vérifiée aux points de contrôle du traitement, dans un thread comme dans un processus
+
+import os  # Pour les données aléatoires
+import threading  # Pour retenir une tâche avant son démarrage
+import time  # Pour attendre la fin des tâches
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.jobs import CANCELLED, DONE, FAILED, RUNNING, JobScheduler, atomic_output, checkpoint
+
+from .conftest import noise_image
+
+
+def _wait(scheduler, job, until=lambda job: job.finished, timeout=30.0):
+    """Vide la file du planificateur jusqu'à ce que la tâche atteigne l'état voulu."""
+    deadline = time.monotonic() + timeout
+    while not until(job):
+        assert time.monotonic() < deadline, f"Tâche bloquée: {job}"
+        scheduler.drain()
+        time.sleep(0.01)
+    return job
+
+
+def _slow_write(path, progress):
+    """Écrit lentement un fichier, octet par octet, en passant par un point de contrôle à chaque pas."""
+    with atomic_output(path) as partial, open(partial, 'wb') as f:
+        for i in range(3000):
+            f.write(b"x")
+            progress(i / 3000)
+            checkpoint()
+            time.sleep(0.005)
+
+
+def _failing_write(path, progress):
+    with atomic_output(path) as partial, open(partial, 'wb') as f:
+        f.write(b"partiel")
+        raise ValueError("panne")
+
+
+@pytest.fixture
+def carrier(tmp_path):
+    """Porteur assez grand pour plusieurs bandes et plusieurs blocs chiffrés."""
+    path = tmp_path / "carrier.png"
+    noise_image(size=(400, 300)).save(path)
+    return str(path)
+
+
+def test_atomic_output(tmp_path):
+    path = str(tmp_path / "sortie.bin")
+    with atomic_output(path) as partial, open(partial, 'wb') as f:
+        assert partial.endswith(".bin") and ".part" in partial
+        f.write(b"ok")
+    with pytest.raises(KeyboardInterrupt), atomic_output(str(tmp_path / "autre.bin")) as partial:
+        open(partial, 'wb').close()
+        raise KeyboardInterrupt
+    assert os.listdir(tmp_path) == ["sortie.bin"]
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_cancelled_job_leaves_no_partial_file(tmp_path, processes):
+    scheduler = JobScheduler(1, processes=processes)
+    try:
+        job = scheduler.submit(_slow_write, str(tmp_path / "sortie.bin"))
+        _wait(scheduler, job, lambda job: job.state == RUNNING and job.progress > 0)
+        scheduler.cancel(job.id)
+        assert _wait(scheduler, job).state == CANCELLED
+        failed = _wait(scheduler, scheduler.submit(_failing_write, str(tmp_path / "echec.bin")))
+        assert failed.state == FAILED and str(failed.error) == "panne"
+    finally:
+        scheduler.shutdown()
+    assert os.listdir(tmp_path) == []
+
+
+def test_queued_job_is_cancelled_before_it_starts(tmp_path):
+    scheduler = JobScheduler(1, processes=False)
+    try:
+        running = scheduler.submit(_slow_write, str(tmp_path / "a.bin"))
+        queued = scheduler.submit(_slow_write, str(tmp_path / "b.bin"))
+        scheduler.cancel(queued.id)
+        scheduler.cancel(running.id)
+        assert _wait(scheduler, queued).state == CANCELLED and _wait(scheduler, running).state == CANCELLED
+        assert queued.progress == 0.0
+    finally:
+        scheduler.shutdown()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("operation", ["embed", "embed_strips", "extract"])
+def test_cancelled_pipeline_leaves_no_partial_file(carrier, tmp_path, kdf, operation):
+    source, output = tmp_path / "secret.bin", str(tmp_path / "out.png")
+    source.write_bytes(os.urandom(150_000))
+    if operation == "extract":
+        api.embed_file(carrier, str(source), output, 4, "clé", kdf=kdf)
+    raw = str(tmp_path / "carrier.bmp")  # Porteur non compressé, traité par bandes
+    noise_image(size=(400, 300)).save(raw)
+    before = set(os.listdir(tmp_path))
+
+    scheduler, submitted = JobScheduler(1, processes=False), threading.Event()
+
+    def task(progress):
+        def report(value):
+            scheduler.cancel(job.id)  # Annulée dès le premier signe d'avancement
+            progress(value)
+        submitted.wait()
+        if operation == "extract":
+            return api.extract_file(output, str(tmp_path / "restored.bin"), 4, "clé", progress=report)
+        if operation == "embed_strips":
+            return api.embed_file(raw, str(source), str(tmp_path / "out.bmp"), 4, "clé", report, 64 << 10, kdf=kdf)
+        return api.embed_file(carrier, str(source), output, 4, "clé", report, kdf=kdf)
+
+    try:
+        job = scheduler.submit(task)
+        submitted.set()
+        assert _wait(scheduler, job).state == CANCELLED
+    finally:
+        scheduler.shutdown()
+    assert set(os.listdir(tmp_path)) == before
+
+
+def test_finished_job_reports_result(tmp_path):
+    scheduler = JobScheduler(1, processes=False)
+    try:
+        job = _wait(scheduler, scheduler.submit(lambda progress: 42, label="réponse"))
+    finally:
+        scheduler.shutdown()
+    assert (job.state, job.result, job.progress, job.label) == (DONE, 42, 1.0, "réponse")
@@ -0,0 +1,76 @@
+# DATA-GHOST - Encodage de sortie : chaque profil et format sans perte restitue les données, le reste est refusé
+# La vérification relit l'en-tête dans le fichier enregistré
+
+import pytest  # Pour les tests paramétrés
+from PIL import Image, features  # Pour les codecs disponibles
+
+from dataghost import api
+from dataghost.output import (
+    FORMATS, PNG_STRATEGIES, PROFILES, OutputOptions, check_output, header_of, save_options, verify_output,
+)
+
+from .conftest import noise_image
+
+MESSAGE = b"sortie sans perte" * 10
+
+
+@pytest.mark.parametrize("ext", [e for e, fmt in FORMATS.items() if not fmt.feature or features.check(fmt.feature)])
+@pytest.mark.parametrize("profile", PROFILES)
+def test_lossless_formats_round_trip(carrier, tmp_path, ext, profile):
+    mode = 'L' if ext == '.pgm' else 'RGB'
+    if mode != 'RGB':
+        carrier = str(tmp_path / "gris.png")
+        noise_image('L').save(carrier)
+    output = str(tmp_path / f"sortie{ext}")
+    api.embed(carrier, MESSAGE, output, 2, encoder=OutputOptions(profile, verify=True))
+    assert api.extract(output, 2).data == MESSAGE
+
+
+@pytest.mark.parametrize("strategy", PNG_STRATEGIES)
+def test_png_strategies_round_trip(carrier, tmp_path, strategy):
+    output = str(tmp_path / "sortie.png")
+    api.embed(carrier, MESSAGE, output, 1, encoder=OutputOptions("fast", 3, strategy))
+    assert api.extract(output, 1).data == MESSAGE
+
+
+@pytest.mark.parametrize("name, mode, match", [
+    ("sortie.jpg", None, "avec perte"),
+    ("sortie.gif", None, "avec perte"),
+    ("sortie.xyz", None, "non supporté"),
+    ("sortie", None, "sans extension"),
+    ("sortie.bmp", "RGBA", "sans conversion"),
+    ("sortie.ppm", "L", "sans conversion"),
+])
+def test_unsuitable_outputs_are_refused(name, mode, match):
+    with pytest.raises(ValueError, match=match):
+        check_output(name, mode)
+
+
+def test_refused_output_is_never_written(tmp_path):
+    carrier, output = str(tmp_path / "alpha.png"), tmp_path / "sortie.bmp"
+    noise_image('RGBA').save(carrier)
+    with pytest.raises(ValueError, match="sans conversion"):
+        api.embed(carrier, MESSAGE, str(output), 1)
+    assert not output.exists()
+
+
+@pytest.mark.parametrize("options, match", [
+    (OutputOptions("lent"), "Profil"),
+    (OutputOptions(compress_level=10), "entre 0 et 9"),
+    (OutputOptions(strategy="zopfli"), "Stratégie"),
+])
+def test_invalid_options_are_refused(options, match):
+    with pytest.raises(ValueError, match=match):
+        save_options(FORMATS[".png"], options)
+
+
+def test_verification_detects_a_missing_header(carrier, tmp_path):
+    output = str(tmp_path / "sortie.png")
+    api.embed(carrier, MESSAGE, output, 3)
+    with Image.open(output) as img:
+        header = header_of(img, 3)
+    verify_output(output, header)
+    with pytest.raises(ValueError, match="Vérification échouée"):
+        verify_output(carrier, header)
+    with pytest.raises(ValueError, match="aucun en-tête"):
+        verify_output(output, None)
@@ -0,0 +1,60 @@
+# DATA-GHOST - Planification de capacité : la capacité annoncée est celle qu'accepte l'insertion
+# Le classement retient la profondeur la plus faible, puis le moins de pixels modifiés, puis la plus petite image
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.compress import DEFAULT_LEVEL
+from dataghost.planner import estimate_size, payload_flags, plan, plan_carrier, recommend, split_sizes, stored_size
+
+from .conftest import noise_image
+
+
+@pytest.fixture
+def carriers(tmp_path):
+    """Trois porteurs de tailles différentes et un fichier illisible."""
+    paths = []
+    for name, size in (("grand.png", (160, 120)), ("petit.png", (32, 24)), ("moyen.bmp", (64, 48))):
+        noise_image(size=size).save(tmp_path / name)
+        paths.append(str(tmp_path / name))
+    (tmp_path / "casse.png").write_bytes(b"pas une image")
+    return paths + [str(tmp_path / "casse.png")]
+
+
+@pytest.mark.parametrize("encrypted, compressed", [(False, False), (True, True)])
+def test_planned_capacity_is_what_embed_accepts(carrier, tmp_path, encrypted, compressed):
+    flags = payload_flags(encrypted, compressed)
+    carrier_plan = plan_carrier(carrier, 100, flags)
+    assert carrier_plan.capacities == {lsb: api.carrier_capacity(carrier, lsb, flags=flags) for lsb in range(1, 5)}
+    if not flags:
+        room = carrier_plan.capacities[2]
+        api.embed(carrier, bytes(room), str(tmp_path / "plein.png"), 2)
+        with pytest.raises(ValueError):
+            api.embed(carrier, bytes(room + 1), str(tmp_path / "trop.png"), 2)
+
+
+def test_plans_are_ranked(carriers):
+    size = plan_carrier(carriers[1], 0).capacities[1] + 1  # Trop grand pour le petit porteur à 1 bit
+    plans = plan(carriers, size, workers=2)
+    assert [p.path for p in plans] == [carriers[2], carriers[0], carriers[1], carriers[3]]
+    assert [p.lsb for p in plans[:3]] == [1, 1, 2]
+    assert plans[0].modified_pixels <= plans[1].modified_pixels
+    assert not plans[3].fits and plans[3].error
+    assert recommend(carriers, size).path == carriers[2]
+    assert recommend(carriers, plans[0].capacities[4] * 10) is None
+    assert plan([], size) == []
+
+
+def test_split_sizes_follow_capacities():
+    sizes = split_sizes(1001, [300, 0, 700, 7])
+    assert sum(sizes) == 1001 and sizes[1] == 0
+    assert all(size <= room for size, room in zip(sizes, [300, 0, 700, 7]))
+    assert split_sizes(0, [0, 0]) == [0, 0]
+    with pytest.raises(ValueError, match="Capacité insuffisante"):
+        split_sizes(11, [5, 5])
+
+
+def test_size_estimates():
+    assert stored_size(100) == 100 and stored_size(100, encrypted=True) == 116
+    assert estimate_size(b"a" * 4096, 1 << 20, 'zlib', DEFAULT_LEVEL) < (1 << 16)
+    assert estimate_size(bytes(range(256)), 1000) == 1000
@@ -0,0 +1,69 @@
+# DATA-GHOST - Aperçus : métadonnées lues dans l'en-tête, miniatures réduites et cache invalidé par modification
+# L'échantillonnage des fichiers non compressés doit donner la même image qu'un décodage complet
+
+import os  # Pour les dates de modification
+
+import numpy as np  # Pour comparer les miniatures
+import pytest  # Pour les tests paramétrés
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost import preview
+from dataghost.preview import ThumbnailCache, image_info, make_thumbnail
+
+from .conftest import noise_image
+
+
+def _gradient(size=(900, 600)) -> Image.Image:
+    """Dégradé lisse : une miniature échantillonnée reste proche d'une miniature lissée."""
+    x = np.linspace(0, 255, size[0], dtype=np.uint8)
+    y = np.linspace(0, 255, size[1], dtype=np.uint8)
+    arr = np.stack(np.broadcast_arrays(x[None, :], y[:, None], 128 + 0 * x[None, :]), axis=-1)
+    return Image.fromarray(np.ascontiguousarray(arr), 'RGB')
+
+
+def test_image_info_reads_every_page(tmp_path):
+    path = str(tmp_path / "pages.tif")
+    noise_image(size=(40, 30)).save(path, append_images=[noise_image('L', (20, 10))], save_all=True)
+    info = image_info(path)
+    assert (info.width, info.height, info.mode, info.format) == (40, 30, 'RGB', 'TIFF')
+    assert info.frames == ((40, 30, 'RGB'), (20, 10, 'L'))
+    noise_image().save(tmp_path / "seule.png")
+    assert image_info(str(tmp_path / "seule.png")).frames == ()
+
+
+@pytest.mark.parametrize("name", ["grand.bmp", "grand.ppm", "grand.png"])
+def test_thumbnail_matches_full_decode(tmp_path, name):
+    path = str(tmp_path / name)
+    _gradient().save(path)
+    thumb = make_thumbnail(path, (150, 100))
+    reference = _gradient()
+    reference.thumbnail((150, 100))
+    assert thumb.size == reference.size and thumb.mode == 'RGB'
+    assert np.abs(np.asarray(thumb, np.int16) - np.asarray(reference, np.int16)).max() <= 8
+
+
+def test_cache_reuses_and_invalidates(tmp_path, monkeypatch):
+    path, directory = tmp_path / "image.bmp", str(tmp_path / "miniatures")
+    _gradient().save(path)
+    built = []
+    monkeypatch.setattr(preview, "make_thumbnail", lambda *args: built.append(args) or make_thumbnail(*args))
+
+    cache = ThumbnailCache(maxsize=1, directory=directory)
+    first = cache.get(str(path))
+    assert cache.get(str(path)) is first and len(built) == 1
+    # Nouveau cache (nouvelle session) : la miniature est relue sur disque
+    assert ThumbnailCache(directory=directory).get(str(path)).size == first.size and len(built) == 1
+
+    _gradient((120, 60)).save(path)
+    os.utime(path, ns=(0, 10 ** 18))
+    assert cache.get(str(path)).size != first.size and len(built) == 2
+
+
+def test_disk_cache_keeps_the_most_recent(tmp_path):
+    directory = str(tmp_path / "miniatures")
+    cache = ThumbnailCache(maxsize=0, directory=directory, max_files=2)
+    for index in range(4):
+        path = tmp_path / f"image{index}.png"
+        noise_image(size=(30, 20), seed=index).save(path)
+        cache.get(str(path))
+    assert len(os.listdir(directory)) == 2
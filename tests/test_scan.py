@@ -0,0 +1,59 @@
+# DATA-GHOST - Recherche de données cachées dans un répertoire et index des analyses
+
+import pytest  # Pour les fixtures
+
+from dataghost import api
+from dataghost.scan import ScanIndex, key_fingerprint, scan_images
+
+from .conftest import noise_image
+
+
+@pytest.fixture
+def tree(tmp_path, kdf):
+    """Répertoire d'une image propre, d'une image chiffrée et d'un PNG illisible."""
+    root = tmp_path / "images"
+    root.mkdir()
+    noise_image(seed=1).save(root / "clean.png")
+    carrier = tmp_path / "carrier.png"
+    noise_image(seed=2).save(carrier)
+    api.embed(str(carrier), b"message secret", str(root / "hidden.png"), 2, "clé", kdf=kdf)
+    (root / "broken.png").write_bytes(b"\x89PNG tronque")
+    return root
+
+
+def _scan(root, key, index):
+    return {result['path'].rsplit('/', 1)[-1]: result for result in scan_images(str(root), key, 1, index)}
+
+
+def test_fingerprint_does_not_reveal_the_key():
+    fingerprint = key_fingerprint("clé")
+    assert fingerprint == key_fingerprint("clé") != key_fingerprint("autre clé")
+    assert "clé" not in fingerprint and key_fingerprint(None) is None
+
+
+def test_index_reuses_results_for_the_same_key(tree, tmp_path):
+    index = ScanIndex(str(tmp_path / "index.jsonl"))
+    first = _scan(tree, "clé", index)
+    assert first['hidden.png']['suspect'] and not first['clean.png']['suspect']
+    assert first['broken.png']['status'] == 'error'
+
+    again = _scan(tree, "clé", index)
+    assert again['hidden.png']['cached'] and again['clean.png']['cached']
+    assert again['hidden.png']['key_id'] == key_fingerprint("clé")
+    # Une erreur n'est pas gardée : le fichier est relu à chaque analyse
+    assert not again['broken.png']['cached']
+    index.close()
+
+    reloaded = ScanIndex(str(tmp_path / "index.jsonl"))
+    assert 'clé' not in (tmp_path / "index.jsonl").read_text(encoding='utf-8')
+    assert _scan(tree, "clé", reloaded)['hidden.png']['cached']
+    reloaded.close()
+
+
+def test_index_is_not_reused_with_another_key(tree, tmp_path):
+    index = ScanIndex(str(tmp_path / "index.jsonl"))
+    _scan(tree, None, index)
+    other = _scan(tree, "clé", index)
+    assert not other['hidden.png']['cached'] and not other['clean.png']['cached']
+    assert _scan(tree, None, index)['clean.png']['cached'] is False
+    index.close()
@@ -0,0 +1,41 @@
+# DATA-GHOST - Mode dispersé : données réparties sur des pixels choisis par la clé
+
+import numpy as np  # Pour comparer les pixels
+import pytest  # Pour les tests paramétrés
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost import api
+from dataghost.scatter import KeyedPermutation
+
+MESSAGE = b"dispersion " * 20
+
+
+def test_permutation_is_a_bijection():
+    permutation = KeyedPermutation(b"k" * 32, 1000)
+    indices = permutation(np.arange(1000, dtype=np.uint64))
+    assert sorted(indices.tolist()) == list(range(1000))
+    assert not np.array_equal(indices, np.arange(1000))
+    assert np.array_equal(indices, KeyedPermutation(b"k" * 32, 1000)(np.arange(1000, dtype=np.uint64)))
+
+
+@pytest.mark.parametrize("lsb", [1, 3])
+def test_scatter_round_trip(carrier, tmp_path, kdf, lsb):
+    output = str(tmp_path / "out.png")
+    api.embed(carrier, MESSAGE, output, lsb, "clé", kdf=kdf, scatter=True)
+    extraction = api.extract(output, lsb, "clé")
+    assert extraction.data == MESSAGE and extraction.header.scattered
+
+    # Les pixels modifiés s'étendent jusqu'au bas de l'image
+    changed = np.any(np.asarray(Image.open(output)) != np.asarray(Image.open(carrier)), axis=2)
+    assert changed[-8:].any()
+
+
+def test_scatter_requires_the_key(carrier, tmp_path, kdf):
+    output = str(tmp_path / "out.png")
+    api.embed(carrier, MESSAGE, output, 2, "clé", kdf=kdf, scatter=True)
+    with pytest.raises(ValueError):
+        api.extract(output, 2)
+    with pytest.raises(ValueError):
+        api.extract(output, 2, "autre clé")
+    with pytest.raises(ValueError, match="requiert une clé"):
+        api.embed(carrier, MESSAGE, output, 2, scatter=True)
@@ -0,0 +1,87 @@
+# DATA-GHOST - Service local : opérations servies et refus des requêtes qui ne viennent pas d'un client légitime
+# Une page web peut viser un port local (formulaire text/plain, rebond DNS) : elle ne doit rien pouvoir lire ni écrire
+
+import base64  # Pour les données binaires des réponses
+import http.client  # Pour les requêtes forgées
+import json  # Pour les corps de requête
+import threading  # Pour le serveur en arrière-plan
+
+import pytest  # Pour les fixtures
+
+from dataghost.service import TOKEN_HEADER, GhostService, ServiceClient, make_server
+
+TOKEN = "jeton-de-test"
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Service sur un port choisi par le système, racine `tmp_path`, jeton fixé."""
+    server = make_server(GhostService(workers=1, cache_bytes=0, root=str(tmp_path), token=TOKEN), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    server.service.shutdown()
+
+
+def _post(server, path, body, headers):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    try:
+        connection.request("POST", path, body, headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+
+def _headers(server, **extra):
+    headers = {"Content-Type": "application/json", TOKEN_HEADER: TOKEN,
+               "Host": f"127.0.0.1:{server.server_address[1]}"}
+    headers.update(extra)
+    return headers
+
+
+def test_operations_round_trip_under_root(server, carrier):
+    with ServiceClient(port=server.server_address[1], timeout=10, token=TOKEN) as client:
+        embedded = client.call("embed", carrier="carrier.png", output="sortie.png", message="service", lsb=2)
+        assert embedded['bytes'] == 7
+        extracted = client.call("extract", path="sortie.png", lsb=2)
+        assert base64.b64decode(extracted['data']) == b"service"
+        assert client.call("capacity", path="carrier.png", lsb=2)['capacity'] > 0
+        assert client.status()['served'] == 3
+
+
+@pytest.mark.parametrize("extra, status", [
+    ({"Origin": "https://exemple.org"}, 403),
+    ({"Content-Type": "text/plain"}, 415),
+    ({"Host": "exemple.org:8765"}, 421),
+    ({TOKEN_HEADER: "autre"}, 401),
+])
+def test_foreign_requests_are_refused(server, carrier, tmp_path, extra, status):
+    body = json.dumps({'carrier': "carrier.png", 'output': "sortie.png", 'message': "intrus"})
+    code, payload = _post(server, "/embed", body, _headers(server, **extra))
+    assert code == status and 'error' in payload
+    assert not (tmp_path / "sortie.png").exists()
+
+
+def test_missing_token_is_refused(server, carrier):
+    headers = _headers(server)
+    del headers[TOKEN_HEADER]
+    assert _post(server, "/capacity", json.dumps({'path': "carrier.png"}), headers)[0] == 401
+
+
+@pytest.mark.parametrize("params", [
+    {'carrier': "carrier.png", 'output': "../dehors.png", 'message': "x"},
+    {'carrier': "carrier.png", 'output': "sortie.png", 'source': "/etc/passwd"},
+])
+def test_paths_outside_root_are_refused(server, carrier, tmp_path, params):
+    code, payload = _post(server, "/embed", json.dumps(params), _headers(server))
+    assert code == 403 and "racine" in payload['error']
+    assert not (tmp_path.parent / "dehors.png").exists() and not (tmp_path / "sortie.png").exists()
+
+
+def test_symlink_out_of_root_is_refused(server, carrier, tmp_path):
+    (tmp_path / "lien").symlink_to(tmp_path.parent)
+    code, _ = _post(server, "/extract", json.dumps({'path': "lien/carrier.png"}), _headers(server))
+    assert code == 403
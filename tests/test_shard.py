@@ -0,0 +1,45 @@
+# DATA-GHOST - Répartition d'une charge sur plusieurs images
+
+import pytest  # Pour les tests paramétrés
+
+from dataghost import api
+from dataghost.shard import shard_embed, shard_extract
+
+from .conftest import noise_image
+
+PAYLOAD = bytes(range(256)) * 6
+
+
+@pytest.fixture
+def shards(tmp_path):
+    """Trois porteuses de tailles différentes et leurs chemins de sortie."""
+    carriers, outputs = [], []
+    for index, size in enumerate([(40, 30), (64, 48), (24, 24)]):
+        path = tmp_path / f"carrier{index}.png"
+        noise_image(size=size, seed=index).save(path)
+        carriers.append(str(path))
+        outputs.append(str(tmp_path / f"shard{index}.png"))
+    return carriers, outputs
+
+
+@pytest.mark.parametrize("key", [None, "clé"])
+def test_round_trip_in_any_order(shards, key):
+    carriers, outputs = shards
+    session = shard_embed(carriers, PAYLOAD, outputs, 2, key, workers=1, compression='zlib')
+    result = shard_extract(outputs[::-1], 2, key, workers=1)
+    assert (result.session, result.found, result.missing) == (session, [0, 1, 2], [])
+    assert result.data == PAYLOAD and result.decrypted == bool(key)
+
+
+def test_missing_shard_is_reported(shards):
+    carriers, outputs = shards
+    shard_embed(carriers, PAYLOAD, outputs, 2, workers=1)
+    result = shard_extract(outputs[:2], 2, workers=1)
+    assert (result.missing, result.data) == ([2], None)
+
+
+def test_single_shard_extraction_is_refused(shards):
+    carriers, outputs = shards
+    shard_embed(carriers, PAYLOAD, outputs, 2, workers=1)
+    with pytest.raises(ValueError, match="fragment 1/3"):
+        api.extract(outputs[0], 2)
@@ -0,0 +1,231 @@
+# DATA-GHOST - Fichiers chiffrés par blocs authentifiés (AES-GCM), insérés et extraits au fil de l'eau
+
+import os  # Pour l'existence des fichiers
+
+import numpy as np  # Pour comparer les pixels
+import pytest  # Pour les tests paramétrés
+from PIL import Image  # Pour la manipulation d'images
+
+from dataghost import api, frames, stream
+from dataghost.crypto import FRAME_SIZE
+from dataghost.engine import GroupReader, bytes_to_groups, carrier_image
+from dataghost.stream import StripReader, prefix_image
+
+from .conftest import noise_image
+
+SECRET = bytes(range(256)) * 280  # Plus d'un bloc authentifié, compressible
+
+
+@pytest.fixture
+def secret(tmp_path):
+    path = tmp_path / "secret.bin"
+    path.write_bytes(SECRET)
+    return str(path)
+
+
+@pytest.fixture
+def png(tmp_path):
+    """Porteur compressé, décodé en entier."""
+    path = tmp_path / "carrier.png"
+    noise_image(size=(320, 240), seed=3).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def bmp(tmp_path):
+    """Porteur non compressé (modifié par bandes, ou en place)."""
+    path = tmp_path / "carrier.bmp"
+    noise_image(size=(320, 240), seed=7).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def apng(tmp_path):
+    """PNG animé de trois images."""
+    path = tmp_path / "anim.png"
+    images = [noise_image(size=(160, 120), seed=seed) for seed in range(3)]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=[40, 50, 60], loop=0)
+    return str(path)
+
+
+def _chunks(data: bytes, size: int, log: list = None):
+    """Morceaux d'un flux ; `log` note chaque morceau produit."""
+    for offset in range(0, len(data), size):
+        if log is not None:
+            log.append("chunk")
+        yield data[offset:offset + size]
+
+
+def _round_trip(carrier, secret, tmp_path, output_name, kdf, **options):
+    output, restored = str(tmp_path / output_name), str(tmp_path / "restored.bin")
+    api.embed_file(carrier, secret, output, 4, "clé", kdf=kdf, **options)
+    extraction = api.extract_file(output, restored, 4, "clé")
+    assert extraction.decrypted and extraction.header.framed
+    assert open(restored, 'rb').read() == SECRET
+    return output
+
+
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+def test_aead_file_round_trip(png, secret, tmp_path, kdf, compression):
+    _round_trip(png, secret, tmp_path, "out.png", kdf, compression=compression)
+    assert len(SECRET) > FRAME_SIZE
+
+
+def test_tampered_block_is_rejected(png, secret, tmp_path, kdf):
+    output = str(tmp_path / "out.png")
+    api.embed_file(png, secret, output, 4, "clé", kdf=kdf)
+    arr = np.array(Image.open(output))
+    arr[100, 0, 0] ^= 1  # Un bit du second bloc
+    Image.fromarray(arr).save(output)
+    restored = str(tmp_path / "restored.bin")
+    with pytest.raises(ValueError):
+        api.extract_file(output, restored, 4, "clé")
+    assert not os.path.exists(restored)
+    with pytest.raises(ValueError):
+        api.extract(output, 4, "mauvaise clé")
+
+
+def test_group_reader_matches_whole_buffer():
+    data = bytes(range(256)) * 50
+    for lsb in (1, 3, 4):
+        reader = GroupReader(_chunks(data, 1000), lsb)
+        groups = np.concatenate([reader.take(count) for count in (1, 7, 333, 5000, 10 ** 6)])
+        assert np.array_equal(groups, bytes_to_groups(data, lsb))
+        assert reader.exhausted() and reader.read == len(data)
+
+
+@pytest.mark.parametrize("strip_budget", [64 << 10, None])
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+def test_raw_carrier_round_trip(bmp, secret, tmp_path, kdf, strip_budget, compression):
+    output = _round_trip(bmp, secret, tmp_path, "out.bmp", kdf, strip_budget=strip_budget, compression=compression)
+    with Image.open(output) as img:
+        assert img.format == "BMP"
+
+
+def test_raw_carrier_matches_decoded_embedding(bmp, secret, tmp_path):
+    api.embed_file(bmp, secret, str(tmp_path / "raw.bmp"), 4)
+    api.embed_file(bmp, secret, str(tmp_path / "decoded.png"), 4)
+    raw, decoded = Image.open(tmp_path / "raw.bmp"), Image.open(tmp_path / "decoded.png")
+    assert np.array_equal(np.asarray(raw), np.asarray(decoded))
+
+
+@pytest.mark.parametrize("name, mode", [
+    *((name, mode) for name in ("prefix.png", "prefix.tif") for mode in ('RGB', 'RGBA', 'L', 'LA', 'P', '1')),
+    ("prefix.ppm", 'RGB'), ("prefix.pgm", 'L'),
+])
+def test_prefix_matches_full_decode(tmp_path, name, mode):
+    path = tmp_path / name
+    noise_image('RGBA' if 'A' in mode else 'RGB', size=(320, 240), seed=5).convert(mode).save(path)
+    with Image.open(path) as img:
+        expected = np.asarray(carrier_image(img))
+    prefix = prefix_image(str(path), 7)
+    assert prefix is not None and prefix.size == (320, 7)
+    assert np.array_equal(np.asarray(carrier_image(prefix)), expected[:7])
+    with StripReader(str(path)) as reader:
+        assert np.array_equal(reader.channels(0, 3), reader.channels(0, 240)[:3 * 320])
+
+
+def test_prefix_reads_only_the_first_idat_blocks(tmp_path):
+    path = tmp_path / "carrier.png"
+    noise_image(size=(320, 240), seed=5).save(path)
+    expected = np.asarray(Image.open(path))[:7]
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])  # La fin du flux compressé n'est jamais lue
+    assert np.array_equal(np.asarray(prefix_image(str(path), 7)), expected)
+
+
+def test_prefix_is_refused_for_bottom_up_rows(tmp_path):
+    img = noise_image('L', size=(64, 48))
+    img.save(tmp_path / "bottom_up.bmp")
+    assert prefix_image(str(tmp_path / "bottom_up.bmp"), 4) is None
+    with StripReader(str(tmp_path / "bottom_up.bmp")) as reader:
+        assert np.array_equal(reader.channels(0, 4).ravel(), np.asarray(img)[:4].ravel())
+
+
+def test_strip_embedding_reads_chunks_as_needed(bmp, tmp_path, monkeypatch):
+    log, store = [], stream._store_strip
+
+    def logged(*args):
+        log.append("strip")
+        store(*args)
+
+    monkeypatch.setattr(stream, "_store_strip", logged)
+    data = bytes(range(256)) * 100
+    output = str(tmp_path / "out.bmp")
+    stream.stream_embed(bmp, _chunks(data, 4096, log), output, 1, budget=16 << 10, length=len(data))
+    # Les morceaux sont demandés au fil des bandes, pas tous avant la première
+    assert log.index("strip") < len(log) - 1 - log[::-1].index("chunk")
+    assert api.extract(output, 1).data == data
+
+
+def test_unknown_length_overflow_is_refused(bmp, tmp_path):
+    output = str(tmp_path / "out.bmp")
+    too_large = bytes(api.carrier_capacity(bmp, 1) + 1)
+    with pytest.raises(ValueError, match="Capacité insuffisante"):
+        stream.stream_embed(bmp, _chunks(too_large, 4096), output, 1)
+    assert not os.path.exists(output)
+
+
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+def test_multiframe_round_trip(apng, secret, tmp_path, kdf, compression):
+    output = _round_trip(apng, secret, tmp_path, "out.png", kdf, compression=compression)
+    with Image.open(output) as img:
+        assert img.n_frames == 3
+
+
+def test_multiframe_fragments_read_as_needed(apng, tmp_path, monkeypatch):
+    log, embed = [], frames._embed_frame
+
+    def logged(task):
+        log.append("frame")
+        return embed(task)
+
+    monkeypatch.setattr(frames, "_embed_frame", logged)
+    data = bytes(range(256)) * 60
+    output = str(tmp_path / "out.png")
+    frames.embed_frames(apng, _chunks(data, 1024, log), output, 1, length=len(data))
+    assert log.index("frame") < len(log) - 1 - log[::-1].index("chunk")
+
+    header, chunks = frames.frame_payload(output, 1)
+    assert b"".join(chunks) == data and header.length == len(data)
+
+
+def test_multiframe_pool_matches_serial(apng, tmp_path, monkeypatch):
+    data = bytes(range(256)) * 40
+    frames.embed_frames(apng, data, str(tmp_path / "serial.png"), 2, workers=1)
+    monkeypatch.setattr(frames, "PARALLEL_PIXELS", 0)
+    frames.embed_frames(apng, data, str(tmp_path / "pool.png"), 2, workers=2)
+    assert frames.extract_frames(str(tmp_path / "pool.png"), 2, workers=2)[1] == data
+    assert frames.extract_frames(str(tmp_path / "serial.png"), 2)[1] == data
+
+
+def _refuse(*args, **kwargs):
+    raise AssertionError("décodage complet inattendu")
+
+
+@pytest.mark.parametrize("name, options", [
+    ("carrier.bmp", {}),  # Lignes de bas en haut
+    ("carrier.ppm", {}),
+    ("carrier.tif", {'tiffinfo': {278: 7}}),  # Bandes de 7 lignes
+])
+def test_in_place_rewrites_only_payload_rows(tmp_path, monkeypatch, name, options):
+    carrier = tmp_path / name
+    noise_image(size=(320, 240), seed=9).save(carrier, **options)
+    original = carrier.read_bytes()
+    monkeypatch.setattr(api, "_opened", _refuse)
+    output = tmp_path / f"out{carrier.suffix}"
+    api.embed(str(carrier), b"en place" * 10, str(output), 2)
+    assert api.extract(str(output), 2).data == b"en place" * 10
+
+    written = output.read_bytes()
+    assert carrier.read_bytes() == original and len(written) == len(original)
+    changed = np.flatnonzero(np.frombuffer(original, np.uint8) != np.frombuffer(written, np.uint8))
+    assert 0 < np.ptp(changed) < 320 * 3  # En-tête et données tiennent dans la première ligne
+
+
+@pytest.mark.parametrize("options", [{'channels': "RGB"}, {'key': "clé", 'scatter': True}, {'output': "out.png"}])
+def test_in_place_falls_back_to_decoding(bmp, tmp_path, kdf, monkeypatch, options):
+    monkeypatch.setattr(stream, "clone_file", _refuse)
+    output = str(tmp_path / options.pop('output', "out.bmp"))
+    api.embed(bmp, b"decode", output, 1, kdf=kdf, **options)
+    assert api.extract(output, 1, options.get('key')).data == b"decode"